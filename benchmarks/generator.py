@@ -0,0 +1,91 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator
+
+ITEMS = [
+    "Wireless Mouse", "Laptop Sleeve", "USB Cable", "Phone Case", "Charger",
+    "Mouse Pad", "Power Bank", "Webcam", "Keyboard", "Monitor", "USB Hub", "Headphones"
+]
+STATUSES = ["paid", "PAID", "Paid", " pending ", "Pending", "refunded", "RefUND"]
+BAD_STATUSES = ["SHIPPED", "unknown", "", 123, None]
+START = datetime(2025, 10, 19, 8, 0, 0)
+
+def _price_text(rng: random.Random, value: float) -> Any:
+    """Renders a price in one of the clean or currency-prefixed styles seen upstream."""
+    style = rng.randrange(5)
+    if style == 0:
+        return value
+    if style == 1:
+        return f"{value:.2f}"
+    if style == 2:
+        return f"${value:.2f}"
+    if style == 3:
+        return f"N{value:.2f}"
+    return f" {value:.2f} "
+
+def _timestamp_text(rng: random.Random, moment: datetime) -> str:
+    """Renders a timestamp in one of the formats seen upstream."""
+    style = rng.randrange(4)
+    if style == 0:
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if style == 1:
+        return moment.strftime("%Y-%m-%d %H:%M")
+    if style == 2:
+        return moment.strftime("%d/%m/%Y %I:%M %p")
+    return moment.strftime("%Y/%m/%dT%H:%MZ")
+
+def _make_dirty(rng: random.Random, record: Dict[str, Any]):
+    """Applies one kind of upstream corruption to a record."""
+    kind = rng.randrange(7)
+    if kind == 0:
+        record["quantity"] = -int(record["quantity"])
+    elif kind == 1:
+        record["quantity"] = f"{record['quantity']}pcs"
+    elif kind == 2:
+        record["price"] = f"{rng.randint(1, 99)}usd"
+    elif kind == 3:
+        record["item"] = ""
+    elif kind == 4:
+        record["quantity"] = "N/A"
+    elif kind == 5:
+        del record["total"]
+    else:
+        record["payment_status"] = rng.choice(BAD_STATUSES)
+
+def generate_orders(count: int, seed: int = 0, dirty_fraction: float = 0.2) -> Iterator[Dict[str, Any]]:
+    """
+    Yields `count` shoplink-style raw orders.
+
+    The same seed always produces the same records. About `dirty_fraction`
+    of them carry one upstream defect (negative or unparseable quantity,
+    "usd" price suffix, empty item, missing total or a bad status).
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        quantity = rng.randint(1, 10)
+        price = round(rng.uniform(1, 500), 2)
+        total = round(quantity * price, 2)
+        if rng.random() < 0.1:
+            total = round(total * rng.uniform(0.5, 1.5), 2)  # stale total
+        moment = START + timedelta(seconds=rng.randrange(30 * 24 * 3600))
+        record = {
+            "order_id": f"ORD{i:08d}",
+            "timestamp": _timestamp_text(rng, moment),
+            "item": rng.choice(ITEMS),
+            "quantity": quantity if rng.random() < 0.7 else str(quantity),
+            "price": _price_text(rng, price),
+            "total": _price_text(rng, total),
+            "payment_status": rng.choice(STATUSES),
+        }
+        if rng.random() < dirty_fraction:
+            _make_dirty(rng, record)
+        yield record
+
+def write_orders(filepath: str, count: int, seed: int = 0, dirty_fraction: float = 0.2):
+    """Streams generated orders into a JSON array file without building a list."""
+    with open(filepath, 'w') as f:
+        f.write('[')
+        for i, record in enumerate(generate_orders(count, seed, dirty_fraction)):
+            f.write((',\n' if i else '\n') + json.dumps(record))
+        f.write('\n]')
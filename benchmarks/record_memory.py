@@ -0,0 +1,56 @@
+"""
+Measures the memory held per transformed record, as dicts and as compact
+OrderRecords, on generated shoplink data.
+
+    python -m benchmarks.record_memory --size 100000
+
+Memory is the growth in tracemalloc's traced total while the transformer
+builds its output, divided by the number of records produced.
+"""
+import argparse
+import logging
+import sys
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.generator import generate_orders
+from order_pipeline.transformer import DataTransformer
+from order_pipeline.validator import DataValidator
+
+def bytes_per_record(size: int, seed: int = 0) -> Dict[str, int]:
+    """Returns the traced bytes per transformed record for dicts and for OrderRecords."""
+    validated = DataValidator().validate_data(list(generate_orders(size, seed=seed)))
+    results = {}
+    for name, compact in (("dict", False), ("compact", True)):
+        transformer = DataTransformer(compact_records=compact)
+        # Fill the timestamp and category caches first so only records are counted.
+        transformer.transform_data(validated)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            transformed = transformer.transform_data(validated)
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        results[name] = round((after - before) / len(transformed))
+        del transformed
+    return results
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure memory per transformed record.")
+    parser.add_argument("--size", type=int, default=100000, help="generated records")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    try:
+        results = bytes_per_record(args.size, seed=args.seed)
+    finally:
+        logging.disable(logging.NOTSET)
+    for name, value in results.items():
+        print(f"{name:<8} {value:6d} bytes/record")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Times every pipeline stage on generated shoplink data.
+
+    python -m benchmarks.run_benchmarks --sizes 10000,100000 --output results.json
+    python -m benchmarks.run_benchmarks --baseline baseline.json --threshold 0.2
+
+Results are written as JSON. With --baseline, any stage that got slower
+than the baseline by more than --threshold is reported and the exit status
+is 1.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.generator import write_orders
+from order_pipeline.reader import DataReader
+from order_pipeline.validator import DataValidator
+from order_pipeline.transformer import DataTransformer
+from order_pipeline.analyzer import DataAnalyzer
+from order_pipeline.exporter import DataExporter
+from order_pipeline.pipeline import OrderPipeline
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+def _time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Returns the best wall time over `repeat` calls and the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _entry(seconds: float, records: int) -> Dict[str, float]:
+    """Builds one result entry."""
+    return {
+        "seconds": round(seconds, 6),
+        "records": records,
+        "records_per_second": round(records / seconds, 1) if seconds > 0 else 0.0
+    }
+
+def benchmark_size(size: int, workdir: str, seed: int = 0, repeat: int = 1) -> Dict[str, Dict[str, float]]:
+    """Times each stage, then the full pipeline, on `size` generated records."""
+    input_file = os.path.join(workdir, f"orders_{size}.json")
+    output_file = os.path.join(workdir, f"orders_{size}_cleaned.json")
+    write_orders(input_file, size, seed=seed)
+
+    results = {}
+    seconds, raw_data = _time(lambda: DataReader().read_json_data(input_file), repeat)
+    results["reader"] = _entry(seconds, len(raw_data))
+
+    seconds, validated = _time(lambda: DataValidator().validate_data(raw_data), repeat)
+    results["validator"] = _entry(seconds, len(raw_data))
+
+    seconds, transformed = _time(lambda: DataTransformer().transform_data(validated), repeat)
+    results["transformer"] = _entry(seconds, len(validated))
+
+    seconds, analysis = _time(lambda: DataAnalyzer().analyze_data(transformed), repeat)
+    results["analyzer"] = _entry(seconds, len(transformed))
+
+    seconds, _ = _time(lambda: DataExporter().export_data(transformed, analysis, output_file), repeat)
+    results["exporter"] = _entry(seconds, len(transformed))
+
+    del raw_data, validated, transformed
+    seconds, _ = _time(lambda: OrderPipeline().run(input_file, output_file), repeat)
+    results["pipeline"] = _entry(seconds, size)
+
+    os.remove(input_file)
+    os.remove(output_file)
+    return results
+
+def run_benchmarks(sizes: List[int], seed: int = 0, repeat: int = 1) -> Dict[str, Any]:
+    """Runs every size and returns the full results document."""
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": {}
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            report["results"][str(size)] = benchmark_size(size, workdir, seed=seed, repeat=repeat)
+    return report
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Returns one message per stage/size that is more than `threshold` slower than the baseline."""
+    regressions = []
+    for size, stages in report["results"].items():
+        for stage, entry in stages.items():
+            previous = baseline.get("results", {}).get(size, {}).get(stage)
+            if not previous or not previous.get("seconds"):
+                continue
+            change = entry["seconds"] / previous["seconds"] - 1
+            if change > threshold:
+                regressions.append(
+                    f"{stage} @ {size} records: {previous['seconds']:.4f}s -> {entry['seconds']:.4f}s (+{change:.0%})"
+                )
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the order pipeline.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated record counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement; the best is kept")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown versus the baseline, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    # Per-record warnings would dominate the timings.
+    root = logging.getLogger()
+    previous_level = root.level
+    root.setLevel(logging.ERROR)
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        report = run_benchmarks(sizes, seed=args.seed, repeat=args.repeat)
+    finally:
+        root.setLevel(previous_level)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"Results written to {args.output}")
+
+    for size, stages in report["results"].items():
+        for stage, entry in stages.items():
+            print(f"{size:>9} {stage:<12} {entry['seconds']:10.4f}s {entry['records_per_second']:14.1f} rec/s")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
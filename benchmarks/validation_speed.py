@@ -0,0 +1,98 @@
+"""
+Times the compiled validation schema against the validator's original
+field-by-field checks on generated shoplink data.
+
+    python -m benchmarks.validation_speed --size 300000 --repeat 9
+
+Both sides only decide which records are valid; rejection logging is left
+out so the numbers compare the checks themselves. The two sides run in
+alternating rounds; the best time of each is reported, and the speedup is
+the median of the per-round ratios, which shrugs off a noisy round.
+"""
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.generator import generate_orders
+from order_pipeline.schema import ValidationSchema
+
+_REQUIRED_FIELDS = ['order_id', 'timestamp', 'item', 'quantity', 'price', 'payment_status', 'total']
+
+def _original_is_positive(value: Any) -> bool:
+    """The validator's original positive-number check."""
+    if isinstance(value, (int, float)):
+        return value > 0
+    try:
+        return float(value) > 0
+    except (ValueError, TypeError):
+        pass
+    if not isinstance(value, str):
+        return False
+    try:
+        return float(value.strip().lstrip('$Nn')) > 0
+    except (ValueError, TypeError):
+        return False
+
+def _original_is_valid(record: Dict[str, Any]) -> bool:
+    """The validator's original per-record loop over its required fields."""
+    for field in _REQUIRED_FIELDS:
+        value = record.get(field)
+        if value is None:
+            return False
+        if field == 'item' and (not isinstance(value, str) or value.strip() == ""):
+            return False
+        if field in ['quantity', 'price', 'total'] and not _original_is_positive(value):
+            return False
+    return True
+
+def _original_filter(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Returns the records the original checks accept."""
+    return [record for record in records if _original_is_valid(record)]
+
+def compare(size: int, seed: int = 0, repeat: int = 3) -> Dict[str, float]:
+    """
+    Returns the best seconds of the original checks and of the compiled
+    schema on `size` generated records, and the median of how many times
+    faster the schema was per round. Raises ValueError if the two disagree
+    on any record.
+    """
+    records = list(generate_orders(size, seed=seed))
+    schema = ValidationSchema()
+    if schema.check_batch(records)[0] != _original_filter(records):
+        raise ValueError("The compiled schema and the original checks accept different records.")
+
+    best = {"original": float('inf'), "compiled": float('inf')}
+    ratios = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _original_filter(records)
+        original = time.perf_counter() - start
+        start = time.perf_counter()
+        schema.check_batch(records)
+        compiled = time.perf_counter() - start
+        best["original"] = min(best["original"], original)
+        best["compiled"] = min(best["compiled"], compiled)
+        ratios.append(original / compiled if compiled > 0 else 0.0)
+
+    results = {name: round(seconds, 6) for name, seconds in best.items()}
+    results["speedup"] = round(statistics.median(ratios), 2)
+    return results
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point. Exits with 1 if the schema is not faster."""
+    parser = argparse.ArgumentParser(description="Compare compiled validation with the original checks.")
+    parser.add_argument("--size", type=int, default=300000, help="generated records")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=9, help="rounds; each runs both sides once")
+    args = parser.parse_args(argv)
+
+    results = compare(args.size, seed=args.seed, repeat=args.repeat)
+    print(f"original {results['original']:10.3f} s")
+    print(f"compiled {results['compiled']:10.3f} s")
+    print(f"speedup  {results['speedup']:10.2f}x")
+    return 0 if results["speedup"] > 1 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,357 @@
-from typing import List, Dict, Any
+import heapq
+import json
+import os
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from order_pipeline.records import OrderRecord
+from order_pipeline.columnar import AnalysisColumns, ColumnarOrders, NAIVE_OFFSET, NO_TIMESTAMP
+from order_pipeline.sketches import SketchAccumulator
 
-class DataAnalyzer:
-    """Computes statistics from transformed order data."""
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the columnar path
+    np = None
 
-    def analyze_data(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Computes summary statistics for the cleaned data."""
-        if not data:
+# Integer codes used by the columnar path; unknown statuses count as pending.
+STATUS_CODES = {"paid": 0, "pending": 1, "refunded": 2}
+STATUS_NAMES = ("paid", "pending", "refunded")
+
+_MICROS_PER_HOUR = 3600 * 1000000
+_MICROS_PER_DAY = 24 * _MICROS_PER_HOUR
+
+class GroupedAccumulator:
+    """
+    Running totals per group: orders, quantity and revenue by item, and
+    orders and revenue by calendar day and by hour of day of the transformed
+    timestamp (wall-clock time in the timestamp's own UTC offset).
+
+    Quantity and revenue count paid orders only, like total_revenue. Each
+    group is a fixed pair or triple of counters, so memory grows with the
+    number of distinct items and days, never with the number of orders.
+    result() adds the `top_n` items by revenue and by quantity, picked with
+    a heap. Accumulators merge like AnalysisAccumulator.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.by_item: Dict[str, List[float]] = {}  # item -> [orders, quantity, revenue]
+        self.by_day: Dict[str, List[float]] = {}  # 'YYYY-MM-DD' -> [orders, revenue]
+        self.by_hour: Dict[str, List[float]] = {}  # 'HH' -> [orders, revenue]
+        self.unknown_timestamps = 0
+
+    def add(self, record: Dict[str, Any]):
+        """Adds a single transformed record (a dict or an OrderRecord) to its groups."""
+        if type(record) is OrderRecord:
+            item, timestamp, paid = record.item, record.timestamp, record.payment_status == 'paid'
+            quantity, total = record.quantity, record.total
+        else:
+            item, timestamp = record.get('item', ''), record.get('timestamp', '')
+            paid = record.get('payment_status', 'pending') == 'paid'
+            quantity, total = record.get('quantity', 0.0), record.get('total', 0.0)
+
+        group = self.by_item.get(item)
+        if group is None:
+            group = self.by_item[item] = [0, 0.0, 0.0]
+        group[0] += 1
+        if paid:
+            group[1] += quantity
+            group[2] += total
+
+        if not timestamp:
+            self.unknown_timestamps += 1
+            return
+        for groups, key in ((self.by_day, timestamp[:10]), (self.by_hour, timestamp[11:13])):
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [0, 0.0]
+            group[0] += 1
+            if paid:
+                group[1] += total
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> "GroupedAccumulator":
+        """Adds every record from an iterable and returns self."""
+        for record in records:
+            self.add(record)
+        return self
+
+    @classmethod
+    def from_columns(cls, orders: ColumnarOrders, status_codes, top_n: int = 10) -> "GroupedAccumulator":
+        """
+        Builds the groups of a columnar cache with NumPy, grouping on the
+        stored item codes and on the encoded timestamps. Sums run in record
+        order, so they match adding the records one by one.
+        """
+        columns = orders.columns
+        totals = np.asarray(columns['total'])
+        paid = status_codes == STATUS_CODES["paid"]
+        groups = cls(top_n)
+
+        item_codes = np.asarray(columns['item'])
+        size = len(orders.item_dictionary)
+        counts = np.bincount(item_codes, minlength=size)
+        quantities = np.bincount(item_codes[paid], weights=np.asarray(columns['quantity'])[paid], minlength=size)
+        revenues = np.bincount(item_codes[paid], weights=totals[paid], minlength=size)
+        for code in np.flatnonzero(counts).tolist():
+            groups.by_item[orders.item_dictionary[code]] = [int(counts[code]), float(quantities[code]),
+                                                            float(revenues[code])]
+
+        micros = np.asarray(columns['timestamp'])
+        offsets = np.asarray(columns['timestamp_offset'])
+        known = micros != NO_TIMESTAMP
+        groups.unknown_timestamps = int(len(micros) - np.count_nonzero(known))
+        wall = micros[known] + np.where(offsets[known] == NAIVE_OFFSET, 0, offsets[known]).astype(np.int64) * 1000000
+        known_totals, known_paid = totals[known], paid[known]
+        for target, keys, name in (
+            (groups.by_day, wall // _MICROS_PER_DAY, lambda day: str(np.datetime64(day, 'D'))),
+            (groups.by_hour, wall // _MICROS_PER_HOUR % 24, lambda hour: f"{hour:02d}"),
+        ):
+            values, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(values))
+            revenues = np.bincount(inverse[known_paid], weights=known_totals[known_paid], minlength=len(values))
+            for index, value in enumerate(values.tolist()):
+                target[name(value)] = [int(counts[index]), float(revenues[index])]
+        return groups
+
+    def merge(self, other: "GroupedAccumulator") -> "GroupedAccumulator":
+        """Adds another accumulator's groups to this one and returns self."""
+        for mine, theirs in ((self.by_item, other.by_item), (self.by_day, other.by_day),
+                             (self.by_hour, other.by_hour)):
+            for key, counters in theirs.items():
+                group = mine.get(key)
+                if group is None:
+                    mine[key] = list(counters)
+                else:
+                    for i, value in enumerate(counters):
+                        group[i] += value
+        self.unknown_timestamps += other.unknown_timestamps
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the raw state as JSON-serializable data."""
+        return {
+            "top_n": self.top_n,
+            "by_item": self.by_item,
+            "by_day": self.by_day,
+            "by_hour": self.by_hour,
+            "unknown_timestamps": self.unknown_timestamps
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "GroupedAccumulator":
+        """Rebuilds an accumulator from the output of to_dict."""
+        try:
+            groups = cls(int(state["top_n"]))
+            groups.by_item = {str(key): [int(c[0]), float(c[1]), float(c[2])] for key, c in state["by_item"].items()}
+            groups.by_day = {str(key): [int(c[0]), float(c[1])] for key, c in state["by_day"].items()}
+            groups.by_hour = {str(key): [int(c[0]), float(c[1])] for key, c in state["by_hour"].items()}
+            groups.unknown_timestamps = int(state["unknown_timestamps"])
+            return groups
+        except (KeyError, TypeError, ValueError, AttributeError, IndexError) as e:
+            raise ValueError(f"Invalid grouped accumulator state: {e}")
+
+    def result(self) -> Dict[str, Any]:
+        """Returns the per-group summaries and top items, with sorted keys."""
+        top_by_revenue = heapq.nsmallest(self.top_n, self.by_item.items(), key=lambda kv: (-kv[1][2], kv[0]))
+        top_by_quantity = heapq.nsmallest(self.top_n, self.by_item.items(), key=lambda kv: (-kv[1][1], kv[0]))
+        return {
+            "by_item": {
+                item: {"orders": orders, "quantity": quantity, "revenue": round(revenue, 2)}
+                for item, (orders, quantity, revenue) in sorted(self.by_item.items())
+            },
+            "by_day": {
+                day: {"orders": orders, "revenue": round(revenue, 2)}
+                for day, (orders, revenue) in sorted(self.by_day.items())
+            },
+            "by_hour": {
+                hour: {"orders": orders, "revenue": round(revenue, 2)}
+                for hour, (orders, revenue) in sorted(self.by_hour.items())
+            },
+            "unknown_timestamps": self.unknown_timestamps,
+            "top_items_by_revenue": [
+                {"item": item, "revenue": round(counters[2], 2)} for item, counters in top_by_revenue
+            ],
+            "top_items_by_quantity": [
+                {"item": item, "quantity": counters[1]} for item, counters in top_by_quantity
+            ]
+        }
+
+class AnalysisAccumulator:
+    """
+    Running totals behind DataAnalyzer, fed a record or a batch at a time.
+
+    Accumulators built over separate chunks, workers or batches can be merged
+    and saved to disk, and result() gives the same summary as analyzing all of
+    their records at once. Merged revenue is a sum of partial sums, so it may
+    differ from a single pass in the last floating-point place.
+
+    With `grouped` the same pass also fills a GroupedAccumulator, reported
+    under "groups", and with `sketches` a SketchAccumulator, reported under
+    "sketches".
+    """
+
+    def __init__(self, grouped: bool = False, top_n: int = 10, sketches: bool = False,
+                 quantile_k: int = 200, distinct_precision: int = 14):
+        self.total_revenue = 0.0
+        self.total_orders = 0
+        self.status_counts = {"paid": 0, "pending": 0, "refunded": 0}
+        self.groups: Optional[GroupedAccumulator] = GroupedAccumulator(top_n) if grouped else None
+        self.sketches: Optional[SketchAccumulator] = (
+            SketchAccumulator(quantile_k, distinct_precision) if sketches else None
+        )
+
+    def add(self, record: Dict[str, Any]):
+        """Adds a single transformed record (a dict or an OrderRecord) to the totals."""
+        if type(record) is OrderRecord:
+            status = record.payment_status
+            if status == 'paid':
+                self.total_revenue += record.total
+        else:
+            status = record.get('payment_status', 'pending')
+            if status == 'paid':
+                self.total_revenue += record.get('total', 0.0)
+
+        if status in self.status_counts:
+            self.status_counts[status] += 1
+        else:
+            self.status_counts['pending'] += 1
+
+        self.total_orders += 1
+        if self.groups is not None:
+            self.groups.add(record)
+        if self.sketches is not None:
+            self.sketches.add(record)
+
+    def update(self, records: Iterable[Dict[str, Any]]):
+        """
+        Adds every record from an iterable to the totals.
+
+        Unlike a loop over add(), the totals are kept in locals through one
+        tight loop with no per-record method call; groups and sketches are
+        filled by passes of their own.
+        """
+        if self.groups is not None or self.sketches is not None:
+            if not isinstance(records, list):
+                records = list(records)
+            if self.groups is not None:
+                self.groups.update(records)
+            if self.sketches is not None:
+                self.sketches.update(records)
+
+        counts = self.status_counts
+        counted_before = sum(counts.values())
+        revenue = self.total_revenue
+        if isinstance(records, list) and records and type(records[0]) is OrderRecord:
+            # Attributes are much faster than OrderRecord.get. A dict among
+            # the records fails on its first attribute, before anything is
+            # counted, and it and the rest are read with get() below.
+            records = iter(records)
+            try:
+                for record in records:
+                    status = record.payment_status
+                    if status == 'paid':
+                        revenue += record.total
+                    if status in counts:
+                        counts[status] += 1
+                    else:
+                        counts['pending'] += 1
+            except AttributeError:
+                records = chain((record,), records)
+        for record in records:
+            status = record.get('payment_status', 'pending')
+            if status == 'paid':
+                revenue += record.get('total', 0.0)
+            if status in counts:
+                counts[status] += 1
+            else:
+                counts['pending'] += 1
+
+        self.total_revenue = revenue
+        # Every record is counted under exactly one status.
+        self.total_orders += sum(counts.values()) - counted_before
+
+    def track(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yields records unchanged while adding them to the totals."""
+        for record in records:
+            self.add(record)
+            yield record
+
+    def merge(self, other: "AnalysisAccumulator") -> "AnalysisAccumulator":
+        """Adds another accumulator's totals to this one and returns self."""
+        self.total_revenue += other.total_revenue
+        self.total_orders += other.total_orders
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        if other.groups is not None:
+            if self.groups is None:
+                self.groups = GroupedAccumulator(other.groups.top_n)
+            self.groups.merge(other.groups)
+        if other.sketches is not None:
+            if self.sketches is None:
+                self.sketches = SketchAccumulator(other.sketches.order_values.k, other.sketches.items.precision)
+            self.sketches.merge(other.sketches)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the raw (unrounded) state as JSON-serializable data."""
+        state = {
+            "total_revenue": self.total_revenue,
+            "total_orders": self.total_orders,
+            "status_counts": dict(self.status_counts)
+        }
+        if self.groups is not None:
+            state["groups"] = self.groups.to_dict()
+        if self.sketches is not None:
+            state["sketches"] = self.sketches.to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "AnalysisAccumulator":
+        """Rebuilds an accumulator from the output of to_dict."""
+        try:
+            accumulator = cls()
+            accumulator.total_revenue = float(state["total_revenue"])
+            accumulator.total_orders = int(state["total_orders"])
+            accumulator.status_counts.update({
+                status: int(count) for status, count in state["status_counts"].items()
+            })
+            if "groups" in state:
+                accumulator.groups = GroupedAccumulator.from_dict(state["groups"])
+            if "sketches" in state:
+                accumulator.sketches = SketchAccumulator.from_dict(state["sketches"])
+            return accumulator
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Invalid accumulator state: {e}")
+
+    def save(self, filepath: str):
+        """Writes the state to a JSON file, replacing it atomically."""
+        temp_filepath = f"{filepath}.tmp"
+        with open(temp_filepath, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_filepath, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> "AnalysisAccumulator":
+        """Reads a state file written by save."""
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found at path: {filepath}")
+        try:
+            with open(filepath, 'r') as f:
+                state = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to decode JSON: {e}")
+        return cls.from_dict(state)
+
+    def result(self) -> Dict[str, Any]:
+        """Returns the summary statistics for everything added so far."""
+        result = self._totals()
+        if self.groups is not None:
+            result["groups"] = self.groups.result()
+        if self.sketches is not None:
+            result["sketches"] = self.sketches.result()
+        return result
+
+    def _totals(self) -> Dict[str, Any]:
+        if not self.total_orders:
             return {
                 "total_revenue": 0,
                 "average_revenue": 0,
@@ -17,27 +363,105 @@ class DataAnalyzer:
                 }
             }
 
-        total_revenue = 0.0
-        status_counts = {"paid": 0, "pending": 0, "refunded": 0}
-        
-        for record in data:
-            status = record.get('payment_status', 'pending')
-            
-            if status == 'paid':
-                total_revenue += record.get('total', 0.0)
-            
-            if status in status_counts:
-                status_counts[status] += 1
-            else:
-                status_counts['pending'] += 1
-        
-        total_orders = len(data)
-        average_revenue = (total_revenue / total_orders) if total_orders > 0 else 0
+        return {
+            "total_revenue": round(self.total_revenue, 2),
+            "average_revenue": self.total_revenue / self.total_orders,
+            "total_orders": self.total_orders,
+            "status_counts": dict(self.status_counts)
+        }
+
+class DataAnalyzer:
+    """
+    Computes statistics from transformed order data, with `grouped` also
+    per item, day and hour and the `top_n` items (see GroupedAccumulator).
+    With `sketches` it also estimates order value quantiles and distinct
+    items and order_ids in constant memory (see SketchAccumulator);
+    `quantile_k` and `distinct_precision` trade memory for accuracy.
+    """
+
+    def __init__(self, grouped: bool = False, top_n: int = 10, sketches: bool = False,
+                 quantile_k: int = 200, distinct_precision: int = 14):
+        self.grouped = grouped
+        self.top_n = top_n
+        self.sketches = sketches
+        self.quantile_k = quantile_k
+        self.distinct_precision = distinct_precision
+
+    def new_accumulator(self) -> AnalysisAccumulator:
+        """Returns an empty accumulator with this analyzer's grouping and sketch settings."""
+        return AnalysisAccumulator(grouped=self.grouped, top_n=self.top_n, sketches=self.sketches,
+                                   quantile_k=self.quantile_k, distinct_precision=self.distinct_precision)
+
+    def analyze_data(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Computes summary statistics for the cleaned data."""
+        accumulator = self.new_accumulator()
+        accumulator.update(data)
+        return accumulator.result()
+
+    def analyze_columnar(self, data: List[Dict[str, Any]],
+                         columns: Optional[AnalysisColumns] = None) -> Dict[str, Any]:
+        """
+        Computes the same summary as analyze_data by reducing `total` and
+        `payment_status` columns with NumPy. A loaded ColumnarOrders cache is
+        analyzed on its columns without building any records. `columns`
+        collected by the transformer for exactly these records are used as
+        they are; otherwise the two columns are built from the records.
+        """
+        if np is None:
+            raise ImportError("numpy is required for columnar analysis.")
+        lookup = STATUS_CODES.get
+        if isinstance(data, ColumnarOrders):
+            remap = np.array([lookup(name, 1) for name in data.status_dictionary] or [1], dtype=np.int8)
+            status_codes = remap[data.columns['payment_status']]
+            result = self.analyze_columns(data.columns['total'], status_codes)
+            if self.grouped:
+                result["groups"] = GroupedAccumulator.from_columns(data, status_codes, self.top_n).result()
+            if self.sketches:
+                result["sketches"] = SketchAccumulator.from_columns(
+                    data, self.quantile_k, self.distinct_precision
+                ).result()
+            return result
+        if columns is not None and len(columns) == len(data):
+            totals = np.frombuffer(columns.totals, dtype=np.float64)
+            status_codes = np.frombuffer(columns.status_codes, dtype=np.int8)
+        # Records from one transformer are either all dicts or all OrderRecords.
+        elif data and type(data[0]) is OrderRecord:
+            totals = np.array([record.total for record in data], dtype=np.float64)
+            status_codes = np.array([lookup(record.payment_status, 1) for record in data], dtype=np.int8)
+        else:
+            totals = np.array([record.get('total', 0.0) for record in data], dtype=np.float64)
+            status_codes = np.array(
+                [lookup(record.get('payment_status', 'pending'), 1) for record in data], dtype=np.int8
+            )
+        result = self.analyze_columns(totals, status_codes)
+        if self.grouped:
+            result["groups"] = GroupedAccumulator(self.top_n).update(data).result()
+        if self.sketches:
+            result["sketches"] = SketchAccumulator(self.quantile_k, self.distinct_precision).update(data).result()
+        return result
+
+    def analyze_columns(self, totals, status_codes) -> Dict[str, Any]:
+        """
+        Computes the summary from a float64 `totals` array and an array of
+        STATUS_CODES values.
+
+        Revenue is summed with cumsum, which adds left to right exactly like
+        the record loop, so the result matches analyze_data bit for bit
+        (np.sum's pairwise summation can differ in the last place).
+        """
+        if np is None:
+            raise ImportError("numpy is required for columnar analysis.")
+        total_orders = int(len(totals))
+        if not total_orders:
+            return AnalysisAccumulator().result()
+
+        counts = np.bincount(status_codes, minlength=len(STATUS_NAMES))
+        paid_totals = totals[status_codes == STATUS_CODES["paid"]]
+        total_revenue = float(np.cumsum(paid_totals)[-1]) if len(paid_totals) else 0.0
 
         return {
             "total_revenue": round(total_revenue, 2),
-            "average_revenue": average_revenue,
+            "average_revenue": total_revenue / total_orders,
             "total_orders": total_orders,
-            "status_counts": status_counts
+            "status_counts": {name: int(counts[code]) for code, name in enumerate(STATUS_NAMES)}
         }
-
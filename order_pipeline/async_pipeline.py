@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from order_pipeline.analyzer import AnalysisAccumulator
+from order_pipeline.metrics import PipelineMetrics
+from order_pipeline.parallel import ProcessStageRunner
+from order_pipeline.pipeline import OrderPipeline
+from order_pipeline.reader import DataReader, expand_input_paths
+
+# Marks the end of the stream in a queue.
+_DONE = None
+
+class AsyncOrderPipeline:
+    """
+    Runs an OrderPipeline's stages as asyncio tasks joined by bounded queues.
+
+    A reader task pulls chunks of `pipeline.chunk_size` records from the
+    input, a processing task validates and transforms them, and a writer
+    task analyzes and exports them. Each queue holds at most `queue_size`
+    chunks, so a slow writer makes reading wait instead of buffering the
+    input. Blocking reads and writes, and processing with a single worker,
+    run on `executor` (the loop's default thread pool if None); with
+    `pipeline.workers` > 1 chunks are processed in worker processes.
+
+    Incremental state, deduplication, per-file summaries and rollups are
+    only available through OrderPipeline.run.
+    """
+
+    def __init__(self, pipeline: Optional[OrderPipeline] = None, queue_size: int = 4,
+                 executor: Optional[Executor] = None):
+        if queue_size < 1:
+            raise ValueError("queue_size must be a positive integer.")
+        self.pipeline = pipeline or OrderPipeline(streaming=True)
+        if (self.pipeline.state_filepath or self.pipeline.dedup_policy or self.pipeline.per_file_summaries
+                or self.pipeline.rollup_filepath):
+            raise ValueError(
+                "AsyncOrderPipeline does not support incremental state, deduplication, per-file summaries or rollups."
+            )
+        self.queue_size = queue_size
+        self.executor = executor
+
+    async def run(self, input_filepath: str, output_filepath: str) -> Optional[Dict[str, Any]]:
+        """
+        Runs the pipeline. `input_filepath` may be a file, a directory or a
+        glob pattern.
+
+        Returns a summary with the analysis (None if the pipeline stopped
+        early) and the rejection counts per reason code, or None if it failed.
+        """
+        pipeline = self.pipeline
+        counts = {"read": 0, "validated": 0}
+        raw_chunks = asyncio.Queue(self.queue_size)
+        transformed_chunks = asyncio.Queue(self.queue_size)
+        try:
+            logging.info(f"Starting async pipeline for: {input_filepath}")
+            pipeline._reset_rejections()
+            try:
+                tasks = [
+                    asyncio.create_task(self._read(input_filepath, raw_chunks, counts)),
+                    asyncio.create_task(self._process(raw_chunks, transformed_chunks, counts)),
+                    asyncio.create_task(self._write(transformed_chunks, output_filepath, counts)),
+                ]
+                try:
+                    analysis = (await asyncio.gather(*tasks))[2]
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+            finally:
+                pipeline.rejections.close()
+
+        except (ValueError, FileNotFoundError, IOError) as e:
+            logging.critical(f"Pipeline failed: {e}")
+            return None
+        except Exception as e:
+            logging.critical(f"An unexpected error occurred: {e}", exc_info=True)
+            return None
+
+        rejections = pipeline.rejections.summary()
+        if rejections:
+            logging.info(f"Rejected records by reason: {rejections}")
+        return {"analysis": analysis, "rejections": rejections}
+
+    async def _blocking(self, function, *args) -> Any:
+        """Runs a blocking call on the executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    @asynccontextmanager
+    async def _start_workers(self) -> AsyncIterator[ProcessStageRunner]:
+        """Starts and shuts down the worker processes on the executor, off the event loop."""
+        runner = ProcessStageRunner(self.pipeline, self.pipeline.workers)
+        await self._blocking(runner.__enter__)
+        try:
+            yield runner
+        except BaseException as e:
+            await self._blocking(runner.__exit__, type(e), e, e.__traceback__)
+            raise
+        await self._blocking(runner.__exit__, None, None, None)
+
+    async def _read(self, input_filepath: str, raw_chunks: asyncio.Queue, counts: Dict[str, int]):
+        """
+        Reads the input a chunk at a time and queues each chunk with the
+        reader rejections it caused.
+        """
+        filepaths = expand_input_paths(input_filepath)
+        # The reader gets its own tracker because it runs alongside processing;
+        # its counts are merged by whoever touches the pipeline's tracker.
+        reader = DataReader(self.pipeline.rejections.fork())
+        chunks = self._iter_chunks(reader, filepaths)
+        while True:
+            chunk = await self._blocking(next, chunks, _DONE)
+            if chunk is _DONE:
+                break
+            counts["read"] += len(chunk)
+            await raw_chunks.put((chunk, reader.rejections.drain()))
+        await raw_chunks.put((_DONE, reader.rejections.drain()))
+
+    def _iter_chunks(self, reader: DataReader, filepaths: List[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the chunks of every input file in turn."""
+        for filepath in filepaths:
+            yield from reader.iter_json_chunks(filepath, self.pipeline.chunk_size)
+
+    async def _process(self, raw_chunks: asyncio.Queue, transformed_chunks: asyncio.Queue,
+                       counts: Dict[str, int]):
+        """Validates and transforms queued chunks, keeping them in order."""
+        pipeline = self.pipeline
+        if pipeline.workers > 1:
+            async with self._start_workers() as runner:
+                pending = deque()
+                while True:
+                    chunk, read_rejections = await raw_chunks.get()
+                    pipeline.rejections.merge(read_rejections)
+                    if chunk is _DONE:
+                        break
+                    pending.append(runner.submit('_process_chunk', chunk))
+                    if len(pending) >= runner.max_pending:
+                        await self._put_result(transformed_chunks, counts, await self._collect(runner, pending))
+                while pending:
+                    await self._put_result(transformed_chunks, counts, await self._collect(runner, pending))
+        else:
+            while True:
+                chunk, read_rejections = await raw_chunks.get()
+                if chunk is _DONE:
+                    await self._blocking(pipeline.rejections.merge, read_rejections)
+                    break
+                result = await self._blocking(self._process_chunk, chunk, read_rejections)
+                await self._put_result(transformed_chunks, counts, result)
+        await transformed_chunks.put(_DONE)
+
+    @staticmethod
+    async def _collect(runner: ProcessStageRunner, pending: deque) -> Tuple[int, List[Dict[str, Any]]]:
+        """Awaits the oldest chunk in flight in a worker process."""
+        future = pending.popleft()
+        await asyncio.wrap_future(future)
+        return runner.collect(future)
+
+    def _process_chunk(self, chunk: List[Dict[str, Any]],
+                       read_rejections: Dict[str, Any]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Validates and transforms one chunk on the executor."""
+        # Merged here so the pipeline's tracker is only ever used by this thread.
+        self.pipeline.rejections.merge(read_rejections)
+        return self.pipeline._validate_and_transform(chunk, PipelineMetrics())
+
+    @staticmethod
+    async def _put_result(transformed_chunks: asyncio.Queue, counts: Dict[str, int],
+                          result: Tuple[int, List[Dict[str, Any]]]):
+        validated_count, records = result
+        counts["validated"] += validated_count
+        if records:
+            await transformed_chunks.put(records)
+
+    async def _write(self, transformed_chunks: asyncio.Queue, output_filepath: str,
+                     counts: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """Analyzes and exports queued chunks; the output is opened with the first one."""
+        first = await transformed_chunks.get()
+        if first is _DONE:
+            if not counts["validated"]:
+                logging.warning("No valid data found after validation. Pipeline stopping.")
+            else:
+                logging.warning("No data survived transformation. Pipeline stopping.")
+            return None
+
+        accumulator = self.pipeline.analyzer.new_accumulator()
+        writer = self.pipeline.exporter.open_stream(output_filepath)
+        await self._blocking(writer.open)
+        try:
+            chunk = first
+            while chunk is not _DONE:
+                await self._blocking(self._write_chunk, writer, accumulator, chunk)
+                chunk = await transformed_chunks.get()
+            analysis_results = accumulator.result()
+            await self._blocking(writer.close, analysis_results)
+        finally:
+            writer.__exit__(None, None, None)
+        logging.info(f"Analysis complete: {analysis_results}")
+        logging.info(f"Pipeline finished. Output saved to {output_filepath}")
+        return analysis_results
+
+    @staticmethod
+    def _write_chunk(writer: Any, accumulator: AnalysisAccumulator, chunk: List[Dict[str, Any]]):
+        accumulator.update(chunk)
+        writer.write_many(chunk)
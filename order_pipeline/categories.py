@@ -0,0 +1,57 @@
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class CategoryDictionary:
+    """
+    Dictionary encoding for a categorical text field such as item or
+    payment_status.
+
+    Each distinct value is stored once, interned, and gets an integer code
+    in order of first appearance; `values[code]` gives the value back. Raw
+    input is mapped through `normalize`, and up to `memo_size` raw values
+    are memoized, so a spelling seen before costs one dict lookup. Records
+    built from canonical() share one string object per value. Those strings
+    keep their cached hash, so grouping on them never hashes a value twice.
+    """
+
+    def __init__(self, normalize: Optional[Callable[[Any], str]] = None, values: Iterable[str] = (),
+                 memo_size: int = 65536):
+        self.normalize = normalize
+        self.memo_size = memo_size
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self._memo: Dict[Any, int] = {}
+        for value in values:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: str) -> int:
+        """Returns the code of an already-normalized value, adding it if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            value = sys.intern(value)
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, raw: Any) -> int:
+        """Normalizes a raw value (memoized) and returns its code."""
+        try:
+            code = self._memo.get(raw)
+        except TypeError:  # unhashable raw values are normalized every time
+            return self.add(self.normalize(raw))
+        if code is None:
+            code = self.add(self.normalize(raw))
+            if len(self._memo) < self.memo_size:
+                self._memo[raw] = code
+        return code
+
+    def canonical(self, raw: Any) -> str:
+        """Returns the shared normalized string for a raw value."""
+        return self.values[self.encode(raw)]
+
+    def decode(self, code: int) -> str:
+        """Returns the value behind a code."""
+        return self.values[code]
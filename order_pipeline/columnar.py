@@ -0,0 +1,299 @@
+import json
+import os
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from order_pipeline.categories import CategoryDictionary
+from order_pipeline.records import OrderRecord
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the columnar cache
+    np = None
+
+# A columnar cache is a directory holding header.json and one raw
+# little-endian array per column, so every column can be memory-mapped.
+COLUMNAR_SUFFIX = '.cols'
+FORMAT_NAME = 'order-columns'
+FORMAT_VERSION = 1
+HEADER_FILENAME = 'header.json'
+
+# Column name -> (file name, dtype). order_id is variable-length UTF-8 text
+# stored as one byte blob plus end offsets; item and payment_status hold codes
+# into the dictionaries kept in the header.
+COLUMNS = {
+    'order_id_offsets': ('order_id.offsets.bin', '<i8'),
+    'order_id_data': ('order_id.data.bin', '|u1'),
+    'timestamp': ('timestamp.bin', '<i8'),
+    'timestamp_offset': ('timestamp_offset.bin', '<i4'),
+    'item': ('item.bin', '<i4'),
+    'quantity': ('quantity.bin', '<f8'),
+    'price': ('price.bin', '<f8'),
+    'total': ('total.bin', '<f8'),
+    'payment_status': ('payment_status.bin', '<i2'),
+}
+
+# Timestamps are int64 microseconds since the Unix epoch (UTC, or wall-clock
+# time for naive values) plus the UTC offset in seconds.
+NO_TIMESTAMP = -2 ** 63
+NAIVE_OFFSET = -2 ** 31
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def is_columnar(path: str) -> bool:
+    """Tells whether a path names a columnar cache directory."""
+    return path.rstrip('/\\').endswith(COLUMNAR_SUFFIX)
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for the columnar cache format.")
+
+def encode_timestamp(value: str) -> Tuple[int, int]:
+    """Turns a transformed ISO timestamp into (epoch microseconds, UTC offset seconds)."""
+    if not value:
+        return NO_TIMESTAMP, NAIVE_OFFSET
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Timestamp {value!r} is not an ISO timestamp and cannot be stored in columnar format.")
+    offset = parsed.utcoffset()
+    if offset is None:
+        return (parsed - _EPOCH) // _MICROSECOND, NAIVE_OFFSET
+    return (parsed.replace(tzinfo=None) - offset - _EPOCH) // _MICROSECOND, int(offset.total_seconds())
+
+def decode_timestamp(micros: int, offset: int) -> str:
+    """Rebuilds the ISO string written by the transformer from its encoded form."""
+    if micros == NO_TIMESTAMP:
+        return ""
+    wall = _EPOCH + timedelta(microseconds=micros)
+    if offset == NAIVE_OFFSET:
+        return wall.isoformat()
+    tz = timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+    return (wall + timedelta(seconds=offset)).replace(tzinfo=tz).isoformat()
+
+class AnalysisColumns:
+    """
+    The `total` and payment status code columns DataAnalyzer.analyze_columns
+    reduces, filled by DataTransformer as it builds each record so columnar
+    analysis never goes back over the records. Plain stdlib arrays, so
+    transforming does not need numpy.
+    """
+
+    def __init__(self):
+        self.totals = array('d')
+        self.status_codes = array('b')
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy sent to a worker process starts empty; what it collects
+        # comes back to the parent through drain().
+        return {"totals": array('d'), "status_codes": array('b')}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+
+    def drain(self) -> Dict[str, Any]:
+        """Returns and clears the columns collected so far (used in worker processes)."""
+        state = {"totals": self.totals, "status_codes": self.status_codes}
+        self.totals = array('d')
+        self.status_codes = array('b')
+        return state
+
+    def merge(self, state: Dict[str, Any]):
+        """Appends columns drained from a worker."""
+        self.totals.extend(state["totals"])
+        self.status_codes.extend(state["status_codes"])
+
+class ColumnarWriter:
+    """
+    Writes transformed records into a columnar cache directory, with the same
+    interface as the JSON stream writers.
+
+    Values are buffered per column and appended to the column files in
+    batches of `batch_size`; close() writes the header with the dictionaries
+    and the analysis summary. Only the seven canonical fields are stored.
+
+    Passing the transformer's `items` and `statuses` dictionaries makes the
+    stored codes the transformer's own codes, looked up on the shared
+    strings; otherwise the writer builds its own.
+    """
+
+    def __init__(self, dirpath: str, batch_size: int = 10000, items: Optional[CategoryDictionary] = None,
+                 statuses: Optional[CategoryDictionary] = None):
+        _require_numpy()
+        self.dirpath = dirpath
+        self.batch_size = batch_size
+        self.records_written = 0
+        self._files: Dict[str, Any] = {}
+        self._pending: Dict[str, List[Any]] = {}
+        self._order_id_end = 0
+        self.items = items if items is not None else CategoryDictionary()
+        self.statuses = statuses if statuses is not None else CategoryDictionary()
+
+    def __enter__(self) -> "ColumnarWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._close_files()
+
+    def open(self):
+        """Creates the directory and truncates the column files."""
+        os.makedirs(self.dirpath, exist_ok=True)
+        # Drop a previous header first so an interrupted write is never loaded.
+        header_path = os.path.join(self.dirpath, HEADER_FILENAME)
+        if os.path.exists(header_path):
+            os.remove(header_path)
+        self._files = {
+            name: open(os.path.join(self.dirpath, filename), 'wb') for name, (filename, _) in COLUMNS.items()
+        }
+        self._pending = {name: [] for name in COLUMNS}
+        self._pending['order_id_offsets'].append(0)
+
+    def write(self, record: Dict[str, Any]):
+        """Appends one record (a dict or an OrderRecord) to the column buffers."""
+        pending = self._pending
+        order_id = str(record['order_id']).encode('utf-8')
+        self._order_id_end += len(order_id)
+        pending['order_id_data'].append(order_id)
+        pending['order_id_offsets'].append(self._order_id_end)
+
+        micros, offset = encode_timestamp(record['timestamp'])
+        pending['timestamp'].append(micros)
+        pending['timestamp_offset'].append(offset)
+
+        pending['item'].append(self.items.add(record['item']))
+        pending['payment_status'].append(self.statuses.add(record['payment_status']))
+
+        pending['quantity'].append(record['quantity'])
+        pending['price'].append(record['price'])
+        pending['total'].append(record['total'])
+
+        self.records_written += 1
+        if len(pending['total']) >= self.batch_size:
+            self._flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Writes every record from an iterable."""
+        for record in records:
+            self.write(record)
+
+    def close(self, analysis: Dict[str, Any]):
+        """Flushes the columns and writes the header, completing the cache."""
+        self._flush()
+        self._close_files()
+        header = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "count": self.records_written,
+            "columns": {name: {"file": filename, "dtype": dtype} for name, (filename, dtype) in COLUMNS.items()},
+            "dictionaries": {
+                "item": list(self.items.values),
+                "payment_status": list(self.statuses.values)
+            },
+            "analysis_summary": analysis
+        }
+        header_path = os.path.join(self.dirpath, HEADER_FILENAME)
+        with open(header_path + '.tmp', 'w') as f:
+            json.dump(header, f, indent=4)
+        os.replace(header_path + '.tmp', header_path)
+
+    def _flush(self):
+        """Appends the buffered values of every column to its file."""
+        for name, values in self._pending.items():
+            if not values:
+                continue
+            if name == 'order_id_data':
+                self._files[name].write(b''.join(values))
+            else:
+                np.asarray(values, dtype=COLUMNS[name][1]).tofile(self._files[name])
+            values.clear()
+
+    def _close_files(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+class ColumnarOrders:
+    """
+    A columnar cache loaded with every column memory-mapped.
+
+    Loading only reads the header; column data is paged in as it is used.
+    DataAnalyzer.analyze_columnar works on the columns directly, and records
+    can still be rebuilt when needed.
+    """
+
+    _iter_block_size = 10000
+
+    def __init__(self, dirpath: str):
+        _require_numpy()
+        header_path = os.path.join(dirpath, HEADER_FILENAME)
+        if not os.path.exists(header_path):
+            raise FileNotFoundError(f"Columnar cache not found at path: {dirpath}")
+        try:
+            with open(header_path, 'r') as f:
+                header = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to decode JSON: {e}")
+        if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar cache format in {dirpath}.")
+
+        self.dirpath = dirpath
+        self.count = header["count"]
+        self.analysis_summary = header.get("analysis_summary")
+        self.item_dictionary: List[str] = header["dictionaries"]["item"]
+        self.status_dictionary: List[str] = header["dictionaries"]["payment_status"]
+        self.columns = {
+            name: self._map_column(dirpath, spec["file"], spec["dtype"])
+            for name, spec in header["columns"].items()
+        }
+
+    @staticmethod
+    def _map_column(dirpath: str, filename: str, dtype: str):
+        """Memory-maps one column file (empty files cannot be mapped)."""
+        path = os.path.join(dirpath, filename)
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> OrderRecord:
+        """Rebuilds one record."""
+        columns = self.columns
+        offsets = columns['order_id_offsets']
+        order_id = bytes(columns['order_id_data'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+        return OrderRecord(
+            order_id,
+            decode_timestamp(int(columns['timestamp'][index]), int(columns['timestamp_offset'][index])),
+            self.item_dictionary[columns['item'][index]],
+            float(columns['quantity'][index]),
+            float(columns['price'][index]),
+            float(columns['total'][index]),
+            self.status_dictionary[columns['payment_status'][index]]
+        )
+
+    def __iter__(self) -> Iterator[OrderRecord]:
+        """Yields every record, converting the columns a block at a time."""
+        columns = self.columns
+        offsets = columns['order_id_offsets']
+        items, statuses = self.item_dictionary, self.status_dictionary
+        for start in range(0, self.count, self._iter_block_size):
+            end = min(start + self._iter_block_size, self.count)
+            blob = bytes(columns['order_id_data'][offsets[start]:offsets[end]])
+            ends = (offsets[start:end + 1] - offsets[start]).tolist()
+            block = zip(
+                ends, ends[1:],
+                columns['timestamp'][start:end].tolist(), columns['timestamp_offset'][start:end].tolist(),
+                columns['item'][start:end].tolist(), columns['quantity'][start:end].tolist(),
+                columns['price'][start:end].tolist(), columns['total'][start:end].tolist(),
+                columns['payment_status'][start:end].tolist()
+            )
+            for id_start, id_end, micros, offset, item, quantity, price, total, status in block:
+                yield OrderRecord(
+                    blob[id_start:id_end].decode('utf-8'), decode_timestamp(micros, offset), items[item],
+                    quantity, price, total, statuses[status]
+                )
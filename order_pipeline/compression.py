@@ -0,0 +1,38 @@
+import bz2
+import gzip
+import lzma
+from typing import IO, Optional, Tuple
+
+# Compressed files are recognized by a trailing suffix after the data
+# format's own, e.g. 'orders.json.gz' or 'orders.jsonl.xz'.
+COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz')
+
+def split_compression(filepath: str) -> Tuple[str, Optional[str]]:
+    """Splits 'orders.json.gz' into ('orders.json', '.gz'); uncompressed paths get None."""
+    for suffix in COMPRESSION_SUFFIXES:
+        if filepath.endswith(suffix):
+            return filepath[:-len(suffix)], suffix
+    return filepath, None
+
+def open_file(filepath: str, mode: str = 'r', compression_level: Optional[int] = None, buffering: int = -1) -> IO[str]:
+    """
+    Opens a file in text mode, compressing or decompressing transparently
+    according to its suffix.
+
+    `compression_level` only applies when writing: 1-9 for gzip and bz2
+    (default 9), 0-9 for the xz preset (default 6). `buffering` only applies
+    to uncompressed files; the compressors keep their own buffers.
+    """
+    _, suffix = split_compression(filepath)
+    text_mode = mode + 't'
+    if suffix == '.gz':
+        level = 9 if compression_level is None else compression_level
+        return gzip.open(filepath, text_mode, compresslevel=level)
+    if suffix == '.bz2':
+        level = 9 if compression_level is None else compression_level
+        return bz2.open(filepath, text_mode, compresslevel=level)
+    if suffix == '.xz':
+        if 'r' in mode:
+            return lzma.open(filepath, text_mode)
+        return lzma.open(filepath, text_mode, preset=compression_level)
+    return open(filepath, mode, buffering=buffering)
@@ -0,0 +1,251 @@
+import hashlib
+import logging
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from order_pipeline.records import OrderRecord
+from order_pipeline.rejections import RejectionTracker
+
+DEDUP_POLICIES = ('first', 'last', 'reject')
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. A miss means the key was never
+    added; a hit only means it may have been.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        """Derives the bit positions from one 128-bit hash (double hashing)."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class OrderIdIndex:
+    """
+    Maps each order_id to (occurrences so far, ordinal of the last one).
+
+    The index is an exact dict until it holds `max_memory_ids` ids. It then
+    moves to a SQLite table in a temporary file under `spill_dir`, with a
+    Bloom filter in front so ids that are certainly new skip the disk lookup.
+    Both tiers are exact; the filter only saves reads.
+    """
+
+    _query_batch = 500
+
+    def __init__(self, max_memory_ids: int = 1000000, spill_dir: Optional[str] = None,
+                 expected_ids: int = 10000000):
+        self.max_memory_ids = max_memory_ids
+        self.spill_dir = spill_dir
+        self.expected_ids = expected_ids
+        self._memory: Dict[str, Tuple[int, int]] = {}
+        self._db = None
+        self._db_path = None
+        self._bloom = None
+
+    @property
+    def spilled(self) -> bool:
+        """Tells whether the index has moved to disk."""
+        return self._db is not None
+
+    def add(self, keys: Sequence[str], ordinals: Iterable[int]) -> List[int]:
+        """Records one occurrence of each key and returns its occurrence number."""
+        if self._db is None:
+            memory = self._memory
+            counts = []
+            for key, ordinal in zip(keys, ordinals):
+                entry = memory.get(key)
+                count = 1 if entry is None else entry[0] + 1
+                memory[key] = (count, ordinal)
+                counts.append(count)
+            if len(memory) > self.max_memory_ids:
+                self._spill()
+            return counts
+
+        bloom = self._bloom
+        unique_keys = list(dict.fromkeys(keys))
+        known = self._fetch([key for key in unique_keys if key in bloom])
+        counts = []
+        for key, ordinal in zip(keys, ordinals):
+            entry = known.get(key)
+            count = 1 if entry is None else entry[0] + 1
+            known[key] = (count, ordinal)
+            counts.append(count)
+        for key in unique_keys:
+            bloom.add(key)
+        self._db.executemany(
+            "INSERT OR REPLACE INTO ids VALUES (?, ?, ?)",
+            ((key, count, last) for key, (count, last) in known.items())
+        )
+        return counts
+
+    def lookup(self, keys: Sequence[str]) -> List[Tuple[int, int]]:
+        """Returns (occurrences, last ordinal) for keys that were added."""
+        if self._db is None:
+            memory = self._memory
+            return [memory[key] for key in keys]
+        known = self._fetch(list(dict.fromkeys(keys)))
+        return [known[key] for key in keys]
+
+    def _fetch(self, keys: List[str]) -> Dict[str, Tuple[int, int]]:
+        """Reads the stored entries for some keys from disk."""
+        found = {}
+        for start in range(0, len(keys), self._query_batch):
+            batch = keys[start:start + self._query_batch]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._db.execute(f"SELECT key, count, last FROM ids WHERE key IN ({placeholders})", batch)
+            for key, count, last in rows:
+                found[key] = (count, last)
+        return found
+
+    def _spill(self):
+        """Moves the in-memory index to a temporary SQLite file."""
+        fd, self._db_path = tempfile.mkstemp(prefix='order_ids_', suffix='.sqlite', dir=self.spill_dir)
+        os.close(fd)
+        logging.info(f"Order id index exceeded {self.max_memory_ids} ids; moving it to {self._db_path}.")
+        self._db = sqlite3.connect(self._db_path)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE ids (key TEXT PRIMARY KEY, count INTEGER NOT NULL, last INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._db.executemany(
+            "INSERT INTO ids VALUES (?, ?, ?)", ((key, count, last) for key, (count, last) in self._memory.items())
+        )
+        self._bloom = BloomFilter(max(self.expected_ids, 2 * len(self._memory)))
+        for key in self._memory:
+            self._bloom.add(key)
+        self._memory = {}
+
+    def close(self):
+        """Drops the index, deleting its temporary file if it spilled."""
+        self._memory = {}
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._db_path)
+        self._bloom = None
+
+class DataDeduplicator:
+    """
+    Drops transformed records whose order_id occurs more than once.
+
+    Policies: 'first' keeps the first occurrence, 'last' keeps the last one
+    and 'reject' drops every record of a duplicated order_id. Dropped records
+    are reported to the rejection tracker as `duplicate_order_id`, and the
+    totals are in summary(). 'last' and 'reject' need a second pass, so
+    streamed chunks are spooled to a temporary file in between.
+    """
+
+    def __init__(self, policy: str = 'first', max_memory_ids: int = 1000000, spill_dir: Optional[str] = None,
+                 rejections: Optional[RejectionTracker] = None):
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(f"Unknown dedup policy '{policy}'. Expected one of: {', '.join(DEDUP_POLICIES)}.")
+        self.policy = policy
+        self.max_memory_ids = max_memory_ids
+        self.spill_dir = spill_dir
+        self.rejections = rejections or RejectionTracker()
+        self.duplicate_order_ids = 0
+        self.records_dropped = 0
+        self.index_spilled = False
+
+    def deduplicate(self, records: List[Any]) -> List[Any]:
+        """Deduplicates an in-memory list of records, keeping their order."""
+        kept = []
+        for chunk in self._run([records], (lambda: [records]) if self.policy != 'first' else None):
+            kept.extend(chunk)
+        return kept
+
+    def iter_deduplicated(self, chunks: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        """Deduplicates a stream of record chunks with bounded memory."""
+        if self.policy == 'first':
+            yield from self._run(chunks, None)
+            return
+
+        with tempfile.TemporaryFile(prefix='dedup_', dir=self.spill_dir) as spool:
+            def spooled():
+                for chunk in chunks:
+                    pickle.dump(chunk, spool, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield chunk
+
+            def replay():
+                spool.seek(0)
+                while True:
+                    try:
+                        yield pickle.load(spool)
+                    except EOFError:
+                        return
+
+            yield from self._run(spooled(), replay)
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the duplicate counts for the run summary."""
+        return {
+            "policy": self.policy,
+            "duplicate_order_ids": self.duplicate_order_ids,
+            "records_dropped": self.records_dropped
+        }
+
+    def _run(self, chunks: Iterable[List[Any]],
+             replay: Optional[Callable[[], Iterable[List[Any]]]]) -> Iterator[List[Any]]:
+        """
+        Indexes every chunk, deciding 'first' on the spot; the other policies
+        decide on a second pass over `replay()` once all counts are known.
+        """
+        index = OrderIdIndex(self.max_memory_ids, self.spill_dir)
+        try:
+            ordinal = 0
+            for chunk in chunks:
+                counts = index.add([record['order_id'] for record in chunk], range(ordinal, ordinal + len(chunk)))
+                ordinal += len(chunk)
+                self.duplicate_order_ids += counts.count(2)
+                if replay is None:
+                    kept = self._keep(chunk, [count == 1 for count in counts])
+                    if kept:
+                        yield kept
+            self.index_spilled = index.spilled
+
+            if replay is not None:
+                ordinal = 0
+                for chunk in replay():
+                    entries = index.lookup([record['order_id'] for record in chunk])
+                    if self.policy == 'last':
+                        keep = [last == ordinal + i for i, (_, last) in enumerate(entries)]
+                    else:
+                        keep = [count == 1 for count, _ in entries]
+                    ordinal += len(chunk)
+                    kept = self._keep(chunk, keep)
+                    if kept:
+                        yield kept
+        finally:
+            index.close()
+
+    def _keep(self, chunk: List[Any], keep: List[bool]) -> List[Any]:
+        """Returns the records to keep and reports the others."""
+        kept = []
+        for record, keep_record in zip(chunk, keep):
+            if keep_record:
+                kept.append(record)
+                continue
+            self.records_dropped += 1
+            self.rejections.reject(
+                record.to_dict() if isinstance(record, OrderRecord) else record,
+                "duplicate_order_id", "deduplication",
+                "Skipping duplicate order_id %s (policy '%s').", record['order_id'], self.policy
+            )
+        return kept
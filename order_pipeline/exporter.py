@@ -1,15 +1,190 @@
 import json
 import logging
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Iterable, Callable, Optional, Union
+from order_pipeline.reader import is_json_lines, is_supported_format
+from order_pipeline.compression import open_file, split_compression
+from order_pipeline.categories import CategoryDictionary
+from order_pipeline.records import OrderRecord
+from order_pipeline.columnar import ColumnarWriter, is_columnar
+
+def _encode_record(value: Any) -> Dict[str, Any]:
+    """json `default` hook that writes OrderRecords as their canonical dicts."""
+    if isinstance(value, OrderRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class JsonStreamWriter:
+    """
+    Writes an export document incrementally.
+
+    Records are serialized as they are written and flushed to disk in batches
+    of `batch_size`; the analysis summary is written by close(). The indented
+    layout matches json.dump(..., indent=4) and the compact layout matches
+    json.dumps(..., separators=(',', ':')).
+    """
+
+    def __init__(self, filepath: str, compact: bool = False, batch_size: int = 1000, buffer_size: int = 1024 * 1024,
+                 compression_level: Optional[int] = None):
+        self.filepath = filepath
+        self.compact = compact
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.compression_level = compression_level
+        self.records_written = 0
+        self._file = None
+        self._pending: List[str] = []
+        if compact:
+            self._encoder = json.JSONEncoder(separators=(',', ':'), default=_encode_record)
+            self._record_prefix = ''
+        else:
+            self._encoder = json.JSONEncoder(indent=4, default=_encode_record)
+            self._record_prefix = '\n' + ' ' * 8
+
+    def __enter__(self) -> "JsonStreamWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def open(self):
+        """Opens the output file and writes the document header."""
+        self._file = open_file(self.filepath, 'w', self.compression_level, self.buffer_size)
+        self._file.write('{"cleaned_data":[' if self.compact else '{\n    "cleaned_data": [')
+
+    def write(self, record: Dict[str, Any]):
+        """Serializes one record, flushing the pending batch when it is full."""
+        text = self._encoder.encode(record)
+        if not self.compact:
+            text = text.replace('\n', self._record_prefix)
+        separator = ',' if self.records_written else ''
+        self._pending.append(separator + self._record_prefix + text)
+        self.records_written += 1
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Writes every record from an iterable."""
+        for record in records:
+            self.write(record)
+
+    def close(self, analysis: Dict[str, Any]):
+        """Writes the analysis summary after the records and closes the file."""
+        self._flush()
+        summary = self._encoder.encode(analysis)
+        if self.compact:
+            self._file.write('],"analysis_summary":' + summary + '}')
+        else:
+            closing = '\n    ]' if self.records_written else ']'
+            self._file.write(closing + ',\n    "analysis_summary": ' + summary.replace('\n', '\n    ') + '\n}')
+        self._file.close()
+        self._file = None
+
+    def _flush(self):
+        """Writes the pending batch of serialized records in one call."""
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self._pending = []
+
+class JsonLinesWriter:
+    """
+    Writes records to a JSON Lines file, one per line, with the same
+    interface as JsonStreamWriter.
+
+    A JSON Lines file has no room for a trailing summary, so close() writes
+    the analysis to a sidecar file next to it (see summary_filepath).
+    """
+
+    def __init__(self, filepath: str, compact: bool = False, batch_size: int = 1000, buffer_size: int = 1024 * 1024,
+                 compression_level: Optional[int] = None):
+        self.filepath = filepath
+        self.compact = compact
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.compression_level = compression_level
+        self.records_written = 0
+        self._file = None
+        self._pending: List[str] = []
+        if compact:
+            self._encoder = json.JSONEncoder(separators=(',', ':'), default=_encode_record)
+        else:
+            self._encoder = json.JSONEncoder(default=_encode_record)
+
+    @staticmethod
+    def summary_filepath(filepath: str) -> str:
+        """Returns the sidecar path for a JSON Lines file ('out.jsonl.gz' -> 'out.summary.json')."""
+        return os.path.splitext(split_compression(filepath)[0])[0] + '.summary.json'
+
+    def __enter__(self) -> "JsonLinesWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def open(self):
+        """Opens the output file."""
+        self._file = open_file(self.filepath, 'w', self.compression_level, self.buffer_size)
+
+    def write(self, record: Dict[str, Any]):
+        """Serializes one record, flushing the pending batch when it is full."""
+        self._pending.append(self._encoder.encode(record) + '\n')
+        self.records_written += 1
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Writes every record from an iterable."""
+        for record in records:
+            self.write(record)
+
+    def close(self, analysis: Dict[str, Any]):
+        """Closes the records file and writes the analysis sidecar."""
+        self._flush()
+        self._file.close()
+        self._file = None
+        with open(self.summary_filepath(self.filepath), 'w') as f:
+            if self.compact:
+                json.dump({"analysis_summary": analysis}, f, separators=(',', ':'))
+            else:
+                json.dump({"analysis_summary": analysis}, f, indent=4)
+
+    def _flush(self):
+        """Writes the pending batch of serialized records in one call."""
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self._pending = []
 
 class DataExporter:
-    """Exports cleaned data to a JSON file."""
+    """
+    Exports cleaned data to a JSON file, or to a JSON Lines file
+    (.jsonl/.ndjson) with the analysis in a sidecar file. A trailing .gz,
+    .bz2 or .xz compresses the output at `compression_level`. A path ending
+    in .cols is written as a columnar cache directory (see columnar.py),
+    storing item and status codes from `items` and `statuses` if given.
+    """
+
+    def __init__(self, compact: bool = False, batch_size: int = 1000, buffer_size: int = 1024 * 1024,
+                 compression_level: Optional[int] = None, items: Optional[CategoryDictionary] = None,
+                 statuses: Optional[CategoryDictionary] = None):
+        self.compact = compact
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.compression_level = compression_level
+        self.items = items
+        self.statuses = statuses
 
     def export_data(self, data: List[Dict[str, Any]], analysis: Dict[str, Any], filepath: str):
-        """Writes the cleaned data and analysis to a JSON file."""
-        
-        if not filepath.endswith('.json'):
-            raise ValueError("Export file must be a .json file.")
+        """Writes the cleaned data and analysis to a JSON or JSON Lines file."""
+        self._check_filepath(filepath)
+        if is_json_lines(filepath) or is_columnar(filepath):
+            self.export_stream(data, lambda: analysis, filepath)
+            return
 
         output_data = {
             "analysis_summary": analysis,
@@ -17,8 +192,53 @@ class DataExporter:
         }
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(output_data, f, indent=4)
+            with open_file(filepath, 'w', self.compression_level) as f:
+                if self.compact:
+                    json.dump(output_data, f, separators=(',', ':'), default=_encode_record)
+                else:
+                    json.dump(output_data, f, indent=4, default=_encode_record)
+            logging.info(f"Successfully exported data to {filepath}")
+        except IOError as e:
+            logging.error(f"Failed to write to file {filepath}: {e}")
+            raise
+        except TypeError as e:
+            logging.error(f"Data is not JSON serializable: {e}")
+            raise
+
+    def open_stream(self, filepath: str) -> Union[JsonStreamWriter, JsonLinesWriter, ColumnarWriter]:
+        """Returns an unopened writer for the file type, using this exporter's layout settings."""
+        self._check_filepath(filepath)
+        if is_columnar(filepath):
+            return ColumnarWriter(filepath, batch_size=self.batch_size, items=self.items, statuses=self.statuses)
+        writer_class = JsonLinesWriter if is_json_lines(filepath) else JsonStreamWriter
+        return writer_class(
+            filepath, compact=self.compact, batch_size=self.batch_size, buffer_size=self.buffer_size,
+            compression_level=self.compression_level
+        )
+
+    @staticmethod
+    def _check_filepath(filepath: str):
+        """Rejects output paths with an unsupported extension."""
+        if not is_supported_format(filepath) and not is_columnar(filepath):
+            raise ValueError(
+                "Export file must be a .json file (or .jsonl/.ndjson for JSON Lines), "
+                "optionally with .gz, .bz2 or .xz, or a .cols columnar cache."
+            )
+
+    def export_stream(self, records: Iterable[Dict[str, Any]], analysis: Callable[[], Dict[str, Any]], filepath: str):
+        """
+        Writes cleaned records to a JSON, JSON Lines or columnar output as
+        they arrive.
+
+        `analysis` is called once the records are exhausted, so the summary is
+        written after `cleaned_data` (or to the sidecar file). The output has
+        the same layout as export_data.
+        """
+        writer = self.open_stream(filepath)
+        try:
+            with writer:
+                writer.write_many(records)
+                writer.close(analysis())
             logging.info(f"Successfully exported data to {filepath}")
         except IOError as e:
             logging.error(f"Failed to write to file {filepath}: {e}")
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+from order_pipeline.analyzer import AnalysisAccumulator
+from order_pipeline.records import OrderRecord
+
+class IncrementalState:
+    """
+    Watermarks and running totals carried from one incremental run to the
+    next.
+
+    Append-only JSON Lines inputs are tracked by byte offset: only lines
+    appended since the last run are read. A fingerprint of the first bytes
+    detects a file that was replaced or truncated, which is then read from
+    the start again. Other inputs (JSON arrays, compressed files) cannot be
+    resumed by offset, so records whose order_id was accepted in an earlier
+    run are skipped instead. Rejected records are remembered by a hash of
+    their content: the same bad record is skipped on later runs, while a
+    corrected resend of that order is processed. The state keeps the
+    `max_seen_ids` most recently accepted order_ids and as many rejected
+    records; older ones are forgotten and processed again if they reappear.
+    `accumulator` holds the totals of every run so far.
+    """
+
+    version = 1
+    _fingerprint_size = 4096
+
+    def __init__(self, max_seen_ids: int = 1000000):
+        self.accumulator = AnalysisAccumulator()
+        self.byte_offsets: Dict[str, Dict[str, Any]] = {}
+        self.max_seen_ids = max_seen_ids
+        # Ordered oldest first, so the oldest ids are dropped past the limit.
+        self.seen_order_ids: Dict[str, None] = {}
+        self._new_order_ids: Dict[str, None] = {}
+        # Content hash -> order_id ('' if none) of rejected records, oldest first.
+        self.rejected_records: Dict[str, str] = {}
+        self._rejected_ids = set()
+
+    @staticmethod
+    def _key(filepath: str) -> str:
+        return os.path.abspath(filepath)
+
+    def start_offset(self, filepath: str) -> int:
+        """Returns where reading should resume in an append-only file."""
+        entry = self.byte_offsets.get(self._key(filepath))
+        if entry is None:
+            return 0
+        offset = entry["byte_offset"]
+        if os.path.getsize(filepath) < offset or self._fingerprint(filepath, offset) != entry["fingerprint"]:
+            logging.warning(f"Input {filepath} was truncated or replaced since the last run; reading it from the start.")
+            return 0
+        return offset
+
+    def advance_offset(self, filepath: str, offset: int):
+        """Records that an append-only file has been processed up to `offset`."""
+        self.byte_offsets[self._key(filepath)] = {
+            "byte_offset": offset,
+            "fingerprint": self._fingerprint(filepath, offset)
+        }
+
+    @classmethod
+    def _fingerprint(cls, filepath: str, offset: int) -> str:
+        """Hashes the start of the already-processed part of a file."""
+        with open(filepath, 'rb') as f:
+            return hashlib.sha256(f.read(min(offset, cls._fingerprint_size))).hexdigest()
+
+    @staticmethod
+    def _order_key(record: Any) -> str:
+        order_id = record.get('order_id')
+        return '' if order_id is None else str(order_id).strip()
+
+    @staticmethod
+    def _record_hash(record: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def filter_new(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drops records whose order_id was accepted in an earlier run, and
+        unchanged copies of records rejected in an earlier run. Only records
+        sharing an order_id with a rejected one are hashed.
+        """
+        seen = self.seen_order_ids
+        rejected, rejected_ids = self.rejected_records, self._rejected_ids
+        new_records = []
+        for record in records:
+            if isinstance(record, dict):
+                key = self._order_key(record)
+                if key in seen:
+                    continue
+                if key in rejected_ids and self._record_hash(record) in rejected:
+                    continue
+            new_records.append(record)
+        return new_records
+
+    def mark_seen(self, records: Iterable[Dict[str, Any]]):
+        """
+        Remembers the order_ids of records accepted in this run (dicts or
+        OrderRecords), so later runs skip them. They take effect when the
+        state is saved.
+        """
+        new_ids = self._new_order_ids
+        for record in records:
+            order_id = record.order_id if type(record) is OrderRecord else record.get('order_id')
+            if order_id is not None:
+                key = str(order_id).strip()
+                new_ids.pop(key, None)
+                new_ids[key] = None
+
+    def mark_rejected(self, records: Iterable[Any]):
+        """
+        Remembers records rejected in this run so later runs skip unchanged
+        copies. Records whose order_id was also accepted are left out.
+        """
+        for record in records:
+            if isinstance(record, dict):
+                key = self._order_key(record)
+                if key not in self._new_order_ids:
+                    digest = self._record_hash(record)
+                    self.rejected_records.pop(digest, None)
+                    self.rejected_records[digest] = key
+                    self._rejected_ids.add(key)
+
+    def _kept_rejected_records(self, accepted: Iterable[str]) -> List[List[str]]:
+        """Returns the rejected records to keep, oldest first, within `max_seen_ids`."""
+        accepted = set(accepted)
+        kept = [[digest, key] for digest, key in self.rejected_records.items() if key not in accepted]
+        return kept[max(0, len(kept) - self.max_seen_ids):]
+
+    def _merged_order_ids(self) -> List[str]:
+        """Returns the ids to keep, oldest first, within `max_seen_ids`."""
+        merged = {key: None for key in self.seen_order_ids if key not in self._new_order_ids}
+        merged.update(self._new_order_ids)
+        return list(islice(merged, max(0, len(merged) - self.max_seen_ids), None))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the state as JSON-serializable data."""
+        order_ids = self._merged_order_ids()
+        return {
+            "version": self.version,
+            "accumulator": self.accumulator.to_dict(),
+            "byte_offsets": self.byte_offsets,
+            "seen_order_ids": order_ids,
+            "rejected_records": self._kept_rejected_records(order_ids)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_seen_ids: int = 1000000) -> "IncrementalState":
+        """Rebuilds the state from the output of to_dict."""
+        try:
+            if data["version"] != cls.version:
+                raise ValueError(f"unsupported version {data['version']}")
+            state = cls(max_seen_ids)
+            state.accumulator = AnalysisAccumulator.from_dict(data["accumulator"])
+            state.byte_offsets = {
+                path: {"byte_offset": int(entry["byte_offset"]), "fingerprint": str(entry["fingerprint"])}
+                for path, entry in data["byte_offsets"].items()
+            }
+            state.seen_order_ids = dict.fromkeys(data["seen_order_ids"])
+            # Absent from state files written before rejected records were kept.
+            state.rejected_records = {str(digest): str(key) for digest, key in data.get("rejected_records", [])}
+            state._rejected_ids = set(state.rejected_records.values())
+            return state
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Invalid incremental state: {e}")
+
+    def save(self, filepath: str):
+        """Writes the state to a JSON file, replacing it atomically."""
+        temp_filepath = f"{filepath}.tmp"
+        with open(temp_filepath, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_filepath, filepath)
+
+    @classmethod
+    def load(cls, filepath: str, max_seen_ids: int = 1000000) -> "IncrementalState":
+        """Reads a state file written by save, or returns a fresh state if there is none."""
+        if not os.path.exists(filepath):
+            return cls(max_seen_ids)
+        try:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to decode JSON: {e}")
+        return cls.from_dict(data, max_seen_ids)
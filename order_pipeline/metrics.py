@@ -0,0 +1,191 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+class StageMetrics:
+    """Totals for one pipeline stage, summed over every call to it."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.records_in = 0
+        self.records_out = 0
+        self.peak_memory: Optional[int] = None
+
+    @property
+    def records_per_second(self) -> float:
+        """Throughput over the records the stage consumed (or produced, for readers)."""
+        records = self.records_in or self.records_out
+        return records / self.wall_time if self.wall_time > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the metrics as JSON-serializable data."""
+        return {
+            "calls": self.calls,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            "records_in": self.records_in,
+            "records_out": self.records_out,
+            "records_per_second": round(self.records_per_second, 1),
+            "peak_memory": self.peak_memory
+        }
+
+class StageCall:
+    """Handed to the body of a timed stage so it can report its output size."""
+
+    def __init__(self, records_in: int):
+        self.records_in = records_in
+        self.records_out = 0
+
+class StageHook:
+    """
+    Base class for objects notified around every stage call.
+
+    Subclasses override the methods they need; a profiler, tracer or custom
+    logger can attach to one stage by checking `stage`.
+    """
+
+    def before_stage(self, stage: str):
+        """Called just before a stage starts working on a batch or chunk."""
+
+    def after_stage(self, stage: str, metrics: StageMetrics):
+        """Called just after, with the stage's running totals."""
+
+class ProfilerHook(StageHook):
+    """Runs cProfile around every call of a single stage."""
+
+    def __init__(self, stage: str, output_filepath: Optional[str] = None):
+        self.stage = stage
+        self.output_filepath = output_filepath
+        self.profile = cProfile.Profile()
+
+    def before_stage(self, stage: str):
+        if stage == self.stage:
+            self.profile.enable()
+
+    def after_stage(self, stage: str, metrics: StageMetrics):
+        if stage == self.stage:
+            self.profile.disable()
+
+    def stats(self) -> pstats.Stats:
+        """Returns the collected profile."""
+        return pstats.Stats(self.profile)
+
+    def save(self):
+        """Writes the profile to `output_filepath` in pstats format."""
+        if self.output_filepath:
+            self.profile.dump_stats(self.output_filepath)
+
+class PipelineMetrics:
+    """
+    Records wall time, CPU time, record counts and (optionally) peak traced
+    memory per stage.
+
+    Time is exclusive: while a stage call is open, a nested call (e.g. a
+    reader pulled lazily by a later stage) is charged to its own stage only.
+    CPU time is that of the current process, so for stages run on a process
+    pool it covers the parent's share of the work. Peak memory is the highest
+    total traced by tracemalloc while the stage ran.
+    """
+
+    def __init__(self, track_memory: bool = False, hooks: Sequence[StageHook] = ()):
+        self.track_memory = track_memory
+        self.hooks = list(hooks)
+        self.stages: Dict[str, StageMetrics] = {}
+        self.wall_time = 0.0
+        self._started_tracing = False
+        self._run_start = None
+        self._stack: List[StageMetrics] = []
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def start(self):
+        """Marks the start of the run and starts tracemalloc if requested."""
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._run_start = time.perf_counter()
+
+    def stop(self):
+        """Marks the end of the run and stops tracemalloc if we started it. Later calls do nothing."""
+        if self._run_start is not None:
+            self.wall_time = time.perf_counter() - self._run_start
+            self._run_start = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, records_in: int = 0) -> Iterator[StageCall]:
+        """Times the body as one call of stage `name`."""
+        metrics = self.stages.get(name)
+        if metrics is None:
+            metrics = self.stages[name] = StageMetrics(name)
+        call = StageCall(records_in)
+
+        self._pause()
+        for hook in self.hooks:
+            hook.before_stage(name)
+        self._stack.append(metrics)
+        self._resume()
+        try:
+            yield call
+        finally:
+            self._pause()
+            self._stack.pop()
+            metrics.calls += 1
+            metrics.records_in += call.records_in
+            metrics.records_out += call.records_out
+            for hook in self.hooks:
+                hook.after_stage(name, metrics)
+            self._resume()
+
+    def _pause(self):
+        """Charges the time since the last resume to the innermost open stage."""
+        if not self._stack:
+            return
+        metrics = self._stack[-1]
+        metrics.wall_time += time.perf_counter() - self._wall_start
+        metrics.cpu_time += time.process_time() - self._cpu_start
+        if self.track_memory and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            metrics.peak_memory = max(metrics.peak_memory or 0, peak)
+
+    def _resume(self):
+        """Restarts the clocks for the innermost open stage."""
+        if not self._stack:
+            return
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def timed_chunks(self, name: str, chunks: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        """Yields chunks from an iterator, timing each fetch as stage `name`."""
+        iterator = iter(chunks)
+        while True:
+            with self.stage(name) as call:
+                chunk = next(iterator, None)
+                if chunk is not None:
+                    call.records_out = len(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns all metrics as JSON-serializable data."""
+        return {
+            "wall_time": round(self.wall_time, 6),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()}
+        }
+
+    def save(self, filepath: str):
+        """Writes the metrics to a JSON file."""
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
@@ -0,0 +1,119 @@
+import logging
+import logging.handlers
+import multiprocessing
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+# The stage object a worker process runs chunks through; set once per worker
+# by _init_worker so it is not pickled again for every chunk.
+_worker_stage = None
+
+def _drain_worker_state(stage: Any) -> Any:
+    """Collects per-worker state (counters etc.) a stage wants sent back."""
+    drain = getattr(stage, '_drain_worker_state', None)
+    return drain() if drain is not None else None
+
+def _init_worker(stage_bytes: bytes, log_queue, log_level: int):
+    """Installs the stage and routes the worker's log records to the parent."""
+    global _worker_stage
+    # The stage is pickled explicitly so that forked workers also get a
+    # proper copy (e.g. without the parent's open file handles).
+    stage = pickle.loads(stage_bytes)
+    _worker_stage = stage
+    # Discard counters copied from the parent so only new work is reported.
+    _drain_worker_state(stage)
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(log_level)
+
+def _run_chunk(method_name: str, chunk: Any) -> Tuple[Any, Any]:
+    """Calls a method of the worker's stage on one chunk."""
+    result = getattr(_worker_stage, method_name)(chunk)
+    return result, _drain_worker_state(_worker_stage)
+
+def split_chunks(data: Sequence[Any], chunk_size: int) -> Iterator[Sequence[Any]]:
+    """Splits a sequence into consecutive slices of at most `chunk_size` items."""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+class ProcessStageRunner:
+    """
+    Runs a stage method over chunks of records in a process pool.
+
+    Each worker receives a copy of `stage` once at start-up. Results come back
+    in the order the chunks were submitted, and at most `max_pending` chunks
+    are in flight so a lazy chunk iterator is never drained ahead of time.
+    Worker log records are forwarded through a queue to the parent's root
+    handlers, so every line is written whole by a single process.
+
+    Stages may define `_drain_worker_state()`, called in the worker after each
+    chunk, and `_merge_worker_state(state)`, called with its result on the
+    parent's stage, to send counters and similar side results back.
+    """
+
+    def __init__(self, stage: Any, workers: int, max_pending: int = 0):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        self.stage = stage
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self._executor = None
+        self._listener = None
+
+    def __enter__(self) -> "ProcessStageRunner":
+        context = multiprocessing.get_context()
+        log_queue = context.Queue()
+        root = logging.getLogger()
+        self._listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+        self._listener.start()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(pickle.dumps(self.stage), log_queue, root.getEffectiveLevel())
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        self._executor = None
+        self._listener.stop()
+        self._listener = None
+
+    def map(self, method_name: str, chunks: Iterable[Any]) -> Iterator[Any]:
+        """Yields `stage.<method_name>(chunk)` for every chunk, in order."""
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.submit(method_name, chunk))
+            if len(pending) >= self.max_pending:
+                yield self.collect(pending.popleft())
+        while pending:
+            yield self.collect(pending.popleft())
+
+    def submit(self, method_name: str, chunk: Any) -> Future:
+        """
+        Starts `stage.<method_name>(chunk)` in a worker. Pass the future to
+        collect() for the result; it can be awaited first with
+        asyncio.wrap_future.
+        """
+        return self._executor.submit(_run_chunk, method_name, chunk)
+
+    def collect(self, future: Future) -> Any:
+        """Waits for a chunk and merges the worker state it sent back."""
+        result, state = future.result()
+        if state is not None:
+            self.stage._merge_worker_state(state)
+        return result
+
+def run_chunked(stage: Any, method_name: str, data: Sequence[Any], workers: int, chunk_size: int) -> List[Any]:
+    """
+    Splits `data` into chunks, runs them through a fresh process pool and
+    concatenates the per-chunk lists in the original order.
+    """
+    results = []
+    with ProcessStageRunner(stage, workers) as runner:
+        for chunk_result in runner.map(method_name, split_chunks(data, chunk_size)):
+            results.extend(chunk_result)
+    return results
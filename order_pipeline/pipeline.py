@@ -1,9 +1,21 @@
+import argparse
+import itertools
 import logging
-from order_pipeline.reader import DataReader
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from order_pipeline.reader import DataReader, expand_input_paths
 from order_pipeline.validator import DataValidator
+from order_pipeline.schema import ValidationSchema
 from order_pipeline.transformer import DataTransformer
 from order_pipeline.analyzer import DataAnalyzer
+from order_pipeline.columnar import AnalysisColumns
 from order_pipeline.exporter import DataExporter
+from order_pipeline.processor import DataProcessor
+from order_pipeline.parallel import ProcessStageRunner
+from order_pipeline.rejections import QuarantineSink, RejectionTracker
+from order_pipeline.metrics import PipelineMetrics, StageHook
+from order_pipeline.incremental import IncrementalState
+from order_pipeline.deduplicator import DataDeduplicator
+from order_pipeline.rollups import RollupAccumulator, RollupStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -11,47 +23,555 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 class OrderPipeline:
     """Orchestrates the entire order processing pipeline."""
     
-    def __init__(self):
+    def __init__(self, streaming: bool = False, chunk_size: int = 1000, compact_output: bool = False,
+                 workers: int = 1, parallel_chunk_size: int = 10000, columnar_analysis: bool = False,
+                 fused: bool = False, quarantine_filepath: Optional[str] = None,
+                 rejection_log_first: int = 100, rejection_log_every: int = 1000,
+                 metrics_filepath: Optional[str] = None, track_memory: bool = False,
+                 hooks: Sequence[StageHook] = (), compression_level: Optional[int] = None,
+                 byte_range_size: int = 8 * 1024 * 1024, compact_records: bool = False,
+                 state_filepath: Optional[str] = None, max_seen_ids: int = 1000000, dedup_policy: Optional[str] = None,
+                 dedup_memory_ids: int = 1000000, read_threads: int = 4, per_file_summaries: bool = False,
+                 grouped_analysis: bool = False, top_n: int = 10, sketches: bool = False,
+                 quantile_k: int = 200, distinct_precision: int = 14, rollup_filepath: Optional[str] = None,
+                 validation_schema: Optional[ValidationSchema] = None):
         self.reader = DataReader()
-        self.validator = DataValidator()
-        self.transformer = DataTransformer()
-        self.analyzer = DataAnalyzer()
-        self.exporter = DataExporter()
+        self.validator = DataValidator(schema=validation_schema)
+        self.transformer = DataTransformer(compact_records=compact_records)
+        self.analyzer = DataAnalyzer(
+            grouped=grouped_analysis, top_n=top_n, sketches=sketches,
+            quantile_k=quantile_k, distinct_precision=distinct_precision
+        )
+        self.exporter = DataExporter(
+            compact=compact_output, compression_level=compression_level,
+            items=self.transformer.items, statuses=self.transformer.statuses
+        )
+        self.processor = DataProcessor(self.validator, self.transformer)
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.parallel_chunk_size = parallel_chunk_size
+        self.byte_range_size = byte_range_size
+        self.columnar_analysis = columnar_analysis
+        self.fused = fused
+        self.quarantine_filepath = quarantine_filepath
+        self.rejection_log_first = rejection_log_first
+        self.rejection_log_every = rejection_log_every
+        self.rejections = RejectionTracker()
+        self.metrics_filepath = metrics_filepath
+        self.track_memory = track_memory
+        self.hooks = list(hooks)
+        self.state_filepath = state_filepath
+        self.max_seen_ids = max_seen_ids
+        self.dedup_policy = dedup_policy
+        self.dedup_memory_ids = dedup_memory_ids
+        self.deduplicator = DataDeduplicator(dedup_policy, dedup_memory_ids) if dedup_policy else None
+        self.read_threads = read_threads
+        self.per_file_summaries = per_file_summaries
+        self.rollup_filepath = rollup_filepath
+        self._rollups: Optional[RollupAccumulator] = None
+        self._state: Optional[IncrementalState] = None
+        self._input_filepaths: Optional[List[str]] = None
+        self._file_summaries: Optional[Dict[str, Dict[str, Any]]] = None
 
-    def run(self, input_filepath: str, output_filepath: str):
-        """Runs the full pipeline."""
-        try:
-            logging.info(f"Starting pipeline for file: {input_filepath}")
-            raw_data = self.reader.read_json_data(input_filepath)
-            
-            validated_data = self.validator.validate_data(raw_data)
-            if not validated_data:
-                logging.warning("No valid data found after validation. Pipeline stopping.")
-                return
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes only run the stages; hooks (e.g. a profiler) and
+        # the incremental state and rollups stay in the parent.
+        state = self.__dict__.copy()
+        state["hooks"] = []
+        state["_state"] = None
+        state["_rollups"] = None
+        return state
 
-            transformed_data = self.transformer.transform_data(validated_data)
-            if not transformed_data:
-                logging.warning("No data survived transformation. Pipeline stopping.")
-                return
+    def run(self, input_filepath: str, output_filepath: str) -> Optional[Dict[str, Any]]:
+        """
+        Runs the full pipeline.
 
-            analysis_results = self.analyzer.analyze_data(transformed_data)
-            logging.info(f"Analysis complete: {analysis_results}")
+        `input_filepath` may also be a directory or a glob pattern. The
+        matching files are read concurrently on `read_threads` threads and
+        each one goes through the stages as soon as it has been read; the
+        output and analysis cover all of them. With `per_file_summaries` the
+        summary also holds counts, rejections and an analysis per file.
 
-            self.exporter.export_data(transformed_data, analysis_results, output_filepath)
-            logging.info(f"Pipeline finished. Output saved to {output_filepath}")
+        Returns a run summary with the analysis (None if the pipeline stopped
+        early), rejection counts per reason code and per-stage metrics, or
+        None if it failed.
+
+        With `state_filepath` set, the run is incremental: only records added
+        since the last successful run are processed and written, and the
+        analysis covers every run so far (see IncrementalState). The state
+        remembers up to `max_seen_ids` accepted order_ids.
+
+        With `grouped_analysis` the analysis also holds revenue and order
+        counts per item, day and hour and the `top_n` items (see
+        GroupedAccumulator).
+
+        With `sketches` the analysis also holds the p50, p90 and p99 order
+        value and the number of distinct items and order_ids, estimated in
+        constant memory to an accuracy set by `quantile_k` and
+        `distinct_precision` (see SketchAccumulator).
+
+        With `dedup_policy` set ('first', 'last' or 'reject'), transformed
+        records sharing an order_id are deduplicated (see DataDeduplicator)
+        and the summary gains a "duplicates" entry.
+
+        With `rollup_filepath` set, the orders of this run are also added to
+        the 5-minute, hourly and daily window totals in that SQLite file
+        (see RollupStore), and the summary gains a "rollups" entry. Only the
+        windows the run touched are updated.
+
+        `validation_schema` replaces the default validation rules
+        (ORDER_SCHEMA) in every execution mode.
+        """
+        metrics = PipelineMetrics(track_memory=self.track_memory, hooks=self.hooks)
+        metrics.start()
+        try:
+            logging.info(f"Starting pipeline for file: {input_filepath}")
+            self._reset_rejections()
+            try:
+                self._state = (
+                    IncrementalState.load(self.state_filepath, self.max_seen_ids) if self.state_filepath else None
+                )
+                self._input_filepaths = expand_input_paths(input_filepath)
+                self._file_summaries = {} if self.per_file_summaries else None
+                self._rollups = RollupAccumulator() if self.rollup_filepath else None
+                if self.streaming:
+                    analysis = self._run_streaming(input_filepath, output_filepath, metrics)
+                else:
+                    analysis = self._run_batch(input_filepath, output_filepath, metrics)
+                if self._rollups is not None:
+                    rollup_summary = self._save_rollups(metrics)
+            finally:
+                self.rejections.close()
+            if self._state is not None:
+                self._state.mark_rejected(self.rejections.rejected_records)
+                self._state.save(self.state_filepath)
+                self._state = None
+                logging.info(f"Incremental state saved to {self.state_filepath}")
+            if self.metrics_filepath:
+                metrics.stop()
+                metrics.save(self.metrics_filepath)
+                logging.info(f"Stage metrics saved to {self.metrics_filepath}")
 
         except (ValueError, FileNotFoundError, IOError) as e:
             logging.critical(f"Pipeline failed: {e}")
+            return None
         except Exception as e:
             logging.critical(f"An unexpected error occurred: {e}", exc_info=True)
+            return None
+        finally:
+            metrics.stop()
+            self.transformer.columns = None
+
+        rejections = self.rejections.summary()
+        if rejections:
+            logging.info(f"Rejected records by reason: {rejections}")
+        summary = {"analysis": analysis, "rejections": rejections, "metrics": metrics.to_dict()}
+        if self.deduplicator is not None:
+            summary["duplicates"] = self.deduplicator.summary()
+            logging.info(f"Duplicate order ids: {summary['duplicates']}")
+        if self._file_summaries is not None:
+            summary["files"] = self._file_summaries
+        if self._rollups is not None:
+            summary["rollups"] = rollup_summary
+            self._rollups = None
+        return summary
+
+    def _save_rollups(self, metrics: PipelineMetrics) -> Dict[str, Any]:
+        """Adds this run's window totals to the rollup store."""
+        with metrics.stage("rollup", len(self._rollups)):
+            with RollupStore(self.rollup_filepath) as store:
+                windows_updated = store.apply(self._rollups)
+        logging.info(f"Updated {windows_updated} rollup windows in {self.rollup_filepath}")
+        return {"windows_updated": windows_updated, "unknown_timestamps": self._rollups.unknown_timestamps}
+
+    def _reset_rejections(self):
+        """Gives the reader, validator, transformer and deduplicator a fresh shared tracker for this run."""
+        sink = None
+        if self.quarantine_filepath:
+            sink = QuarantineSink(self.quarantine_filepath)
+            sink.discard_previous()
+        self.rejections = RejectionTracker(
+            sink, log_first=self.rejection_log_first, log_every=self.rejection_log_every,
+            keep_records=self.state_filepath is not None
+        )
+        self.reader.rejections = self.rejections
+        self.validator.rejections = self.rejections
+        self.transformer.rejections = self.rejections
+        self.transformer.timestamp_parser.log_first = self.rejection_log_first
+        self.transformer.timestamp_parser.log_every = self.rejection_log_every
+        if self.dedup_policy:
+            self.deduplicator = DataDeduplicator(self.dedup_policy, self.dedup_memory_ids, rejections=self.rejections)
+
+    def _run_batch(self, input_filepath: str, output_filepath: str,
+                   metrics: PipelineMetrics) -> Optional[Dict[str, Any]]:
+        """Runs each stage over the full dataset before starting the next."""
+        if self.columnar_analysis:
+            # Filled while transforming, so analysis needs no pass over the records.
+            self.transformer.columns = AnalysisColumns()
+        results = None
+        if self._reads_files(input_filepath):
+            results = (result[1:] for result in self._process_files(metrics))
+        else:
+            byte_range = self._byte_range_bounds(input_filepath)
+            if byte_range is not None:
+                results = self._process_byte_ranges(input_filepath, metrics, *byte_range)
+
+        if results is not None:
+            read_count, validated_count, transformed_data = 0, 0, []
+            for part_read, part_validated, records in results:
+                read_count += part_read
+                validated_count += part_validated
+                transformed_data.extend(records)
+            if not read_count:
+                if self._state is not None:
+                    return self._no_new_records()
+                raise ValueError("File contains no valid records.")
+        else:
+            with metrics.stage("read") as call:
+                raw_data = self.reader.read_json_data(input_filepath)
+                call.records_out = len(raw_data)
+            if self._state is not None:
+                raw_data = self._state.filter_new(raw_data)
+                if not raw_data:
+                    return self._no_new_records()
+
+            validated_count, transformed_data = self._validate_and_transform(
+                raw_data, metrics, workers=self.workers, chunk_size=self.parallel_chunk_size
+            )
+
+        if not validated_count:
+            return self._stop("No valid data found after validation.")
+
+        if not transformed_data:
+            return self._stop("No data survived transformation.")
+
+        if self.deduplicator is not None:
+            with metrics.stage("deduplicate", len(transformed_data)) as call:
+                transformed_data = self.deduplicator.deduplicate(transformed_data)
+                call.records_out = len(transformed_data)
+            if not transformed_data:
+                return self._stop("No records left after deduplication.")
+
+        with metrics.stage("analyze", len(transformed_data)):
+            if self._rollups is not None:
+                self._rollups.update(transformed_data)
+            if self._state is not None:
+                self._state.mark_seen(transformed_data)
+                accumulator = self.analyzer.new_accumulator()
+                accumulator.update(transformed_data)
+                analysis_results = self._state.accumulator.merge(accumulator).result()
+            elif self.columnar_analysis:
+                analysis_results = self.analyzer.analyze_columnar(transformed_data, self.transformer.columns)
+            else:
+                analysis_results = self.analyzer.analyze_data(transformed_data)
+        logging.info(f"Analysis complete: {analysis_results}")
+
+        with metrics.stage("export", len(transformed_data)) as call:
+            self.exporter.export_data(transformed_data, analysis_results, output_filepath)
+            call.records_out = len(transformed_data)
+        logging.info(f"Pipeline finished. Output saved to {output_filepath}")
+        return analysis_results
+
+    def _run_streaming(self, input_filepath: str, output_filepath: str,
+                       metrics: PipelineMetrics) -> Optional[Dict[str, Any]]:
+        """
+        Pushes chunks of `chunk_size` records through every stage in turn, so
+        only one chunk is held in memory at a time (a few per worker when
+        `workers` > 1).
+        """
+        counts = {"read": 0, "validated": 0, "transformed": 0}
+        chunks = self._counted_transformed_chunks(self._stream_chunks(input_filepath, counts, metrics), counts)
+        if self.deduplicator is not None:
+            chunks = metrics.timed_chunks("deduplicate", self.deduplicator.iter_deduplicated(chunks))
 
-def main():
+        # Pull the first surviving chunk before the output file is opened so
+        # an empty result stops the pipeline the same way batch mode does.
+        first = next(chunks, None)
+        if first is None:
+            if self._state is not None and not counts["read"]:
+                return self._no_new_records()
+            if not counts["validated"]:
+                return self._stop("No valid data found after validation.")
+            if not counts["transformed"]:
+                return self._stop("No data survived transformation.")
+            return self._stop("No records left after deduplication.")
+
+        accumulator = self.analyzer.new_accumulator()
+        writer = self.exporter.open_stream(output_filepath)
+        with writer:
+            for chunk in itertools.chain([first], chunks):
+                with metrics.stage("analyze", len(chunk)):
+                    accumulator.update(chunk)
+                    if self._rollups is not None:
+                        self._rollups.update(chunk)
+                    if self._state is not None:
+                        self._state.mark_seen(chunk)
+                with metrics.stage("export", len(chunk)) as call:
+                    writer.write_many(chunk)
+                    call.records_out = len(chunk)
+            if self._state is not None:
+                accumulator = self._state.accumulator.merge(accumulator)
+            analysis_results = accumulator.result()
+            with metrics.stage("export"):
+                writer.close(analysis_results)
+        logging.info(f"Successfully exported data to {output_filepath}")
+        logging.info(f"Analysis complete: {analysis_results}")
+        logging.info(f"Pipeline finished. Output saved to {output_filepath}")
+        return analysis_results
+
+    def _stream_chunks(self, input_filepath: str, counts: Dict[str, int],
+                       metrics: PipelineMetrics) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lazily reads, validates and transforms the input one chunk at a time,
+        yielding the non-empty transformed chunks. Multiple input files are
+        read, validated and transformed a file at a time instead.
+        """
+        if self._reads_files(input_filepath):
+            for _, read_count, validated_count, records in self._process_files(metrics):
+                counts["read"] += read_count
+                counts["validated"] += validated_count
+                for start in range(0, len(records), self.chunk_size):
+                    yield records[start:start + self.chunk_size]
+            return
+
+        byte_range = self._byte_range_bounds(input_filepath)
+        if byte_range is not None:
+            for read_count, validated_count, records in self._process_byte_ranges(input_filepath, metrics, *byte_range):
+                counts["read"] += read_count
+                counts["validated"] += validated_count
+                if records:
+                    yield records
+            return
+
+        chunks = metrics.timed_chunks("read", self.reader.iter_json_chunks(input_filepath, self.chunk_size))
+        chunks = self._counted_new_chunks(chunks, counts)
+        if self.workers > 1:
+            # Workers validate and transform together; the parent's share is
+            # the time spent waiting for each chunk's result.
+            with ProcessStageRunner(self, self.workers) as runner:
+                results = runner.map('_process_chunk', chunks)
+                while True:
+                    with metrics.stage("validate_transform") as call:
+                        result = next(results, None)
+                        if result is not None:
+                            call.records_out = len(result[1])
+                    if result is None:
+                        break
+                    validated_count, records = result
+                    counts["validated"] += validated_count
+                    if records:
+                        yield records
+        else:
+            for chunk in chunks:
+                validated_count, records = self._validate_and_transform(chunk, metrics)
+                counts["validated"] += validated_count
+                if records:
+                    yield records
+
+    @staticmethod
+    def _counted_transformed_chunks(chunks: Iterator[List[Dict[str, Any]]],
+                                    counts: Dict[str, int]) -> Iterator[List[Dict[str, Any]]]:
+        """Counts the transformed records passing through."""
+        for chunk in chunks:
+            counts["transformed"] += len(chunk)
+            yield chunk
+
+    def _counted_new_chunks(self, chunks: Iterator[List[Dict[str, Any]]],
+                            counts: Dict[str, int]) -> Iterator[List[Dict[str, Any]]]:
+        """Counts the records read, dropping ones seen in earlier incremental runs."""
+        for chunk in chunks:
+            if self._state is not None:
+                chunk = self._state.filter_new(chunk)
+            counts["read"] += len(chunk)
+            if chunk:
+                yield chunk
+
+    def _no_new_records(self) -> Dict[str, Any]:
+        """Ends an incremental run that found nothing new, returning the totals so far."""
+        logging.info("No new records since the last run. Output not updated.")
+        return self._state.accumulator.result()
+
+    def _stop(self, reason: str) -> Optional[Dict[str, Any]]:
+        """
+        Ends a run in which no record survived. An incremental run returns
+        the totals so far and leaves the output as it was; otherwise None.
+        """
+        logging.warning(f"{reason} Pipeline stopping.")
+        if self._state is not None:
+            return self._state.accumulator.result()
+        return None
+
+    def _reads_files(self, input_filepath: str) -> bool:
+        """Tells whether the input goes through the multi-file reader."""
+        if self._input_filepaths is None:
+            return False
+        return self.per_file_summaries or self._input_filepaths != [input_filepath]
+
+    def _process_files(self, metrics: PipelineMetrics) -> Iterator[Tuple[str, int, int, List[Dict[str, Any]]]]:
+        """
+        Reads the input files concurrently and validates and transforms each
+        one as it arrives. Yields (path, records read, records validated,
+        transformed records) per file, in path order, and fills in the
+        per-file summaries if they are enabled.
+
+        In incremental runs, uncompressed JSON Lines files resume from their
+        byte offsets and other files skip order_ids seen before.
+        """
+        byte_ranges = {}
+        if self._state is not None:
+            for filepath in self._input_filepaths:
+                bounds = self._byte_range_bounds(filepath)
+                if bounds is not None:
+                    byte_ranges[filepath] = bounds
+
+        files = self.reader.read_files(self._input_filepaths, self.read_threads, byte_ranges)
+        while True:
+            rejected_before = dict(self.rejections.counts)
+            with metrics.stage("read") as call:
+                result = next(files, None)
+                if result is not None:
+                    call.records_out = len(result[1])
+            if result is None:
+                return
+            filepath, records = result
+            if self._state is not None and filepath not in byte_ranges:
+                records = self._state.filter_new(records)
+
+            validated_count, transformed_data = 0, []
+            if records:
+                validated_count, transformed_data = self._validate_and_transform(
+                    records, metrics, workers=self.workers, chunk_size=self.parallel_chunk_size
+                )
+            if self._file_summaries is not None:
+                with metrics.stage("analyze", len(transformed_data)):
+                    accumulator = self.analyzer.new_accumulator()
+                    accumulator.update(transformed_data)
+                self._file_summaries[filepath] = {
+                    "records_read": len(records),
+                    "records_valid": validated_count,
+                    "records_transformed": len(transformed_data),
+                    "rejections": {
+                        reason: count - rejected_before.get(reason, 0)
+                        for reason, count in sorted(self.rejections.counts.items())
+                        if count != rejected_before.get(reason, 0)
+                    },
+                    "analysis": accumulator.result()
+                }
+            yield filepath, len(records), validated_count, transformed_data
+
+    def _byte_range_bounds(self, input_filepath: str) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Returns the (start, end) offsets to process by byte range, or None to
+        use the regular reader. Parallel runs over uncompressed JSON Lines
+        input split the file across workers; incremental runs over such input
+        resume after the last complete line they processed.
+        """
+        if not self.reader.supports_byte_ranges(input_filepath):
+            return None
+        if self._state is not None:
+            end = self.reader.complete_lines_end(input_filepath)
+            start = self._state.start_offset(input_filepath)
+            self._state.advance_offset(input_filepath, end)
+            return start, end
+        if self.workers > 1:
+            return 0, None
+        return None
+
+    def _process_byte_ranges(self, input_filepath: str, metrics: PipelineMetrics, start: int = 0,
+                             end: Optional[int] = None) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Splits the input between `start` and `end` into newline-aligned byte
+        ranges that workers read, validate and transform on their own (or this
+        process, with a single worker). Yields (records read, records
+        validated, transformed records) per range, in file order.
+        """
+        with metrics.stage("read"):
+            ranges = self.reader.split_byte_ranges(input_filepath, self.byte_range_size, start, end)
+        byte_ranges = ((input_filepath, range_start, range_end) for range_start, range_end in ranges)
+
+        if self.workers > 1:
+            with ProcessStageRunner(self, self.workers) as runner:
+                yield from self._timed_byte_ranges(runner.map('_process_byte_range', byte_ranges), metrics)
+        else:
+            yield from self._timed_byte_ranges(map(self._process_byte_range, byte_ranges), metrics)
+
+    def _timed_byte_ranges(self, results: Iterator[Tuple[int, int, List[Dict[str, Any]]]],
+                           metrics: PipelineMetrics) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """Yields byte-range results, timing how long each one takes to arrive."""
+        while True:
+            with metrics.stage("read_validate_transform") as call:
+                result = next(results, None)
+                if result is not None:
+                    call.records_in = result[0]
+                    call.records_out = len(result[2])
+            if result is None:
+                return
+            yield result
+
+    def _process_byte_range(self, byte_range: Tuple[str, int, int]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """Reads, validates and transforms one byte range in a worker process."""
+        filepath, start, end = byte_range
+        records = self.reader.read_byte_range(filepath, start, end)
+        if not records:
+            return 0, 0, []
+        validated_count, transformed_data = self._validate_and_transform(records, PipelineMetrics())
+        return len(records), validated_count, transformed_data
+
+    def _process_chunk(self, chunk: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Validates and transforms one chunk in a worker process. Returns the
+        number of valid records and the transformed records.
+        """
+        return self._validate_and_transform(chunk, PipelineMetrics())
+
+    def _validate_and_transform(self, data: List[Dict[str, Any]], metrics: PipelineMetrics, workers: int = 1,
+                                chunk_size: int = 10000) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Runs the fused stage or the validator and transformer in turn. Returns
+        the number of valid records and the transformed records.
+        """
+        if self.fused:
+            with metrics.stage("validate_transform", len(data)) as call:
+                validated_count, transformed_data = self.processor.validate_and_transform(
+                    data, workers=workers, chunk_size=chunk_size
+                )
+                call.records_out = len(transformed_data)
+            return validated_count, transformed_data
+
+        with metrics.stage("validate", len(data)) as call:
+            validated_data = self.validator.validate_data(data, workers=workers, chunk_size=chunk_size)
+            call.records_out = len(validated_data)
+        transformed_data = []
+        if validated_data:
+            with metrics.stage("transform", len(validated_data)) as call:
+                transformed_data = self.transformer.transform_data(
+                    validated_data, workers=workers, chunk_size=chunk_size
+                )
+                call.records_out = len(transformed_data)
+        return len(validated_data), transformed_data
+
+    def _drain_worker_state(self) -> Dict[str, Any]:
+        """Returns the validator's and transformer's worker counters."""
+        return self.processor._drain_worker_state()
+
+    def _merge_worker_state(self, state: Dict[str, Any]):
+        """Adds counters drained from a worker process."""
+        self.processor._merge_worker_state(state)
+
+def main(argv: Optional[Sequence[str]] = None):
     """Main entry point to run the pipeline."""
-    input_file = "shoplink.json"
-    output_file = "shoplink_cleaned.json"
-    
-    pipeline = OrderPipeline()
-    pipeline.run(input_file, output_file)
+    parser = argparse.ArgumentParser(description="Clean and analyze shop order data.")
+    parser.add_argument("input", nargs="?", default="shoplink.json",
+                        help="input file, directory or glob pattern (default: shoplink.json)")
+    parser.add_argument("output", nargs="?", default="shoplink_cleaned.json",
+                        help="output file (default: shoplink_cleaned.json)")
+    parser.add_argument("--read-threads", type=int, default=4, help="threads reading input files concurrently")
+    parser.add_argument("--per-file-summaries", action="store_true", help="add a summary per input file")
+    args = parser.parse_args(argv)
+
+    pipeline = OrderPipeline(read_threads=args.read_threads, per_file_summaries=args.per_file_summaries)
+    pipeline.run(args.input, args.output)
 
 if __name__ == "__main__":
     main()
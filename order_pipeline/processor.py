@@ -0,0 +1,133 @@
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+from order_pipeline.validator import DataValidator
+from order_pipeline.schema import parse_plain_number
+from order_pipeline.transformer import DataTransformer
+from order_pipeline.parallel import ProcessStageRunner, split_chunks
+
+class DataProcessor:
+    """
+    Validates and transforms order records in a single pass.
+
+    Accepts and rejects exactly the records the validator and transformer do
+    when run one after the other, with the same warnings (interleaved per
+    record instead of grouped by stage). Numeric fields are parsed once and
+    the parsed values are handed to the transformer.
+    """
+
+    # Returns the number both stages would agree on, or None when the
+    # original helpers have to decide, so edge cases stay identical.
+    _parse_number = staticmethod(parse_plain_number)
+
+    def __init__(self, validator: Optional[DataValidator] = None, transformer: Optional[DataTransformer] = None):
+        self.validator = validator or DataValidator()
+        self.transformer = transformer or DataTransformer()
+
+    def validate_and_transform(self, data: List[Dict[str, Any]], workers: int = 1,
+                               chunk_size: int = 10000) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Returns the number of records that passed validation and the list of
+        transformed records. With `workers` > 1 the records are processed in
+        chunks of `chunk_size` on a process pool.
+        """
+        if workers > 1 and len(data) > chunk_size:
+            validated_count, transformed_data = 0, []
+            with ProcessStageRunner(self, workers) as runner:
+                for chunk_count, records in runner.map('_process_records', split_chunks(data, chunk_size)):
+                    validated_count += chunk_count
+                    transformed_data.extend(records)
+        else:
+            validated_count, transformed_data = self._process_records(data)
+
+        logging.info(f"Validation complete. Passed: {validated_count} / Original: {len(data)}")
+        logging.info(f"Transformation complete. Processed {len(transformed_data)} records.")
+        logging.debug(f"Timestamp parser stats: {self.transformer.timestamp_parser.get_stats()}")
+        return validated_count, transformed_data
+
+    def _process_records(self, data: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Validates and transforms a list of records without logging a summary."""
+        validated_count = 0
+        transformed_data = []
+        transformer = self.transformer
+        transformer.timestamp_parser.detect_formats(record.get('timestamp') for record in data)
+        checks = self._field_checks()
+
+        for record in data:
+            numbers = self._validate_record(record, checks)
+            if numbers is None:
+                continue
+            validated_count += 1
+
+            try:
+                transformed_record = transformer._transform_record(
+                    record, numbers.get('quantity'), numbers.get('price'), numbers.get('total')
+                )
+            except Exception as e:
+                transformer.rejections.reject(
+                    record, "transform_error", "transformation",
+                    "Error transforming record %s: %s", record.get('order_id', 'N/A'), e,
+                    level=logging.ERROR
+                )
+                continue
+            if transformed_record is not None:
+                transformed_data.append(transformed_record)
+
+        return validated_count, transformed_data
+
+    def _drain_worker_state(self) -> Dict[str, Any]:
+        """Returns the validator's and transformer's worker counters."""
+        return {
+            "validator": self.validator._drain_worker_state(),
+            "transformer": self.transformer._drain_worker_state()
+        }
+
+    def _merge_worker_state(self, state: Dict[str, Any]):
+        """Adds counters drained from a worker process."""
+        self.validator._merge_worker_state(state["validator"])
+        self.transformer._merge_worker_state(state["transformer"])
+
+    def _field_checks(self) -> List[Tuple[str, str]]:
+        """
+        Pairs each field of the validator's schema with the kind of inline
+        check it gets; fields with other rules are left to the validator.
+        """
+        checks = []
+        for rule in self.validator.schema.rules:
+            if rule.type == 'number' and rule.positive and rule.required:
+                checks.append((rule.name, 'numeric'))
+            elif rule.type == 'text' and rule.non_empty and rule.required:
+                checks.append((rule.name, 'text'))
+            elif rule.type == 'any' and rule.required:
+                checks.append((rule.name, 'present'))
+            else:
+                checks.append((rule.name, 'validator'))
+        return checks
+
+    def _validate_record(self, record: Dict[str, Any], checks: List[Tuple[str, str]]) -> Optional[Dict[str, float]]:
+        """
+        Checks the required fields in the validator's order. Returns the
+        numeric fields that were parsed on the fast path (the transformer
+        parses the rest), or None if the record is rejected.
+
+        Passing fields are decided inline; a field that does not obviously
+        pass is handed to the validator, which makes the final call and logs
+        the usual warning.
+        """
+        numbers = {}
+        get = record.get
+        for field, kind in checks:
+            value = get(field)
+            if kind == 'numeric':
+                number = self._parse_number(value)
+                if number is not None and number > 0:
+                    numbers[field] = number
+                    continue
+            elif kind == 'text':
+                if isinstance(value, str) and value.strip():
+                    continue
+            elif kind == 'present':
+                if value is not None:
+                    continue
+            if not self.validator._is_field_valid(record, field):
+                return None
+        return numbers
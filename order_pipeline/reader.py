@@ -1,28 +1,84 @@
+import glob
 import json
+import logging
+import mmap
 import os
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
+from order_pipeline.rejections import RejectionTracker
+from order_pipeline.compression import open_file, split_compression
+from order_pipeline.columnar import ColumnarOrders
+
+# File suffixes read and written as JSON Lines (one record per line).
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+def is_json_lines(filepath: str) -> bool:
+    """Tells whether a path names a JSON Lines file, compressed or not."""
+    return split_compression(filepath)[0].endswith(JSON_LINES_SUFFIXES)
+
+def is_supported_format(filepath: str) -> bool:
+    """Tells whether a path names a JSON or JSON Lines file, compressed or not."""
+    return split_compression(filepath)[0].endswith(('.json',) + JSON_LINES_SUFFIXES)
+
+def expand_input_paths(path: str) -> List[str]:
+    """
+    Resolves an input path to the files to read: the path itself, or the
+    supported files directly inside a directory or matching a glob pattern,
+    in sorted order.
+    """
+    if os.path.isdir(path):
+        candidates = [os.path.join(path, name) for name in os.listdir(path)]
+    elif glob.has_magic(path):
+        candidates = glob.glob(path)
+    else:
+        return [path]
+    filepaths = sorted(p for p in candidates if os.path.isfile(p) and is_supported_format(p))
+    if not filepaths:
+        raise FileNotFoundError(f"No .json, .jsonl or .ndjson files found at path: {path}")
+    return filepaths
 
 class DataReader:
-    """Reads order data from a JSON file."""
+    """
+    Reads order data from a JSON file holding an array of records, or from a
+    JSON Lines file (.jsonl/.ndjson) holding one record per line. Either may
+    be gzip, bz2 or xz compressed ('.json.gz', '.jsonl.xz', ...).
+    """
 
-    def read_json_data(self, filepath: str) -> List[Dict[str, Any]]:
-        """Reads data from a JSON file."""
-        if not filepath.endswith('.json'):
-            raise ValueError("Unsupported file format. Only .json files are accepted.")
+    _read_buffer_size = 64 * 1024
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, rejections: Optional[RejectionTracker] = None):
+        self.rejections = rejections or RejectionTracker()
+        self.malformed_lines = 0
+
+    def _check_file(self, filepath: str):
+        """Runs the extension, existence and size checks shared by all read paths."""
+        if not is_supported_format(filepath):
+            raise ValueError(
+                "Unsupported file format. Only .json, .jsonl and .ndjson files "
+                "(optionally with .gz, .bz2 or .xz) are accepted."
+            )
 
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found at path: {filepath}")
-            
+
         if os.path.getsize(filepath) == 0:
             raise ValueError("File is empty.")
 
+    def read_json_data(self, filepath: str) -> List[Dict[str, Any]]:
+        """Reads data from a JSON file."""
+        self._check_file(filepath)
+        if is_json_lines(filepath):
+            return self._read_lines(filepath)
+
         try:
-            with open(filepath, 'r') as f:
+            with open_file(filepath) as f:
                 data = json.load(f)
-            
+
             if not isinstance(data, list):
                 raise ValueError("JSON content is not a list of records.")
-                
+
             if not data:
                 raise ValueError("File contains an empty list.")
 
@@ -34,3 +90,311 @@ class DataReader:
         except Exception as e:
             raise IOError(f"Error reading file: {e}")
 
+    def iter_json_data(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields records one at a time from the top-level JSON array.
+
+        Only a bounded read buffer is held in memory, so the file size does not
+        matter. File checks run immediately; content errors are raised as the
+        records are consumed.
+        """
+        self._check_file(filepath)
+        if is_json_lines(filepath):
+            return self._iter_lines(filepath)
+        return self._iter_array(filepath)
+
+    def read_files(self, filepaths: Sequence[str], threads: int = 4,
+                   byte_ranges: Optional[Dict[str, Tuple[int, int]]] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Reads several files on a pool of `threads` threads, yielding (path,
+        records) in the order given as soon as each file is ready. At most
+        `threads` files are read ahead. Files listed in `byte_ranges` are read
+        between those offsets only (see read_byte_range). Rejections from the
+        threads are merged into this reader's tracker as files are yielded.
+        """
+        if threads < 1:
+            raise ValueError("threads must be a positive integer.")
+        byte_ranges = byte_ranges or {}
+        remaining = iter(filepaths)
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            pending = deque()
+
+            def submit_next():
+                filepath = next(remaining, None)
+                if filepath is not None:
+                    pending.append((filepath, executor.submit(self._read_file, filepath, byte_ranges.get(filepath))))
+
+            for _ in range(threads):
+                submit_next()
+            while pending:
+                filepath, future = pending.popleft()
+                submit_next()
+                records, rejections = future.result()
+                self.rejections.merge(rejections)
+                yield filepath, records
+
+    def _read_file(self, filepath: str,
+                   byte_range: Optional[Tuple[int, int]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Reads one file in a worker thread with its own reader and rejection tracker."""
+        reader = DataReader(self.rejections.fork())
+        try:
+            if byte_range is not None:
+                records = reader.read_byte_range(filepath, *byte_range)
+            else:
+                records = reader.read_json_data(filepath)
+        except ValueError as e:
+            raise ValueError(f"{filepath}: {e}") from e
+        except IOError as e:
+            raise IOError(f"{filepath}: {e}") from e
+        return records, reader.rejections.drain()
+
+    def load_columns(self, dirpath: str) -> ColumnarOrders:
+        """
+        Memory-maps a columnar cache written by DataExporter. Only the header
+        is read up front, so loading is near-instant at any size.
+        """
+        return ColumnarOrders(dirpath)
+
+    def iter_json_chunks(self, filepath: str, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Yields lists of at most `chunk_size` records from the top-level JSON array."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        records = self.iter_json_data(filepath)
+        return self._chunk(records, chunk_size)
+
+    @staticmethod
+    def _chunk(records: Iterator[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Groups an iterator of records into lists of `chunk_size`."""
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _read_lines(self, filepath: str) -> List[Dict[str, Any]]:
+        """Reads every well-formed record of a JSON Lines file."""
+        data = list(self._iter_lines(filepath))
+        if not data:
+            raise ValueError("File contains no valid records.")
+        return data
+
+    def _iter_lines(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the record on each line of a JSON Lines file. Blank lines are
+        ignored; malformed lines are reported to the rejection tracker as
+        `malformed_line` and skipped.
+        """
+        self.malformed_lines = 0
+        try:
+            with open_file(filepath) as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    record, error = self._parse_line(line)
+                    if error is not None:
+                        self._reject_line(line, "Skipping malformed line %d: %s", line_number, error)
+                        continue
+                    yield record
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise IOError(f"Error reading file: {e}")
+
+        if self.malformed_lines:
+            logging.warning(f"Skipped {self.malformed_lines} malformed lines in {filepath}.")
+
+    def split_byte_ranges(self, filepath: str, range_size: int = 8 * 1024 * 1024, start: int = 0,
+                          end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Splits an uncompressed JSON Lines file into (start, end) byte ranges
+        of roughly `range_size` bytes, each ending just after a newline (or at
+        `end`, by default the end of the file), so every line falls in exactly
+        one range. `start` must be the start of a line.
+        """
+        self._check_file(filepath)
+        if not self.supports_byte_ranges(filepath):
+            raise ValueError("Byte ranges are only supported for uncompressed .jsonl and .ndjson files.")
+        if range_size < 1:
+            raise ValueError("range_size must be a positive integer.")
+
+        ranges = []
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped) if end is None else min(end, len(mapped))
+            while start < size:
+                end = start + range_size
+                if end >= size:
+                    end = size
+                else:
+                    newline = mapped.find(b'\n', end - 1)
+                    end = size if newline == -1 else newline + 1
+                ranges.append((start, end))
+                start = end
+        return ranges
+
+    def complete_lines_end(self, filepath: str) -> int:
+        """
+        Returns the offset just past the last newline of a JSON Lines file, so
+        a line still being appended is left for a later read.
+        """
+        self._check_file(filepath)
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.rfind(b'\n') + 1
+
+    @staticmethod
+    def supports_byte_ranges(filepath: str) -> bool:
+        """Tells whether a file can be split with split_byte_ranges."""
+        return is_json_lines(filepath) and split_compression(filepath)[1] is None
+
+    def read_byte_range(self, filepath: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Decodes the records on the lines between two offsets returned by
+        split_byte_ranges. The file is memory-mapped, so only the requested
+        range is paged in. Malformed lines are reported by byte offset.
+        """
+        self.malformed_lines = 0
+        records = []
+        try:
+            with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = mapped[start:end]
+        except Exception as e:
+            raise IOError(f"Error reading file: {e}")
+
+        offset = start
+        for raw_line in data.split(b'\n'):
+            line_offset = offset
+            offset += len(raw_line) + 1
+            if not raw_line.strip():
+                continue
+            try:
+                line = raw_line.decode('utf-8')
+            except UnicodeDecodeError as e:
+                self._reject_line(repr(raw_line), "Skipping malformed line at byte %d: %s", line_offset, str(e))
+                continue
+            record, error = self._parse_line(line)
+            if error is not None:
+                self._reject_line(line, "Skipping malformed line at byte %d: %s", line_offset, error)
+                continue
+            records.append(record)
+        return records
+
+    def _parse_line(self, line: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Decodes one JSON Lines record; returns (record, None) or (None, error)."""
+        try:
+            record = self._decoder.decode(line)
+        except json.JSONDecodeError as e:
+            return None, str(e)
+        if not isinstance(record, dict):
+            return None, "Line is not a JSON object."
+        return record, None
+
+    def _reject_line(self, line: str, message: str, *args: Any):
+        """Counts a malformed line and hands it to the rejection tracker."""
+        self.malformed_lines += 1
+        self.rejections.reject(line.rstrip('\n'), "malformed_line", "reading", message, *args)
+
+    def _iter_array(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        """Incrementally decodes the elements of a top-level JSON array."""
+        try:
+            with open_file(filepath) as f:
+                yield from self._decode_elements(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to decode JSON: {e}")
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise IOError(f"Error reading file: {e}")
+
+    def _decode_elements(self, f) -> Iterator[Dict[str, Any]]:
+        """
+        Walks the array with `raw_decode`, refilling the buffer when a value
+        runs past its end. A value is only accepted once a delimiter follows
+        it, so numbers and literals are never cut short at a buffer boundary.
+        """
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, pos, eof
+            chunk = f.read(self._read_buffer_size)
+            if not chunk:
+                eof = True
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def next_char() -> str:
+            """Skips whitespace and returns the next character ('' at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if eof:
+                    return ""
+                fill()
+
+        first = next_char()
+        if first == "":
+            raise ValueError("File is empty.")
+        if first != "[":
+            raise ValueError("JSON content is not a list of records.")
+        pos += 1
+
+        if next_char() == "]":
+            pos += 1
+            self._check_trailing(next_char)
+            raise ValueError("File contains an empty list.")
+
+        while True:
+            next_char()
+            while True:
+                try:
+                    value, end = self._decoder.raw_decode(buffer, pos)
+                    if eof or self._is_complete(buffer, end):
+                        break
+                except json.JSONDecodeError as e:
+                    if eof or not self._may_be_truncated(e, len(buffer)):
+                        raise
+                fill()
+            pos = end
+            yield value
+
+            separator = next_char()
+            pos += 1
+            if separator == ",":
+                continue
+            if separator == "]":
+                self._check_trailing(next_char)
+                return
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos - 1)
+
+    @staticmethod
+    def _is_complete(buffer: str, end: int) -> bool:
+        """Checks that a decoded value cannot continue past the buffer end."""
+        if end >= len(buffer):
+            return False
+        if buffer[end] in ",] \t\r\n":
+            return True
+        # Garbage right after a value is a syntax error; only a value close to
+        # the end of the buffer may still be growing (e.g. "2.5" of "2.5e10").
+        return len(buffer) - end >= 8
+
+    @staticmethod
+    def _may_be_truncated(error: json.JSONDecodeError, buffer_length: int) -> bool:
+        """
+        Tells a value cut off by the buffer boundary apart from a real syntax
+        error, so malformed input fails fast instead of buffering to EOF.
+        """
+        if error.pos >= buffer_length - 8:
+            return True
+        return error.msg.startswith(("Unterminated string", "Invalid \\uXXXX escape"))
+
+    @staticmethod
+    def _check_trailing(next_char):
+        """Rejects anything other than whitespace after the closing bracket."""
+        if next_char() != "":
+            raise ValueError("Failed to decode JSON: Extra data after top-level array")
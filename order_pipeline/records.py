@@ -0,0 +1,71 @@
+from typing import Any, Dict, Iterator, Tuple
+
+class OrderRecord:
+    """
+    Compact transformed order holding only the seven canonical fields.
+
+    Uses `__slots__` instead of a per-record dict, which makes it several
+    times smaller. It supports the read-only dict accessors the stages use
+    (`record['total']`, `record.get(...)`), and to_dict() gives the same
+    fields, in canonical order, that the exporters write.
+    """
+
+    FIELDS = ('order_id', 'timestamp', 'item', 'quantity', 'price', 'total', 'payment_status')
+    __slots__ = FIELDS
+
+    def __init__(self, order_id: str, timestamp: str, item: str, quantity: float, price: float,
+                 total: float, payment_status: str):
+        self.order_id = order_id
+        self.timestamp = timestamp
+        self.item = item
+        self.quantity = quantity
+        self.price = price
+        self.total = total
+        self.payment_status = payment_status
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        # Positional values pickle smaller than the default slot-state dict,
+        # which matters when workers send records back to the parent.
+        return (OrderRecord, self.values())
+
+    def values(self) -> Tuple[Any, ...]:
+        """Returns the field values in canonical order."""
+        return (self.order_id, self.timestamp, self.item, self.quantity, self.price, self.total, self.payment_status)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Returns the field names in canonical order."""
+        return self.FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the record as a plain dict, as it is written to JSON."""
+        return dict(zip(self.FIELDS, self.values()))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns a field by name, or `default` if there is no such field."""
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, OrderRecord):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"OrderRecord({', '.join(f'{k}={v!r}' for k, v in zip(self.FIELDS, self.values()))})"
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+class QuarantineSink:
+    """
+    Writes rejected records to a JSON Lines file in buffered batches.
+
+    Each line holds the reason code, the stage that rejected the record and
+    the record itself. The file is created on the first rejection; call
+    discard_previous() at the start of a run so a run without rejections
+    does not leave an earlier run's file behind.
+    """
+
+    def __init__(self, filepath: str, batch_size: int = 1000):
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.records_written = 0
+        self._file = None
+        self._pending: List[str] = []
+
+    def add(self, record: Any, reason: str, stage: str):
+        """Queues one rejected record, writing the batch when it is full."""
+        entry = {"reason": reason, "stage": stage, "record": record}
+        self._pending.append(json.dumps(entry, default=str) + '\n')
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def discard_previous(self):
+        """Removes a quarantine file left at `filepath` by an earlier run."""
+        if self._file is None and os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def flush(self):
+        """Writes every queued record to the file."""
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = open(self.filepath, 'w')
+        self._file.write(''.join(self._pending))
+        self.records_written += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        """Flushes queued records and closes the file, dropping the queue even if writing fails."""
+        try:
+            self.flush()
+        finally:
+            self._pending = []
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class RejectionTracker:
+    """
+    Counts rejected records per reason code and keeps log volume bounded.
+
+    The first `log_first` rejections of each reason are logged, then one in
+    every `log_every`. Messages use logging's lazy %-formatting, so skipped
+    lines are never formatted. Rejected records also go to `sink` if one is
+    set, and with `keep_records` to `rejected_records` (e.g. for incremental
+    state to remember them).
+    """
+
+    def __init__(self, sink: Optional[QuarantineSink] = None, log_first: int = 100, log_every: int = 1000,
+                 keep_records: bool = False):
+        self.sink = sink
+        self.log_first = log_first
+        self.log_every = log_every
+        self.keep_records = keep_records
+        self.counts: Dict[str, int] = {}
+        self.rejected_records: List[Any] = []
+        # Worker-process side: counts and quarantined records not yet
+        # reported back to the parent (see drain/merge).
+        self._forward_records = False
+        self._unreported: Dict[str, int] = {}
+        self._pending: List[Tuple[Any, str, str]] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy sent to a worker process cannot share the sink's file
+        # handle; it queues records for the parent instead.
+        state = self.__dict__.copy()
+        state["_forward_records"] = self._forwards_records()
+        state["sink"] = None
+        state["keep_records"] = False
+        state["rejected_records"] = []
+        return state
+
+    def _forwards_records(self) -> bool:
+        return self.sink is not None or self.keep_records or self._forward_records
+
+    def reject(self, record: Any, reason: str, stage: str, message: str, *args: Any, level: int = logging.WARNING):
+        """Records one rejection and logs `message % args` if it is sampled."""
+        count = self.counts.get(reason, 0) + 1
+        self.counts[reason] = count
+        self._unreported[reason] = self._unreported.get(reason, 0) + 1
+
+        if self.sink is not None:
+            self.sink.add(record, reason, stage)
+        if self.keep_records:
+            self.rejected_records.append(record)
+        if self._forward_records:
+            self._pending.append((record, reason, stage))
+
+        if count <= self.log_first or (self.log_every and count % self.log_every == 0):
+            if count > self.log_first:
+                message += " (%d rejections with reason '%s' so far)"
+                args += (count, reason)
+            logging.log(level, message, *args)
+
+    def fork(self) -> "RejectionTracker":
+        """Returns an empty tracker for a worker thread; merge its drain() back into this one."""
+        tracker = RejectionTracker(log_first=self.log_first, log_every=self.log_every)
+        tracker._forward_records = self._forwards_records()
+        return tracker
+
+    def drain(self) -> Dict[str, Any]:
+        """Returns and clears what a worker has not yet reported to the parent."""
+        state = {"counts": self._unreported, "records": self._pending}
+        self._unreported = {}
+        self._pending = []
+        return state
+
+    def merge(self, state: Dict[str, Any]):
+        """Adds counts and quarantined records drained from a worker."""
+        for reason, count in state["counts"].items():
+            self.counts[reason] = self.counts.get(reason, 0) + count
+        for record, reason, stage in state["records"]:
+            if self.sink is not None:
+                self.sink.add(record, reason, stage)
+            if self.keep_records:
+                self.rejected_records.append(record)
+            if self._forward_records:
+                self._pending.append((record, reason, stage))
+
+    def summary(self) -> Dict[str, int]:
+        """Returns the rejection counts per reason code."""
+        return dict(sorted(self.counts.items()))
+
+    def close(self):
+        """Flushes and closes the quarantine sink, if any."""
+        if self.sink is not None:
+            self.sink.close()
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+from order_pipeline.records import OrderRecord
+
+# Tumbling window sizes, in minutes.
+ROLLUP_WINDOWS = {"5min": 5, "hour": 60, "day": 1440}
+_STATUS_COLUMNS = ("paid", "pending", "refunded")
+
+def window_start(timestamp: str, window: str) -> str:
+    """
+    Returns the start of the window holding a transformed timestamp, in the
+    timestamp's own wall-clock time: 'YYYY-MM-DD' for days and
+    'YYYY-MM-DDTHH:MM' otherwise.
+    """
+    if window == "day":
+        return timestamp[:10]
+    if window == "hour":
+        return f"{timestamp[:13]}:00"
+    minutes = ROLLUP_WINDOWS[window]
+    return f"{timestamp[:14]}{int(timestamp[14:16]) // minutes * minutes:02d}"
+
+def _check_window(window: str):
+    if window not in ROLLUP_WINDOWS:
+        raise ValueError(f"Unknown rollup window '{window}'. Expected one of: {', '.join(ROLLUP_WINDOWS)}.")
+
+class RollupAccumulator:
+    """
+    Per-window totals for one run: orders, paid revenue and status counts
+    for every 5-minute, hourly and daily window the run's records fall in.
+    Records without a timestamp are only counted in `unknown_timestamps`.
+    Memory grows with the number of windows touched, not with the number of
+    orders.
+    """
+
+    def __init__(self):
+        # window -> window start -> [orders, revenue, paid, pending, refunded]
+        self.windows: Dict[str, Dict[str, List[float]]] = {window: {} for window in ROLLUP_WINDOWS}
+        self.unknown_timestamps = 0
+
+    def add(self, record: Dict[str, Any]):
+        """Adds a single transformed record (a dict or an OrderRecord)."""
+        if type(record) is OrderRecord:
+            timestamp, status, total = record.timestamp, record.payment_status, record.total
+        else:
+            timestamp = record.get('timestamp', '')
+            status, total = record.get('payment_status', 'pending'), record.get('total', 0.0)
+        if not timestamp:
+            self.unknown_timestamps += 1
+            return
+        status_index = 2 + (_STATUS_COLUMNS.index(status) if status in _STATUS_COLUMNS else 1)
+        for window, starts in self.windows.items():
+            key = window_start(timestamp, window)
+            totals = starts.get(key)
+            if totals is None:
+                totals = starts[key] = [0, 0.0, 0, 0, 0]
+            totals[0] += 1
+            totals[status_index] += 1
+            if status_index == 2:
+                totals[1] += total
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> "RollupAccumulator":
+        """Adds every record from an iterable and returns self."""
+        for record in records:
+            self.add(record)
+        return self
+
+    def __len__(self) -> int:
+        """Returns the number of windows touched."""
+        return sum(len(starts) for starts in self.windows.values())
+
+class RollupStore:
+    """
+    Window totals persisted in a SQLite file, one row per window.
+
+    apply() adds a run's RollupAccumulator to the stored rows in a single
+    transaction, touching only the windows that run saw, and query() reads a
+    range of windows without going back to the orders. Totals are additive,
+    so each order must be applied once: pair the store with incremental
+    state (or feed it disjoint inputs) rather than re-running the same data.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._db: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "RollupStore":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self._db = sqlite3.connect(self.filepath)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rollups (window_size TEXT, window_start TEXT, orders INTEGER,"
+                " revenue REAL, paid INTEGER, pending INTEGER, refunded INTEGER,"
+                " PRIMARY KEY (window_size, window_start)) WITHOUT ROWID"
+            )
+        except sqlite3.DatabaseError as e:
+            self.close()
+            raise IOError(f"Failed to open rollup store {self.filepath}: {e}")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def apply(self, rollups: RollupAccumulator) -> int:
+        """Adds a run's window totals to the store and returns the number of windows updated."""
+        rows = (
+            (window, start, *totals)
+            for window, starts in rollups.windows.items()
+            for start, totals in starts.items()
+        )
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (window_size, window_start) DO UPDATE SET"
+                " orders = orders + excluded.orders, revenue = revenue + excluded.revenue,"
+                " paid = paid + excluded.paid, pending = pending + excluded.pending,"
+                " refunded = refunded + excluded.refunded",
+                rows
+            )
+        return len(rollups)
+
+    def query(self, window: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the stored windows of one size ('5min', 'hour' or 'day')
+        starting at or after `start` and before `end`, oldest first. Bounds
+        are compared as ISO strings, so '2025-10-19' or '2025-10-19T08:00'
+        both work.
+        """
+        _check_window(window)
+        sql = "SELECT window_start, orders, revenue, paid, pending, refunded FROM rollups WHERE window_size = ?"
+        params = [window]
+        if start is not None:
+            sql += " AND window_start >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND window_start < ?"
+            params.append(end)
+        rows = self._db.execute(sql + " ORDER BY window_start", params)
+        return [
+            {
+                "window_start": key,
+                "orders": orders,
+                "revenue": round(revenue, 2),
+                "status_counts": {"paid": paid, "pending": pending, "refunded": refunded}
+            }
+            for key, orders, revenue, paid, pending, refunded in rows
+        ]
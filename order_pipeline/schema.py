@@ -0,0 +1,231 @@
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+FIELD_TYPES = ('any', 'text', 'number')
+
+# The rules DataValidator applies by default, in the order fields are checked.
+ORDER_SCHEMA: Dict[str, Dict[str, Any]] = {
+    'order_id': {},
+    'timestamp': {},
+    'item': {'type': 'text', 'non_empty': True},
+    'quantity': {'type': 'number', 'positive': True},
+    'price': {'type': 'number', 'positive': True},
+    'payment_status': {},
+    'total': {'type': 'number', 'positive': True},
+}
+
+# Strings that the validator and the transformer both read as this same
+# number: optional currency letters followed by a plain decimal.
+_plain_number_pattern = re.compile(r"\s*[$Nn]*([0-9]+(?:\.[0-9]+)?)\s*")
+
+def parse_plain_number(value: Any) -> Optional[float]:
+    """
+    Fast path shared by the validator and DataProcessor: returns ints,
+    floats and plain decimal strings (see _plain_number_pattern) as floats,
+    and None for anything else, which the full rules have to decide.
+    """
+    if isinstance(value, (int, float)):
+        try:
+            return float(value)
+        except OverflowError:
+            return None
+    if isinstance(value, str):
+        match = _plain_number_pattern.fullmatch(value)
+        if match:
+            return float(match.group(1))
+    return None
+
+def parse_number(value: Any) -> Optional[float]:
+    """
+    Reads a number the way the validator always has: ints and floats as
+    they are, anything float() accepts, or a string with leading currency
+    letters ('$', 'N') stripped. Returns None if the value is not numeric.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if type(value) is str and value[:1] not in '$Nn':
+        # Most strings are plain numbers: float() reads them fastest, and
+        # agrees with parse_plain_number wherever both accept the string.
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    else:
+        number = parse_plain_number(value)
+        if number is not None:
+            return number
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            pass
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value.strip().lstrip('$Nn'))
+    except ValueError:
+        return None
+
+class FieldRule:
+    """
+    Checks for one field: whether it is `required`, its `type` ('any',
+    'text' or 'number'), and for text whether it must be `non_empty`, for
+    numbers whether it must be `positive`. A missing optional field passes.
+    """
+
+    def __init__(self, name: str, type: str = 'any', required: bool = True, positive: bool = False,
+                 non_empty: bool = False):
+        if type not in FIELD_TYPES:
+            raise ValueError(f"Unknown type '{type}' for field '{name}'. Expected one of: {', '.join(FIELD_TYPES)}.")
+        if positive and type != 'number':
+            raise ValueError(f"Field '{name}': 'positive' only applies to number fields.")
+        if non_empty and type != 'text':
+            raise ValueError(f"Field '{name}': 'non_empty' only applies to text fields.")
+        self.name = name
+        self.type = type
+        self.required = required
+        self.positive = positive
+        self.non_empty = non_empty
+
+    @classmethod
+    def from_spec(cls, name: str, spec: Dict[str, Any]) -> "FieldRule":
+        """Builds a rule from a schema entry such as {'type': 'number', 'positive': True}."""
+        unknown = set(spec) - {'type', 'required', 'positive', 'non_empty'}
+        if unknown:
+            raise ValueError(f"Unknown rule(s) for field '{name}': {', '.join(sorted(unknown))}.")
+        return cls(name, **spec)
+
+    def failure(self, value: Any) -> Optional[Tuple[str, str, Tuple[Any, ...]]]:
+        """
+        Returns (reason code, message format, message arguments) if the value
+        breaks the rule, or None if it passes. The message format takes the
+        order_id first, then the arguments.
+        """
+        name = self.name
+        if value is None:
+            if not self.required:
+                return None
+            return f"missing_{name}", "Skipping record (order_id: %s): Missing required field '%s'.", (name,)
+        if self.type == 'text':
+            if self.non_empty and (not isinstance(value, str) or not value.strip()):
+                return (f"empty_{name}", "Skipping record (order_id: %s): Missing or empty required field '%s'.",
+                        (name,))
+            if not isinstance(value, str):
+                return f"invalid_{name}", "Skipping record (order_id: %s): Invalid value for '%s': %s", (name, value)
+        elif self.type == 'number':
+            number = parse_number(value)
+            if self.positive and (number is None or not number > 0):
+                return (f"invalid_{name}", "Skipping record (order_id: %s): Invalid or non-positive value for '%s': %s",
+                        (name, value))
+            if number is None:
+                return (f"invalid_{name}", "Skipping record (order_id: %s): Invalid numeric value for '%s': %s",
+                        (name, value))
+        return None
+
+    def _source(self, indent: int, fail: List[str]) -> List[str]:
+        """Returns the lines of generated code checking `value` (already fetched)."""
+        pad = '    ' * indent
+        lines = []
+        if self.required:
+            lines.append(f"{pad}if value is None:")
+            lines.extend(f"{pad}    {line}" for line in fail)
+        elif self.type != 'any':
+            lines.append(f"{pad}if value is not None:")
+            indent += 1
+            pad = '    ' * indent
+        inner = [f"{pad}    {line}" for line in fail]
+        if self.type == 'text':
+            if self.non_empty:
+                lines.append(f"{pad}if not (isinstance(value, str) and value.strip()):")
+            else:
+                lines.append(f"{pad}if not isinstance(value, str):")
+            lines.extend(inner)
+        elif self.type == 'number':
+            # Plain ints and floats are decided inline; everything else is parsed.
+            if self.positive:
+                lines.append(f"{pad}if not ((type(value) is int or type(value) is float) and value > 0):")
+                lines.append(f"{pad}    number = parse_number(value)")
+                lines.append(f"{pad}    if number is None or not number > 0:")
+                lines.extend(f"    {line}" for line in inner)
+            else:
+                lines.append(f"{pad}if type(value) is not int and type(value) is not float "
+                             f"and parse_number(value) is None:")
+                lines.extend(inner)
+        return lines
+
+class ValidationSchema:
+    """
+    A declarative record schema compiled into specialized check functions.
+
+    `fields` maps each field name to its rules (see FieldRule), in the order
+    they are checked; ORDER_SCHEMA is the default. The rules are turned once
+    into straight-line Python with the field names and checks written out,
+    so validating a record involves no loop over fields or rule lookups.
+    check() validates one record and check_batch() a whole chunk in a single
+    call. A record fails on its first broken rule, in field order.
+    """
+
+    def __init__(self, fields: Optional[Union[Dict[str, Dict[str, Any]], Sequence[FieldRule]]] = None):
+        if fields is None:
+            fields = ORDER_SCHEMA
+        if isinstance(fields, dict):
+            self.rules = [FieldRule.from_spec(name, spec) for name, spec in fields.items()]
+        else:
+            self.rules = list(fields)
+        self._rules_by_name = {rule.name: rule for rule in self.rules}
+        self._compile()
+
+    @property
+    def required_fields(self) -> List[str]:
+        return [rule.name for rule in self.rules if rule.required]
+
+    def rule(self, field: str) -> FieldRule:
+        """Returns the rule for a field (a plain required-field rule if the schema has none)."""
+        return self._rules_by_name.get(field) or FieldRule(field)
+
+    def source(self) -> str:
+        """Returns the generated Python source of the check functions."""
+        record_lines = ["def check(record):", "    get = record.get"]
+        batch_lines = [
+            "def check_batch(records):",
+            "    valid = []",
+            "    failures = []",
+            "    append = valid.append",
+            "    for record in records:",
+            "        get = record.get",
+        ]
+        for rule in self.rules:
+            record_lines.append(f"    value = get({rule.name!r})")
+            record_lines.extend(rule._source(1, [f"return {rule.name!r}"]))
+            batch_lines.append(f"        value = get({rule.name!r})")
+            batch_lines.extend(rule._source(2, [f"failures.append((record, {rule.name!r}))", "continue"]))
+        record_lines.append("    return None")
+        batch_lines.append("        append(record)")
+        batch_lines.append("    return valid, failures")
+        return "\n".join(record_lines + [""] + batch_lines) + "\n"
+
+    def _compile(self):
+        namespace = {"parse_number": parse_number}
+        exec(compile(self.source(), "<validation schema>", "exec"), namespace)
+        self._check: Callable[[Dict[str, Any]], Optional[str]] = namespace["check"]
+        self._check_batch = namespace["check_batch"]
+
+    def check(self, record: Dict[str, Any]) -> Optional[str]:
+        """Returns the first field the record fails on, or None if it is valid."""
+        return self._check(record)
+
+    def check_batch(self, records: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+        """
+        Validates a chunk. Returns the valid records and a (record, field)
+        pair for each invalid one, both in input order.
+        """
+        return self._check_batch(records)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Generated functions cannot be pickled; workers compile their own.
+        state = self.__dict__.copy()
+        del state["_check"], state["_check_batch"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._compile()
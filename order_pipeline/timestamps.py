@@ -0,0 +1,159 @@
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+from dateutil.parser import parse as parse_datetime
+
+def _parse_iso_utc(match) -> datetime:
+    """Builds a UTC datetime from 'YYYY-MM-DDTHH:MM:SS[.ffffff]Z'."""
+    year, month, day, hour, minute, second, fraction = match.groups()
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                    microsecond, tzinfo=timezone.utc)
+
+def _parse_iso_naive(match) -> datetime:
+    """Builds a naive datetime from 'YYYY-MM-DD HH:MM[:SS]' (space or 'T')."""
+    year, month, day, hour, minute, second = match.groups()
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+
+def _parse_slash_ampm(match) -> datetime:
+    """
+    Builds a naive datetime from 'A/B/YYYY HH:MM AM'.
+
+    Mirrors dateutil's default ordering: month first unless the first
+    component cannot be a month, in which case it is the day.
+    """
+    first, second, year, hour, minute, meridiem = match.groups()
+    first, second, hour = int(first), int(second), int(hour)
+    if first > 12:
+        day, month = first, second
+    else:
+        month, day = first, second
+    if not 1 <= hour <= 12:
+        raise ValueError(f"hour {hour} is not a 12-hour clock value")
+    if meridiem.lower() == 'am':
+        hour = 0 if hour == 12 else hour
+    else:
+        hour = 12 if hour == 12 else hour + 12
+    return datetime(int(year), month, day, hour, int(minute))
+
+class TimestampParser:
+    """
+    Parses order timestamps into ISO strings.
+
+    The formats our feeds actually use are matched by compiled regexes and
+    built directly; anything else falls back to dateutil. Results for recently
+    seen raw strings are kept in a bounded LRU cache. Unparseable timestamps
+    are logged the way RejectionTracker logs rejections: the first
+    `log_first`, then one in every `log_every`.
+    """
+
+    _fast_formats = (
+        ('iso_utc', re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z"), _parse_iso_utc),
+        ('iso_naive', re.compile(r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2}))?"), _parse_iso_naive),
+        ('slash_ampm', re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{2}) ?([AaPp][Mm])"), _parse_slash_ampm),
+    )
+
+    def __init__(self, cache_size: int = 4096, log_first: int = 100, log_every: int = 1000):
+        self.cache_size = cache_size
+        self.log_first = log_first
+        self.log_every = log_every
+        # Unlike stats["failures"], not reset by drain_stats().
+        self._failures_seen = 0
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._formats = list(self._fast_formats)
+        self.stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "fast_path": 0,
+            "fallbacks": 0,
+            "failures": 0,
+        }
+
+    def detect_formats(self, timestamps: Iterable[Any], sample_size: int = 100):
+        """
+        Reorders the fast parsers so the formats most common in a sample of
+        the batch are tried first.
+        """
+        hits = {name: 0 for name, _, _ in self._formats}
+        for i, timestamp in enumerate(timestamps):
+            if i >= sample_size:
+                break
+            if not isinstance(timestamp, str):
+                continue
+            for name, pattern, _ in self._formats:
+                if pattern.fullmatch(timestamp):
+                    hits[name] += 1
+                    break
+        self._formats.sort(key=lambda fmt: hits[fmt[0]], reverse=True)
+
+    def parse(self, timestamp: Any) -> str:
+        """Parses a timestamp into an ISO string, returning '' if it cannot be parsed."""
+        if not isinstance(timestamp, str) or not timestamp:
+            return ""
+
+        cached = self._cache.get(timestamp)
+        if cached is not None:
+            self._cache.move_to_end(timestamp)
+            self.stats["cache_hits"] += 1
+            return cached
+        self.stats["cache_misses"] += 1
+
+        result = self._parse_fast(timestamp)
+        if result is None:
+            result = self._parse_fallback(timestamp)
+            if not result:
+                return result
+
+        self._cache[timestamp] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _parse_fast(self, timestamp: str) -> Optional[str]:
+        """Tries the compiled formats; returns None when none of them apply."""
+        for _, pattern, build in self._formats:
+            match = pattern.fullmatch(timestamp)
+            if match:
+                try:
+                    result = build(match).isoformat()
+                except ValueError:
+                    # Out-of-range fields; let dateutil decide what they mean.
+                    return None
+                self.stats["fast_path"] += 1
+                return result
+        return None
+
+    def _parse_fallback(self, timestamp: str) -> str:
+        """Parses an unusual timestamp with dateutil."""
+        self.stats["fallbacks"] += 1
+        try:
+            # dateutil.parser is very flexible
+            return parse_datetime(timestamp).isoformat()
+        except Exception as e:
+            self.stats["failures"] += 1
+            self._failures_seen += 1
+            count = self._failures_seen
+            if count <= self.log_first or (self.log_every and count % self.log_every == 0):
+                if count > self.log_first:
+                    logging.warning("Could not parse timestamp '%s': %s (%d failures so far)", timestamp, e, count)
+                else:
+                    logging.warning("Could not parse timestamp '%s': %s", timestamp, e)
+            return ""
+
+    def add_stats(self, stats: Dict[str, int]):
+        """Adds counters collected by another parser, e.g. in a worker process."""
+        for key, value in stats.items():
+            self.stats[key] += value
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns a copy of the cache and fallback counters."""
+        return dict(self.stats)
+
+    def drain_stats(self) -> Dict[str, int]:
+        """Returns the counters and resets them to zero (used in worker processes)."""
+        stats = self.get_stats()
+        for key in self.stats:
+            self.stats[key] = 0
+        return stats
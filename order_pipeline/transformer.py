@@ -1,14 +1,42 @@
 import logging
 import re
-from typing import List, Dict, Any
-from dateutil.parser import parse as parse_datetime
+from typing import List, Dict, Any, Optional, Union
+from order_pipeline.categories import CategoryDictionary
+from order_pipeline.columnar import AnalysisColumns
+from order_pipeline.parallel import run_chunked
+from order_pipeline.records import OrderRecord
+from order_pipeline.rejections import RejectionTracker
+from order_pipeline.timestamps import TimestampParser
 
 class DataTransformer:
-    """Transforms and cleans validated order data."""
+    """
+    Transforms and cleans validated order data.
+
+    Transformed records are copies of the input dicts, or with
+    `compact_records` OrderRecord objects that keep only the canonical
+    fields. `item` and `payment_status` are dictionary-encoded through
+    `items` and `statuses`: every record shares one string object per
+    distinct value, and repeated raw spellings are normalized only once.
+    Status codes always match the analyzer's STATUS_CODES.
+
+    While `columns` is set, each transformed record's total and status code
+    are also appended to it, in output order, for columnar analysis.
+    """
 
     _valid_statuses = {'paid', 'pending', 'refunded'}
     _numeric_extract_pattern = re.compile(r"(\d+(\.\d+)?)")
 
+    def __init__(self, timestamp_cache_size: int = 4096, rejections: Optional[RejectionTracker] = None,
+                 compact_records: bool = False, category_cache_size: int = 65536):
+        self.timestamp_parser = TimestampParser(cache_size=timestamp_cache_size)
+        self.rejections = rejections or RejectionTracker()
+        self.compact_records = compact_records
+        self.items = CategoryDictionary(self._clean_text, memo_size=category_cache_size)
+        self.statuses = CategoryDictionary(
+            self._normalize_status, sorted(self._valid_statuses), memo_size=category_cache_size
+        )
+        self.columns: Optional[AnalysisColumns] = None
+
     @staticmethod
     def _clean_numeric_string(value: Any) -> float:
         """Cleans a string and returns a float. Returns 0.0 if conversion fails."""
@@ -52,20 +80,11 @@ class DataTransformer:
             return cleaned[0].upper() + cleaned[1:].lower()
         return ""
 
-    @staticmethod
-    def _parse_timestamp(timestamp: Any) -> str:
+    def _parse_timestamp(self, timestamp: Any) -> str:
         """Parses various datetime formats into a standard ISO string."""
-        if not isinstance(timestamp, str) or not timestamp:
-            return ""
-        try:
-            # dateutil.parser is very flexible
-            dt = parse_datetime(timestamp)
-            return dt.isoformat()
-        except Exception as e:
-            logging.warning(f"Could not parse timestamp '{timestamp}': {e}")
-            return ""
+        return self.timestamp_parser.parse(timestamp)
 
-    def transform_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def transform_data(self, data: List[Dict[str, Any]], workers: int = 1, chunk_size: int = 10000) -> List[Dict[str, Any]]:
         """
         Transforms a list of validated order records.
         
@@ -75,55 +94,118 @@ class DataTransformer:
         3. Cleans text fields ('item', 'order_id').
         4. Recalculates 'total' as quantity * price for consistency.
         5. Parses and standardizes 'timestamp'.
+
+        With `workers` > 1 the records are transformed in chunks of
+        `chunk_size` on a process pool; the result is the same list, in the
+        same order, and the workers' counters are added to ours.
         """
+        if workers > 1 and len(data) > chunk_size:
+            transformed_data = run_chunked(self, '_transform_records', data, workers, chunk_size)
+        else:
+            transformed_data = self._transform_records(data)
+
+        logging.info(f"Transformation complete. Processed {len(transformed_data)} records.")
+        logging.debug(f"Timestamp parser stats: {self.timestamp_parser.get_stats()}")
+        return transformed_data
+
+    def _transform_records(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Transforms a list of records without logging a summary."""
         transformed_data = []
+        self.timestamp_parser.detect_formats(record.get('timestamp') for record in data)
         for record in data:
             try:
-                transformed_record = record.copy()
-                
-                quantity = self._clean_numeric_string(transformed_record['quantity'])
-                price = self._clean_numeric_string(transformed_record['price'])
-                orig_qty_val = str(transformed_record.get('quantity', '')).strip()
-                if quantity == 0.0 and orig_qty_val not in ('0', '0.0'):
-                    logging.warning(
-                        f"Skipping record {record.get('order_id', 'N/A')} due to "
-                        f"unparseable quantity: {orig_qty_val}"
-                    )
-                    continue
-
-                orig_price_val = str(transformed_record.get('price', '')).strip()
-                if price == 0.0 and orig_price_val not in ('0', '0.0'):
-                    logging.warning(
-                        f"Skipping record {record.get('order_id', 'N/A')} due to "
-                        f"unparseable price: {orig_price_val}"
-                    )
-                    continue
-
-                transformed_record['payment_status'] = self._normalize_status(transformed_record['payment_status'])
-                transformed_record['item'] = self._clean_text(transformed_record['item'])
-                transformed_record['order_id'] = str(transformed_record['order_id']).strip()
-                
-                recalculated_total = round(quantity * price, 2)
-                
-                original_total = self._clean_numeric_string(transformed_record['total'])
-                if original_total != recalculated_total:
-                    logging.debug(
-                        f"Correcting total for order_id {transformed_record['order_id']}: "
-                        f"Original={original_total}, New={recalculated_total}"
-                    )
-                
-                transformed_record['quantity'] = quantity
-                transformed_record['price'] = price
-                transformed_record['total'] = recalculated_total
-                transformed_record['timestamp'] = self._parse_timestamp(transformed_record['timestamp'])
-
-                transformed_data.append(transformed_record)
-                
+                transformed_record = self._transform_record(record)
             except Exception as e:
-                logging.error(f"Error transforming record {record.get('order_id', 'N/A')}: {e}")
+                self.rejections.reject(
+                    record, "transform_error", "transformation",
+                    "Error transforming record %s: %s", record.get('order_id', 'N/A'), e,
+                    level=logging.ERROR
+                )
                 continue
-                
-        logging.info(f"Transformation complete. Processed {len(transformed_data)} records.")
+            if transformed_record is not None:
+                transformed_data.append(transformed_record)
+
         return transformed_data
 
+    def _drain_worker_state(self) -> Dict[str, Any]:
+        """Returns timestamp and rejection counters, and any columns, collected in a worker process."""
+        state = {"timestamps": self.timestamp_parser.drain_stats(), "rejections": self.rejections.drain()}
+        if self.columns is not None:
+            state["columns"] = self.columns.drain()
+        return state
+
+    def _merge_worker_state(self, state: Dict[str, Any]):
+        """Adds counters and columns drained from a worker process."""
+        self.timestamp_parser.add_stats(state["timestamps"])
+        self.rejections.merge(state["rejections"])
+        if "columns" in state:
+            self.columns.merge(state["columns"])
+
+    def _transform_record(self, record: Dict[str, Any], quantity: Optional[float] = None,
+                          price: Optional[float] = None,
+                          original_total: Optional[float] = None) -> Optional[Union[Dict[str, Any], OrderRecord]]:
+        """
+        Transforms a single record, returning None if it has to be skipped.
+
+        Numbers that were already parsed (e.g. during validation) can be
+        passed in; any that are missing are parsed from the record.
+        """
+        if quantity is None:
+            quantity = self._clean_numeric_string(record['quantity'])
+        if price is None:
+            price = self._clean_numeric_string(record['price'])
+        if quantity == 0.0:
+            orig_qty_val = str(record.get('quantity', '')).strip()
+            if orig_qty_val not in ('0', '0.0'):
+                self.rejections.reject(
+                    record, "unparseable_quantity", "transformation",
+                    "Skipping record %s due to unparseable quantity: %s",
+                    record.get('order_id', 'N/A'), orig_qty_val
+                )
+                return None
+
+        if price == 0.0:
+            orig_price_val = str(record.get('price', '')).strip()
+            if orig_price_val not in ('0', '0.0'):
+                self.rejections.reject(
+                    record, "unparseable_price", "transformation",
+                    "Skipping record %s due to unparseable price: %s",
+                    record.get('order_id', 'N/A'), orig_price_val
+                )
+                return None
+
+        status_code = self.statuses.encode(record['payment_status'])
+        payment_status = self.statuses.values[status_code]
+        item = self.items.canonical(record['item'])
+        order_id = str(record['order_id']).strip()
+
+        recalculated_total = round(quantity * price, 2)
+
+        if original_total is None:
+            original_total = self._clean_numeric_string(record['total'])
+        if original_total != recalculated_total:
+            logging.debug(
+                f"Correcting total for order_id {order_id}: "
+                f"Original={original_total}, New={recalculated_total}"
+            )
+
+        timestamp = self._parse_timestamp(record['timestamp'])
+
+        columns = self.columns
+        if columns is not None:
+            columns.totals.append(recalculated_total)
+            columns.status_codes.append(status_code)
+
+        if self.compact_records:
+            return OrderRecord(order_id, timestamp, item, quantity, price, recalculated_total, payment_status)
+
+        transformed_record = record.copy()
+        transformed_record['payment_status'] = payment_status
+        transformed_record['item'] = item
+        transformed_record['order_id'] = order_id
+        transformed_record['quantity'] = quantity
+        transformed_record['price'] = price
+        transformed_record['total'] = recalculated_total
+        transformed_record['timestamp'] = timestamp
 
+        return transformed_record
@@ -1,83 +1,79 @@
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from order_pipeline.parallel import run_chunked
+from order_pipeline.rejections import RejectionTracker
+from order_pipeline.schema import ValidationSchema, parse_number
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class DataValidator:
-    """Validates a list of order records."""
+    """
+    Validates a list of order records against a ValidationSchema (by default
+    ORDER_SCHEMA: every field required, `item` non-empty text, `quantity`,
+    `price` and `total` positive numbers).
+    """
 
-    def __init__(self):
-        self.required_fields = [
-            'order_id', 'timestamp', 'item', 'quantity', 
-            'price', 'payment_status', 'total'
-        ]
+    def __init__(self, rejections: Optional[RejectionTracker] = None, schema: Optional[ValidationSchema] = None):
+        self.schema = schema or ValidationSchema()
+        self.rejections = rejections or RejectionTracker()
+
+    @property
+    def required_fields(self) -> List[str]:
+        return self.schema.required_fields
 
     def _is_positive_numeric_string(self, value: Any) -> bool:
         """Checks if a value is a positive number."""
-        if isinstance(value, (int, float)):
-            return value > 0
-
-        try:
-            numeric_value = float(value)
-            return numeric_value > 0
-        except (ValueError, TypeError):
-            pass 
-        
-        if not isinstance(value, str):
-            return False
-        
-        cleaned_value = value.strip().lstrip('$Nn') 
-        
-        try:
-            numeric_value = float(cleaned_value)
-            return numeric_value > 0
-        except (ValueError, TypeError):
-            return False
+        number = parse_number(value)
+        return number is not None and number > 0
 
     def _is_field_valid(self, record: Dict[str, Any], field: str) -> bool:
         """Checks if a single field is present and valid."""
-        value = record.get(field)
-        
-        if value is None:
-            logging.warning(f"Skipping record (order_id: {record.get('order_id', 'N/A')}): Missing required field '{field}'.")
-            return False
-        
-        if field == 'item' and (not isinstance(value, str) or value.strip() == ""):
-            logging.warning(f"Skipping record (order_id: {record.get('order_id', 'N/A')}): Missing or empty required field 'item'.")
-            return False
-
-        if field in ['quantity', 'price', 'total']:
-            if not self._is_positive_numeric_string(value):
-                logging.warning(
-                    f"Skipping record (order_id: {record.get('order_id', 'N/A')}): "
-                    f"Invalid or non-positive value for '{field}': {value}"
-                )
-                return False
-        
-        return True
-
-    def validate_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        failure = self.schema.rule(field).failure(record.get(field))
+        if failure is None:
+            return True
+        self._reject(record, failure)
+        return False
+
+    def _reject(self, record: Dict[str, Any], failure: Tuple[str, str, Tuple[Any, ...]]):
+        reason, message, args = failure
+        self.rejections.reject(record, reason, "validation", message, record.get('order_id', 'N/A'), *args)
+
+    def validate_data(self, data: List[Dict[str, Any]], workers: int = 1, chunk_size: int = 10000) -> List[Dict[str, Any]]:
         """
         Filters a list of records, returning only valid ones.
 
-        A record is valid if:
+        A record is valid if it passes every rule of the schema; with the
+        default schema:
         1. All required fields are present.
-        2. 'quantity', 'price', and 'total' are positive numeric values.
+        2. 'item' is a non-empty string.
+        3. 'quantity', 'price', and 'total' are positive numeric values.
+
+        With `workers` > 1 the records are validated in chunks of `chunk_size`
+        on a process pool; the result is the same list, in the same order.
         """
-        validated_data = []
-        for record in data:
-            is_valid = True
-            for field in self.required_fields:
-                if not self._is_field_valid(record, field):
-                    is_valid = False
-                    break
-            
-            if is_valid:
-                validated_data.append(record)
-        
+        if workers > 1 and len(data) > chunk_size:
+            validated_data = run_chunked(self, '_filter_valid', data, workers, chunk_size)
+        else:
+            validated_data = self._filter_valid(data)
+
         logging.info(f"Validation complete. Passed: {len(validated_data)} / Original: {len(data)}")
         return validated_data
 
+    def _filter_valid(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Returns the valid records of a list without logging a summary."""
+        validated_data, failures = self.schema.check_batch(data)
+        for record, field in failures:
+            self._reject(record, self.schema.rule(field).failure(record.get(field)))
+        return validated_data
+
+    def _drain_worker_state(self) -> Dict[str, Any]:
+        """Returns rejection counts collected in a worker process."""
+        return self.rejections.drain()
+
+    def _merge_worker_state(self, state: Dict[str, Any]):
+        """Adds rejection counts drained from a worker process."""
+        self.rejections.merge(state)
+
 
@@ -1,5 +1,7 @@
 import pytest
-from order_pipeline.analyzer import DataAnalyzer
+from order_pipeline.analyzer import STATUS_CODES, DataAnalyzer, AnalysisAccumulator, GroupedAccumulator
+from order_pipeline.columnar import AnalysisColumns, ColumnarOrders, ColumnarWriter
+from order_pipeline.records import OrderRecord
 
 @pytest.fixture
 def analyzer():
@@ -96,3 +98,231 @@ class TestDataAnalyzer:
         assert analysis["status_counts"]["paid"] == 3
         assert analysis["status_counts"]["pending"] == 0
         assert analysis["status_counts"]["refunded"] == 0
+
+class TestAnalysisAccumulator:
+
+    def test_matches_analyze_data(self, analyzer, transformed_data):
+        """Tests that feeding records one at a time gives the same summary."""
+        accumulator = AnalysisAccumulator()
+        for record in transformed_data:
+            accumulator.add(record)
+
+        assert accumulator.result() == analyzer.analyze_data(transformed_data)
+
+    @pytest.mark.parametrize("as_records", [[], [0, 1, 2, 3, 4, 5], [0, 1, 2], [3, 4, 5]])
+    def test_update_matches_add(self, transformed_data, as_records):
+        """Tests that the bulk update counts dicts, OrderRecords and a mix of both like add()."""
+        records = [
+            OrderRecord(r["order_id"], "", r["item"], r["quantity"], r["price"], r["total"], r["payment_status"])
+            if i in as_records else r
+            for i, r in enumerate(transformed_data)
+        ]
+        added = AnalysisAccumulator(grouped=True, sketches=True)
+        for record in records:
+            added.add(record)
+        updated = AnalysisAccumulator(grouped=True, sketches=True)
+        updated.update(records[:4])
+        updated.update(iter(records[4:]))
+        updated.update([])
+
+        assert updated.to_dict() == added.to_dict()
+
+    def test_track_passes_records_through(self, transformed_data):
+        """Tests that track yields every record unchanged while counting it."""
+        accumulator = AnalysisAccumulator()
+        assert list(accumulator.track(transformed_data)) == transformed_data
+        assert accumulator.result()["total_orders"] == len(transformed_data)
+
+    def test_merge_matches_single_pass(self, analyzer, transformed_data):
+        """Tests that merging per-chunk accumulators gives the full summary."""
+        left, right = AnalysisAccumulator(), AnalysisAccumulator()
+        left.update(transformed_data[:2])
+        right.update(transformed_data[2:])
+
+        merged = left.merge(right).result()
+        expected = analyzer.analyze_data(transformed_data)
+
+        assert merged["total_revenue"] == expected["total_revenue"]
+        assert merged["total_orders"] == expected["total_orders"]
+        assert merged["average_revenue"] == pytest.approx(expected["average_revenue"])
+        assert merged["status_counts"] == expected["status_counts"]
+
+    def test_merge_empty(self, transformed_data):
+        """Tests that merging an empty accumulator changes nothing."""
+        accumulator = AnalysisAccumulator()
+        accumulator.update(transformed_data)
+        before = accumulator.result()
+
+        assert accumulator.merge(AnalysisAccumulator()).result() == before
+
+    def test_save_and_load(self, transformed_data, tmp_path):
+        """Tests that a saved accumulator reloads with the same state."""
+        accumulator = AnalysisAccumulator()
+        accumulator.update(transformed_data)
+        state_file = tmp_path / "state.json"
+
+        accumulator.save(str(state_file))
+        reloaded = AnalysisAccumulator.load(str(state_file))
+
+        assert reloaded.to_dict() == accumulator.to_dict()
+        assert reloaded.result() == accumulator.result()
+
+    def test_load_invalid_state(self, tmp_path):
+        """Tests that a malformed state file raises ValueError."""
+        state_file = tmp_path / "state.json"
+        state_file.write_text('{"total_orders": 3}')
+
+        with pytest.raises(ValueError, match="Invalid accumulator state"):
+            AnalysisAccumulator.load(str(state_file))
+
+class TestColumnarAnalysis:
+
+    def test_matches_analyze_data(self, analyzer, transformed_data):
+        """Tests that the columnar path returns exactly the same dict."""
+        assert analyzer.analyze_columnar(transformed_data) == analyzer.analyze_data(transformed_data)
+
+    def test_matches_float_summation_order(self, analyzer):
+        """Tests that revenue is summed in the same order as the record loop."""
+        data = [
+            {"total": value, "payment_status": status}
+            for value, status in zip([0.1, 0.2, 0.3, 1e16, -1e16, 0.7] * 50, ["paid", "Paid", "paid"] * 100)
+        ]
+        assert analyzer.analyze_columnar(data) == analyzer.analyze_data(data)
+
+    def test_unknown_and_missing_status(self, analyzer):
+        """Tests that unknown or missing statuses count as pending."""
+        data = [{"total": 5.0, "payment_status": "shipped"}, {"total": 5.0}]
+        analysis = analyzer.analyze_columnar(data)
+        assert analysis["status_counts"] == {"paid": 0, "pending": 2, "refunded": 0}
+        assert analysis == analyzer.analyze_data(data)
+
+    def test_empty_input(self, analyzer):
+        """Tests columnar analysis on an empty data list."""
+        assert analyzer.analyze_columnar([]) == analyzer.analyze_data([])
+
+    def test_transformer_columns(self, analyzer, transformed_data):
+        """Tests that columns collected while transforming are used only if they cover every record."""
+        columns = AnalysisColumns()
+        columns.totals.extend(r["total"] for r in transformed_data)
+        columns.status_codes.extend(STATUS_CODES[r["payment_status"]] for r in transformed_data)
+        expected = analyzer.analyze_data(transformed_data)
+
+        assert analyzer.analyze_columnar(transformed_data, columns) == expected
+        columns.status_codes[0] = 2
+        assert analyzer.analyze_columnar(transformed_data, columns) != expected
+        assert analyzer.analyze_columnar(transformed_data[1:], columns) == analyzer.analyze_data(transformed_data[1:])
+
+class TestOrderRecordAnalysis:
+
+    def test_matches_dict_records(self, analyzer, transformed_data):
+        """Tests that OrderRecords give the same summary as dicts on every path."""
+        records = [
+            OrderRecord(r["order_id"], "", r["item"], r["quantity"], r["price"], r["total"], r["payment_status"])
+            for r in transformed_data
+        ]
+        expected = analyzer.analyze_data(transformed_data)
+
+        assert analyzer.analyze_data(records) == expected
+        assert analyzer.analyze_columnar(records) == expected
+
+@pytest.fixture
+def timed_data(transformed_data):
+    """Adds transformed timestamps across two days, one missing, to the sample data."""
+    timestamps = [
+        "2025-10-19T08:00:00+00:00", "2025-10-19T08:30:00", "2025-10-19T23:15:00-05:00",
+        "2025-10-20T08:05:00+00:00", "", "2025-10-20T09:00:00+01:00"
+    ]
+    return [dict(record, timestamp=timestamp) for record, timestamp in zip(transformed_data, timestamps)]
+
+class TestGroupedAnalysis:
+
+    def test_groups(self, timed_data):
+        """Tests per-item, per-day and per-hour totals and the top-N lists."""
+        groups = DataAnalyzer(grouped=True, top_n=2).analyze_data(timed_data)["groups"]
+
+        assert groups["by_item"]["Mouse"] == {"orders": 1, "quantity": 2, "revenue": 40.0}
+        assert groups["by_item"]["Keyboard"] == {"orders": 1, "quantity": 0.0, "revenue": 0.0}
+        assert groups["by_day"] == {
+            "2025-10-19": {"orders": 3, "revenue": 1240.0},
+            "2025-10-20": {"orders": 2, "revenue": 30.0}
+        }
+        assert groups["by_hour"] == {
+            "08": {"orders": 3, "revenue": 1240.0},
+            "09": {"orders": 1, "revenue": 30.0},
+            "23": {"orders": 1, "revenue": 0.0}
+        }
+        assert groups["unknown_timestamps"] == 1
+        assert groups["top_items_by_revenue"] == [
+            {"item": "Laptop", "revenue": 1200.0}, {"item": "Mouse", "revenue": 40.0}
+        ]
+        assert groups["top_items_by_quantity"] == [{"item": "Cable", "quantity": 3}, {"item": "Mouse", "quantity": 2}]
+
+    def test_grouping_is_optional(self, timed_data):
+        assert "groups" not in DataAnalyzer().analyze_data(timed_data)
+
+    def test_merge_and_save(self, timed_data, tmp_path):
+        """Tests that merged and reloaded accumulators keep the same groups."""
+        expected = DataAnalyzer(grouped=True).analyze_data(timed_data)
+        left, right = AnalysisAccumulator(grouped=True), AnalysisAccumulator(grouped=True)
+        left.update(timed_data[:3])
+        right.update(timed_data[3:])
+        merged = AnalysisAccumulator().merge(left).merge(right)
+        assert merged.result()["groups"] == expected["groups"]
+
+        state_file = tmp_path / "state.json"
+        merged.save(str(state_file))
+        assert AnalysisAccumulator.load(str(state_file)).result() == merged.result()
+
+    def test_columnar_paths_match(self, timed_data, tmp_path):
+        """Tests that the NumPy grouping of records and of a columnar cache match the record loop."""
+        analyzer = DataAnalyzer(grouped=True, top_n=3)
+        expected = analyzer.analyze_data(timed_data)
+        cache = tmp_path / "orders.cols"
+        with ColumnarWriter(str(cache)) as writer:
+            writer.write_many(timed_data)
+            writer.close({})
+
+        assert analyzer.analyze_columnar(timed_data) == expected
+        assert analyzer.analyze_columnar(ColumnarOrders(str(cache))) == expected
+
+    def test_invalid_state(self):
+        with pytest.raises(ValueError, match="Invalid grouped accumulator state"):
+            GroupedAccumulator.from_dict({"top_n": 3})
+
+class TestSketchAnalysis:
+
+    def test_sketches(self, transformed_data):
+        """Tests that small inputs give exact quantiles and distinct counts."""
+        sketches = DataAnalyzer(sketches=True).analyze_data(transformed_data)["sketches"]
+        totals = sorted(record["total"] for record in transformed_data)
+        assert sketches["order_value"]["p50"] == totals[2]
+        assert sketches["order_value"]["p99"] == totals[-1]
+        assert sketches["distinct_items"] == len({record["item"] for record in transformed_data})
+        assert sketches["distinct_order_ids"] == len(transformed_data)
+        assert "sketches" not in DataAnalyzer().analyze_data(transformed_data)
+
+    def test_merge_and_save(self, transformed_data, tmp_path):
+        expected = DataAnalyzer(sketches=True).analyze_data(transformed_data)
+        left, right = AnalysisAccumulator(sketches=True), AnalysisAccumulator(sketches=True)
+        left.update(transformed_data[:3])
+        right.update(transformed_data[3:])
+        merged = AnalysisAccumulator().merge(left).merge(right)
+        assert merged.result()["sketches"] == expected["sketches"]
+
+        state_file = tmp_path / "state.json"
+        merged.save(str(state_file))
+        assert AnalysisAccumulator.load(str(state_file)).result() == merged.result()
+
+    def test_columnar_paths_match(self, timed_data, tmp_path):
+        """Tests that the sketches of records and of a columnar cache match the record loop."""
+        analyzer = DataAnalyzer(sketches=True, quantile_k=16, distinct_precision=8)
+        # Enough records to compact the quantile sketch and fill the counters.
+        data = [dict(timed_data[i % len(timed_data)], order_id=f"ORD{i}") for i in range(400)]
+        expected = analyzer.analyze_data(data)
+        cache = tmp_path / "orders.cols"
+        with ColumnarWriter(str(cache)) as writer:
+            writer.write_many(data)
+            writer.close({})
+
+        assert analyzer.analyze_columnar(data) == expected
+        assert analyzer.analyze_columnar(ColumnarOrders(str(cache))) == expected
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from order_pipeline.async_pipeline import AsyncOrderPipeline
+from order_pipeline.parallel import ProcessStageRunner
+from order_pipeline.pipeline import OrderPipeline
+
+@pytest.fixture
+def lines_file(tmp_path):
+    """Creates a JSON Lines file of valid orders, with one bad line and one invalid order."""
+    lines = [
+        json.dumps({
+            "order_id": f"ORD{i:03d}", "timestamp": "2025-10-19T08:00:00Z", "item": "Mouse",
+            "quantity": i % 3 + 1, "price": "$15.99", "total": "$15.99", "payment_status": "paid"
+        })
+        for i in range(40)
+    ]
+    lines[5] = '{"order_id": "BAD"'
+    lines[9] = json.dumps({"order_id": "ORD009", "item": "Mouse"})
+    path = tmp_path / "orders.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+class TestAsyncOrderPipeline:
+
+    @pytest.mark.parametrize("options", [{}, {"workers": 2}, {"fused": True}])
+    @pytest.mark.parametrize("output_name", ["output.json", "output.jsonl"])
+    def test_matches_streaming_pipeline(self, lines_file, tmp_path, options, output_name):
+        """Tests that the async runner writes the same output as the streaming pipeline."""
+        expected_file = tmp_path / ("expected_" + output_name)
+        expected = OrderPipeline(streaming=True, chunk_size=7, **options).run(str(lines_file), str(expected_file))
+
+        output_file = tmp_path / output_name
+        pipeline = OrderPipeline(streaming=True, chunk_size=7, **options)
+        summary = asyncio.run(AsyncOrderPipeline(pipeline, queue_size=2).run(str(lines_file), str(output_file)))
+
+        assert output_file.read_bytes() == expected_file.read_bytes()
+        assert summary["analysis"] == expected["analysis"]
+        assert summary["rejections"] == expected["rejections"] == {"malformed_line": 1, "missing_timestamp": 1}
+
+    def test_slow_writer_backpressures_reader(self, lines_file, tmp_path, monkeypatch):
+        """Tests that reading never runs more than the queues ahead of a slow writer."""
+        events = []
+        iter_chunks = AsyncOrderPipeline._iter_chunks
+        write_chunk = AsyncOrderPipeline._write_chunk
+
+        def recording_iter_chunks(self, reader, filepaths):
+            for chunk in iter_chunks(self, reader, filepaths):
+                events.append("read")
+                yield chunk
+
+        def slow_write_chunk(writer, accumulator, chunk):
+            time.sleep(0.005)
+            events.append("write")
+            write_chunk(writer, accumulator, chunk)
+
+        monkeypatch.setattr(AsyncOrderPipeline, "_iter_chunks", recording_iter_chunks)
+        monkeypatch.setattr(AsyncOrderPipeline, "_write_chunk", staticmethod(slow_write_chunk))
+        runner = AsyncOrderPipeline(OrderPipeline(streaming=True, chunk_size=1), queue_size=1)
+        summary = asyncio.run(runner.run(str(lines_file), str(tmp_path / "output.jsonl")))
+
+        assert summary["analysis"]["total_orders"] == 38
+        ahead = [events[:i].count("read") - events[:i].count("write") for i in range(len(events))]
+        # One chunk in each queue and one held by each of the three tasks,
+        # plus the invalid order, which is never written.
+        assert max(ahead) <= 6
+        assert events.index("write") < events.count("read") - 10
+
+    def test_workers_start_and_stop_off_the_event_loop(self, lines_file, tmp_path, monkeypatch):
+        """Tests that the process pool is created and shut down on the executor, not the loop thread."""
+        threads = []
+        start, stop = ProcessStageRunner.__enter__, ProcessStageRunner.__exit__
+
+        def recording_enter(self):
+            threads.append(threading.current_thread())
+            return start(self)
+
+        def recording_exit(self, *exc_info):
+            threads.append(threading.current_thread())
+            return stop(self, *exc_info)
+
+        monkeypatch.setattr(ProcessStageRunner, "__enter__", recording_enter)
+        monkeypatch.setattr(ProcessStageRunner, "__exit__", recording_exit)
+        pipeline = OrderPipeline(streaming=True, chunk_size=7, workers=2)
+        summary = asyncio.run(AsyncOrderPipeline(pipeline).run(str(lines_file), str(tmp_path / "output.jsonl")))
+
+        assert summary["analysis"]["total_orders"] == 38
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+    def test_directory_input(self, lines_file, tmp_path):
+        """Tests that every file in a directory is read."""
+        summary = asyncio.run(AsyncOrderPipeline().run(str(tmp_path), str(tmp_path / "output.json")))
+        assert summary["analysis"]["total_orders"] == 38
+
+    def test_failure_returns_none(self, tmp_path, caplog):
+        """Tests that a failing run is logged and returns None like OrderPipeline.run."""
+        summary = asyncio.run(AsyncOrderPipeline().run(str(tmp_path / "missing.json"), str(tmp_path / "out.json")))
+        assert summary is None
+        assert "Pipeline failed" in caplog.text
+        assert not (tmp_path / "out.json").exists()
+
+    def test_unwritable_quarantine_file(self, lines_file, tmp_path, caplog):
+        """Tests that a quarantine file that cannot be written fails the run instead of raising."""
+        pipeline = OrderPipeline(streaming=True, quarantine_filepath=str(tmp_path / "missing" / "rejected.jsonl"))
+        summary = asyncio.run(AsyncOrderPipeline(pipeline).run(str(lines_file), str(tmp_path / "out.jsonl")))
+        assert summary is None
+        assert "Pipeline failed" in caplog.text
+
+    def test_unsupported_options(self):
+        with pytest.raises(ValueError, match="does not support"):
+            AsyncOrderPipeline(OrderPipeline(dedup_policy="first"))
+        with pytest.raises(ValueError, match="does not support"):
+            AsyncOrderPipeline(OrderPipeline(rollup_filepath="rollups.db"))
+        with pytest.raises(ValueError, match="queue_size"):
+            AsyncOrderPipeline(queue_size=0)
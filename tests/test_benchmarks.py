@@ -0,0 +1,74 @@
+import json
+import logging
+from benchmarks.generator import generate_orders, write_orders
+from benchmarks.record_memory import bytes_per_record
+from benchmarks.run_benchmarks import benchmark_size, compare_to_baseline, main
+from benchmarks.validation_speed import compare
+from order_pipeline.validator import DataValidator
+
+class TestBenchmarks:
+
+    def test_generator_is_deterministic(self):
+        """Tests that a seed always produces the same records."""
+        assert list(generate_orders(200, seed=7)) == list(generate_orders(200, seed=7))
+        assert list(generate_orders(200, seed=7)) != list(generate_orders(200, seed=8))
+
+    def test_generator_dirtiness(self, caplog):
+        """Tests that roughly the requested share of records is rejected."""
+        caplog.set_level(logging.ERROR)
+        records = list(generate_orders(2000, seed=1, dirty_fraction=0.3))
+        valid = DataValidator().validate_data(records)
+
+        assert 0.6 < len(valid) / len(records) < 0.85
+        assert len(records) == 2000
+
+    def test_write_orders(self, tmp_path):
+        """Tests that the written file is a JSON array of the generated records."""
+        output_file = tmp_path / "orders.json"
+        write_orders(str(output_file), 50, seed=3)
+
+        with open(output_file, 'r') as f:
+            assert json.load(f) == list(generate_orders(50, seed=3))
+
+    def test_benchmark_size(self, tmp_path, caplog):
+        """Tests that every stage and the full pipeline are timed."""
+        caplog.set_level(logging.ERROR)
+        results = benchmark_size(100, str(tmp_path))
+
+        assert set(results) == {"reader", "validator", "transformer", "analyzer", "exporter", "pipeline"}
+        assert results["reader"]["records"] == 100
+        assert all(entry["seconds"] >= 0 for entry in results.values())
+
+    def test_record_memory(self):
+        """Tests that compact records are measured smaller than dicts."""
+        results = bytes_per_record(500)
+        assert 0 < results["compact"] < results["dict"]
+
+    def test_validation_speed(self):
+        """Tests that both validation paths are timed on records they agree on."""
+        results = compare(500, repeat=1)
+        assert set(results) == {"original", "compiled", "speedup"}
+        assert results["original"] > 0 and results["compiled"] > 0
+
+    def test_compare_to_baseline(self):
+        """Tests that only slowdowns beyond the threshold are flagged."""
+        baseline = {"results": {"100": {"reader": {"seconds": 1.0}, "validator": {"seconds": 1.0}}}}
+        report = {"results": {"100": {"reader": {"seconds": 1.1}, "validator": {"seconds": 1.5},
+                                      "pipeline": {"seconds": 9.0}}}}
+
+        regressions = compare_to_baseline(report, baseline, threshold=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("validator @ 100 records")
+
+    def test_main_exit_status(self, tmp_path, caplog):
+        """Tests that a regression against the baseline makes main return 1."""
+        output_file = tmp_path / "results.json"
+        baseline_file = tmp_path / "baseline.json"
+        baseline_file.write_text(json.dumps(
+            {"results": {"50": {"pipeline": {"seconds": 1e-9}}}}
+        ))
+
+        status = main(["--sizes", "50", "--output", str(output_file), "--baseline", str(baseline_file)])
+
+        assert status == 1
+        assert "50" in json.loads(output_file.read_text())["results"]
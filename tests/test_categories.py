@@ -0,0 +1,34 @@
+from order_pipeline.categories import CategoryDictionary
+
+class TestCategoryDictionary:
+
+    def test_codes_in_order_of_first_appearance(self):
+        dictionary = CategoryDictionary(str.lower, ["paid"])
+        assert [dictionary.encode(raw) for raw in ["PENDING", "Paid", "pending", "refunded"]] == [1, 0, 1, 2]
+        assert dictionary.values == ["paid", "pending", "refunded"]
+        assert dictionary.decode(2) == "refunded" and len(dictionary) == 3
+
+    def test_values_are_shared(self):
+        """Tests that equal values normalized from different raw strings are one object."""
+        dictionary = CategoryDictionary(str.strip)
+        first = dictionary.canonical(" Mouse")
+        second = dictionary.canonical("".join(["Mou", "se "]))
+        assert first is second
+
+    def test_raw_values_are_memoized(self):
+        """Tests that each raw value is normalized once, up to memo_size values."""
+        calls = []
+
+        def normalize(raw):
+            calls.append(raw)
+            return str(raw).strip()
+
+        dictionary = CategoryDictionary(normalize, memo_size=2)
+        for raw in ["a ", "a ", " a", " a", "b", "b"]:
+            dictionary.encode(raw)
+        assert calls == ["a ", " a", "b", "b"]
+        assert dictionary.values == ["a", "b"]
+
+    def test_unhashable_raw_values(self):
+        dictionary = CategoryDictionary(lambda raw: "")
+        assert dictionary.encode(["not", "hashable"]) == dictionary.encode({}) == 0
@@ -0,0 +1,123 @@
+import json
+import os
+import pytest
+from order_pipeline.analyzer import DataAnalyzer
+from order_pipeline.columnar import ColumnarOrders, ColumnarWriter, decode_timestamp, encode_timestamp
+from order_pipeline.records import OrderRecord
+from order_pipeline.transformer import DataTransformer
+
+@pytest.fixture
+def cleaned_records():
+    """Provides transformed records covering every timestamp shape."""
+    return [
+        OrderRecord("ORD001", "2025-10-19T08:00:00+00:00", "Wireless mouse", 2.0, 15.99, 31.98, "paid"),
+        {
+            "order_id": "ORD002", "timestamp": "2025-10-19T08:05:00", "item": "Laptop sleeve",
+            "quantity": 1.0, "price": 12.5, "total": 12.5, "payment_status": "pending"
+        },
+        OrderRecord("ORD003", "", "Wireless mouse", 1.0, 16.0, 16.0, "refunded"),
+        OrderRecord("ORDÉ04", "2025-10-19T09:30:00.250000-05:30", "Câble", 3.0, 0.1, 0.3, "paid"),
+    ]
+
+class TestTimestampEncoding:
+
+    @pytest.mark.parametrize("value", [
+        "2025-10-19T08:00:00+00:00", "2025-10-19T08:05:00", "1969-12-31T23:59:59.999999",
+        "2025-10-19T09:30:00.250000-05:30", "2025-03-01T00:00:00+14:00", ""
+    ])
+    def test_round_trip(self, value):
+        """Tests that decoding gives back the transformer's ISO string."""
+        assert decode_timestamp(*encode_timestamp(value)) == value
+
+    def test_epoch_is_utc(self):
+        """Tests that aware timestamps are stored as UTC epoch microseconds."""
+        assert encode_timestamp("1970-01-01T01:00:00+01:00") == (0, 3600)
+
+    def test_rejects_non_iso(self):
+        """Tests that a timestamp the transformer would not produce is refused."""
+        with pytest.raises(ValueError, match="not an ISO timestamp"):
+            encode_timestamp("19/10/2025 08:10 AM")
+
+class TestColumnarCache:
+
+    def _write(self, records, dirpath, batch_size=2):
+        with ColumnarWriter(str(dirpath), batch_size=batch_size) as writer:
+            writer.write_many(records)
+            writer.close({"total_orders": len(records)})
+
+    def test_round_trip(self, cleaned_records, tmp_path):
+        """Tests that every record is rebuilt exactly."""
+        cache = tmp_path / "orders.cols"
+        self._write(cleaned_records, cache)
+
+        orders = ColumnarOrders(str(cache))
+        assert len(orders) == 4
+        assert [record.to_dict() for record in orders] == [dict(record) for record in cleaned_records]
+        assert orders.record(3).order_id == "ORDÉ04"
+        assert orders.item_dictionary == ["Wireless mouse", "Laptop sleeve", "Câble"]
+        assert orders.analysis_summary == {"total_orders": 4}
+
+    def test_columns_are_typed_and_memory_mapped(self, cleaned_records, tmp_path):
+        """Tests the on-disk layout of the numeric and encoded columns."""
+        cache = tmp_path / "orders.cols"
+        self._write(cleaned_records, cache)
+
+        orders = ColumnarOrders(str(cache))
+        assert orders.columns["total"].dtype.str == "<f8"
+        assert orders.columns["timestamp"].dtype.str == "<i8"
+        assert list(orders.columns["payment_status"]) == [0, 1, 2, 0]
+        assert orders.columns["total"].filename == os.path.realpath(cache / "total.bin")
+        assert (cache / "total.bin").stat().st_size == 4 * 8
+
+    def test_analyze_without_records(self, cleaned_records, tmp_path):
+        """Tests that the analyzer works on the loaded columns."""
+        cache = tmp_path / "orders.cols"
+        self._write(cleaned_records, cache)
+
+        analyzer = DataAnalyzer()
+        assert analyzer.analyze_columnar(ColumnarOrders(str(cache))) == analyzer.analyze_data(cleaned_records)
+
+    def test_empty_cache(self, tmp_path):
+        """Tests that a cache without records loads and analyzes."""
+        cache = tmp_path / "empty.cols"
+        self._write([], cache)
+
+        orders = ColumnarOrders(str(cache))
+        assert len(orders) == 0 and list(orders) == []
+        assert DataAnalyzer().analyze_columnar(orders)["total_orders"] == 0
+
+    def test_incomplete_cache(self, cleaned_records, tmp_path):
+        """Tests that a cache whose header was never written is not loaded."""
+        cache = tmp_path / "orders.cols"
+        self._write(cleaned_records, cache)
+        with ColumnarWriter(str(cache)) as writer:
+            writer.write(cleaned_records[0])
+
+        with pytest.raises(FileNotFoundError, match="Columnar cache not found"):
+            ColumnarOrders(str(cache))
+
+    def test_unsupported_version(self, cleaned_records, tmp_path):
+        """Tests that a header from another format version is refused."""
+        cache = tmp_path / "orders.cols"
+        self._write(cleaned_records, cache)
+        header = json.loads((cache / "header.json").read_text())
+        header["version"] = 99
+        (cache / "header.json").write_text(json.dumps(header))
+
+        with pytest.raises(ValueError, match="Unsupported columnar cache format"):
+            ColumnarOrders(str(cache))
+
+    def test_shared_dictionaries(self, cleaned_records, tmp_path):
+        """Tests that a writer given the transformer's dictionaries stores its codes."""
+        transformer = DataTransformer()
+        transformer.items.add("Phone case")
+        cache = tmp_path / "orders.cols"
+        with ColumnarWriter(str(cache), items=transformer.items, statuses=transformer.statuses) as writer:
+            writer.write_many(cleaned_records)
+            writer.close({})
+
+        orders = ColumnarOrders(str(cache))
+        assert orders.item_dictionary == transformer.items.values
+        assert orders.status_dictionary == ["paid", "pending", "refunded"]
+        assert orders.columns['item'].tolist() == [transformer.items.codes[r['item']] for r in cleaned_records]
+        assert [record.to_dict() for record in orders] == [dict(record) for record in cleaned_records]
@@ -0,0 +1,93 @@
+import pytest
+from order_pipeline.deduplicator import BloomFilter, DataDeduplicator, OrderIdIndex
+from order_pipeline.records import OrderRecord
+
+def make_records(order_ids):
+    """Builds transformed records whose price is their position in the input."""
+    return [{"order_id": order_id, "price": float(i)} for i, order_id in enumerate(order_ids)]
+
+@pytest.fixture
+def records():
+    return make_records(["A", "B", "A", "C", "B", "A", "D"])
+
+class TestDataDeduplicator:
+
+    @pytest.mark.parametrize("policy, expected_prices", [
+        ("first", [0.0, 1.0, 3.0, 6.0]),
+        ("last", [3.0, 4.0, 5.0, 6.0]),
+        ("reject", [3.0, 6.0]),
+    ])
+    def test_policies(self, records, policy, expected_prices):
+        """Tests which occurrence each policy keeps, in input order."""
+        deduplicator = DataDeduplicator(policy)
+        kept = deduplicator.deduplicate(records)
+
+        assert [record["price"] for record in kept] == expected_prices
+        assert deduplicator.summary() == {
+            "policy": policy, "duplicate_order_ids": 2, "records_dropped": len(records) - len(expected_prices)
+        }
+        assert deduplicator.rejections.summary() == {"duplicate_order_id": len(records) - len(expected_prices)}
+
+    @pytest.mark.parametrize("policy", ["first", "last", "reject"])
+    def test_streamed_chunks_match_batch(self, records, policy):
+        """Tests that chunked deduplication keeps the same records as a single list."""
+        expected = DataDeduplicator(policy).deduplicate(records)
+        chunks = [records[i:i + 2] for i in range(0, len(records), 2)]
+
+        streamed = [record for chunk in DataDeduplicator(policy).iter_deduplicated(chunks) for record in chunk]
+        assert streamed == expected
+
+    @pytest.mark.parametrize("policy", ["first", "last", "reject"])
+    def test_spilled_index_matches_memory(self, policy, tmp_path):
+        """Tests that an index moved to disk gives the same result as one in memory."""
+        order_ids = [f"ORD{i % 37}" for i in range(200)] + [f"NEW{i}" for i in range(50)]
+        records = make_records(order_ids)
+        chunks = [records[i:i + 16] for i in range(0, len(records), 16)]
+        expected = DataDeduplicator(policy).deduplicate(records)
+
+        deduplicator = DataDeduplicator(policy, max_memory_ids=10, spill_dir=str(tmp_path))
+        streamed = [record for chunk in deduplicator.iter_deduplicated(chunks) for record in chunk]
+
+        assert streamed == expected
+        assert deduplicator.index_spilled
+        assert list(tmp_path.iterdir()) == []
+
+    def test_compact_records_are_quarantined_as_dicts(self):
+        """Tests that dropped OrderRecords reach the rejection tracker as plain dicts."""
+        deduplicator = DataDeduplicator()
+        record = OrderRecord("A", "", "Mouse", 1.0, 2.0, 2.0, "paid")
+        rejected = []
+        deduplicator.rejections.reject = lambda record, *args: rejected.append(record)
+
+        assert deduplicator.deduplicate([record, record]) == [record]
+        assert rejected == [record.to_dict()]
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="Unknown dedup policy"):
+            DataDeduplicator("newest")
+
+class TestOrderIdIndex:
+
+    def test_counts_and_last_ordinal_survive_spill(self, tmp_path):
+        """Tests that occurrence counts carry over when the index moves to disk."""
+        index = OrderIdIndex(max_memory_ids=2, spill_dir=str(tmp_path))
+        assert index.add(["A", "B", "A"], range(3)) == [1, 1, 2]
+        assert not index.spilled
+        assert index.add(["C", "A"], range(3, 5)) == [1, 3]
+        assert index.spilled
+        assert index.add(["C", "D", "D"], range(5, 8)) == [2, 1, 2]
+        assert index.lookup(["A", "B", "C", "D"]) == [(3, 4), (1, 1), (2, 5), (2, 7)]
+
+        index.close()
+        assert list(tmp_path.iterdir()) == []
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        keys = [f"ORD{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        assert all(key in bloom for key in keys)
+        false_positives = sum(f"NEW{i}" in bloom for i in range(10000))
+        assert false_positives < 500
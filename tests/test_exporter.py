@@ -1,6 +1,9 @@
 import pytest
 import json
 from order_pipeline.exporter import DataExporter
+from order_pipeline.compression import open_file
+from order_pipeline.reader import DataReader
+from order_pipeline.records import OrderRecord
 
 @pytest.fixture
 def exporter():
@@ -75,3 +78,145 @@ class TestDataExporter:
         with pytest.raises(TypeError, match="Object of type bytes is not JSON serializable"):
             exporter.export_data(cleaned_data, analysis, str(output_file))
 
+
+    def test_export_stream(self, exporter, sample_data_to_export, tmp_path):
+        """Tests that a streamed export has the same layout as export_data."""
+        cleaned_data, analysis = sample_data_to_export
+        output_file = tmp_path / "stream.json"
+
+        exporter.export_stream(iter(cleaned_data), lambda: analysis, str(output_file))
+
+        expected = json.dumps({"cleaned_data": cleaned_data, "analysis_summary": analysis}, indent=4)
+        assert output_file.read_text() == expected
+
+    def test_export_stream_calls_analysis_after_records(self, exporter, tmp_path):
+        """Tests that the summary is computed only once every record is written."""
+        seen = []
+
+        def records():
+            for i in range(3):
+                seen.append(i)
+                yield {"order_id": f"ORD{i}"}
+
+        output_file = tmp_path / "stream.json"
+        exporter.export_stream(records(), lambda: {"total_orders": len(seen)}, str(output_file))
+
+        with open(output_file, 'r') as f:
+            content = json.load(f)
+        assert content["analysis_summary"]["total_orders"] == 3
+        assert len(content["cleaned_data"]) == 3
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 1000])
+    def test_export_stream_compact(self, sample_data_to_export, tmp_path, batch_size):
+        """Tests the compact layout across different write batch sizes."""
+        cleaned_data, analysis = sample_data_to_export
+        cleaned_data = cleaned_data * 3
+        output_file = tmp_path / "compact.json"
+
+        DataExporter(compact=True, batch_size=batch_size).export_stream(
+            iter(cleaned_data), lambda: analysis, str(output_file)
+        )
+
+        expected = json.dumps(
+            {"cleaned_data": cleaned_data, "analysis_summary": analysis}, separators=(',', ':')
+        )
+        assert output_file.read_text() == expected
+
+    def test_export_stream_empty(self, exporter, sample_data_to_export, tmp_path):
+        """Tests that an empty stream still produces a valid document."""
+        _, analysis = sample_data_to_export
+        output_file = tmp_path / "empty.json"
+
+        exporter.export_stream(iter([]), lambda: analysis, str(output_file))
+
+        with open(output_file, 'r') as f:
+            content = json.load(f)
+        assert content == {"cleaned_data": [], "analysis_summary": analysis}
+
+    def test_export_data_compact(self, sample_data_to_export, tmp_path):
+        """Tests that the compact layout is smaller and loads to the same content."""
+        cleaned_data, analysis = sample_data_to_export
+        indented_file = tmp_path / "indented.json"
+        compact_file = tmp_path / "compact.json"
+
+        DataExporter().export_data(cleaned_data, analysis, str(indented_file))
+        DataExporter(compact=True).export_data(cleaned_data, analysis, str(compact_file))
+
+        assert compact_file.stat().st_size < indented_file.stat().st_size
+        with open(indented_file, 'r') as f, open(compact_file, 'r') as g:
+            assert json.load(f) == json.load(g)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_export_json_lines(self, sample_data_to_export, tmp_path, compact):
+        """Tests that JSON Lines output has one record per line and a summary sidecar."""
+        cleaned_data, analysis = sample_data_to_export
+        records = cleaned_data * 3
+        output_file = tmp_path / "output.jsonl"
+
+        DataExporter(compact=compact, batch_size=2).export_data(records, analysis, str(output_file))
+
+        lines = output_file.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == records
+        with open(tmp_path / "output.summary.json", 'r') as f:
+            assert json.load(f) == {"analysis_summary": analysis}
+
+    def test_export_stream_json_lines(self, exporter, sample_data_to_export, tmp_path):
+        """Tests that streamed records can be written as NDJSON."""
+        cleaned_data, analysis = sample_data_to_export
+        output_file = tmp_path / "output.ndjson"
+
+        exporter.export_stream(iter(cleaned_data), lambda: analysis, str(output_file))
+
+        assert output_file.read_text() == json.dumps(cleaned_data[0]) + "\n"
+        assert (tmp_path / "output.summary.json").exists()
+
+    @pytest.mark.parametrize("suffix", [".json.gz", ".json.bz2", ".json.xz", ".jsonl.gz"])
+    def test_export_compressed(self, sample_data_to_export, tmp_path, suffix):
+        """Tests that the output is compressed according to its suffix."""
+        cleaned_data, analysis = sample_data_to_export
+        output_file = str(tmp_path / ("output" + suffix))
+
+        DataExporter(compression_level=1).export_data(cleaned_data * 50, analysis, output_file)
+
+        if ".jsonl" in suffix:
+            assert DataReader().read_json_data(output_file) == cleaned_data * 50
+            assert (tmp_path / "output.summary.json").exists()
+        else:
+            with open_file(output_file) as f:
+                assert json.load(f) == {"analysis_summary": analysis, "cleaned_data": cleaned_data * 50}
+            assert (tmp_path / ("output" + suffix)).stat().st_size < len(json.dumps(cleaned_data * 50))
+
+    def test_compression_level(self, sample_data_to_export, tmp_path):
+        """Tests that a higher compression level gives a smaller file."""
+        cleaned_data, analysis = sample_data_to_export
+        records = [dict(cleaned_data[0], order_id=f"ORD{i}") for i in range(2000)]
+        fast_file = tmp_path / "fast.json.gz"
+        small_file = tmp_path / "small.json.gz"
+
+        DataExporter(compression_level=1).export_stream(iter(records), lambda: analysis, str(fast_file))
+        DataExporter(compression_level=9).export_stream(iter(records), lambda: analysis, str(small_file))
+
+        assert small_file.stat().st_size < fast_file.stat().st_size
+
+    @pytest.mark.parametrize("filename", ["output.json", "output.jsonl"])
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_export_order_records(self, sample_data_to_export, tmp_path, filename, compact):
+        """Tests that OrderRecords are written exactly like the equivalent dicts."""
+        _, analysis = sample_data_to_export
+        dicts = [{
+            "order_id": "ORD100", "timestamp": "2025-10-19T08:00:00", "item": "Laptop",
+            "quantity": 1.0, "price": 1200.0, "total": 1200.0, "payment_status": "paid"
+        }]
+        records = [OrderRecord(**dicts[0])]
+        exporter = DataExporter(compact=compact)
+        (tmp_path / "dicts").mkdir()
+        (tmp_path / "records").mkdir()
+
+        exporter.export_data(dicts, analysis, str(tmp_path / "dicts" / filename))
+        exporter.export_data(records, analysis, str(tmp_path / "records" / filename))
+        exporter.export_stream(iter(records), lambda: analysis, str(tmp_path / ("stream_" + filename)))
+
+        expected = (tmp_path / "dicts" / filename).read_bytes()
+        assert (tmp_path / "records" / filename).read_bytes() == expected
+        if filename.endswith(".jsonl"):
+            assert (tmp_path / ("stream_" + filename)).read_bytes() == expected
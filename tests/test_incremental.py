@@ -0,0 +1,89 @@
+import json
+import pytest
+from order_pipeline.incremental import IncrementalState
+
+@pytest.fixture
+def lines_file(tmp_path):
+    """Creates a small append-only file."""
+    path = tmp_path / "orders.jsonl"
+    path.write_text('{"order_id": "A"}\n{"order_id": "B"}\n')
+    return path
+
+class TestIncrementalState:
+
+    def test_fresh_state_when_file_missing(self, tmp_path):
+        """Tests that the first run starts from an empty state."""
+        state = IncrementalState.load(str(tmp_path / "state.json"))
+        assert state.accumulator.total_orders == 0
+        assert state.byte_offsets == {} and not state.seen_order_ids
+
+    def test_byte_offset_round_trip(self, lines_file, tmp_path):
+        """Tests that an offset is restored after a save and load."""
+        state_file = tmp_path / "state.json"
+        state = IncrementalState()
+        state.advance_offset(str(lines_file), 18)
+        state.save(str(state_file))
+
+        with open(lines_file, 'a') as f:
+            f.write('{"order_id": "C"}\n')
+        assert IncrementalState.load(str(state_file)).start_offset(str(lines_file)) == 18
+
+    def test_replaced_file_is_read_from_start(self, lines_file, caplog):
+        """Tests that a file whose processed part changed is read again."""
+        state = IncrementalState()
+        state.advance_offset(str(lines_file), 36)
+
+        lines_file.write_text('{"order_id": "X"}\n{"order_id": "Y"}\n')
+        assert state.start_offset(str(lines_file)) == 0
+        lines_file.write_text('{"order_id": "A"}\n')
+        assert state.start_offset(str(lines_file)) == 0
+        assert "truncated or replaced" in caplog.text
+
+    def test_filter_new_skips_earlier_runs_only(self, tmp_path):
+        """Tests that order_ids accepted in earlier runs are skipped and only accepted ones remembered."""
+        state_file = tmp_path / "state.json"
+        state = IncrementalState()
+        state.seen_order_ids = dict.fromkeys(["A"])
+
+        records = [{"order_id": "A"}, {"order_id": " B "}, {"order_id": "B"}, {"order_id": "C"}, {"item": "no id"}]
+        assert state.filter_new(records) == records[1:]
+        # C was rejected, so a corrected copy must get through next time.
+        state.mark_seen(records[1:3])
+        state.save(str(state_file))
+
+        assert list(IncrementalState.load(str(state_file)).seen_order_ids) == ["A", "B"]
+
+    def test_seen_order_ids_are_bounded(self, tmp_path):
+        """Tests that only the most recently accepted order_ids are kept."""
+        state_file = tmp_path / "state.json"
+        state = IncrementalState(max_seen_ids=3)
+        state.seen_order_ids = dict.fromkeys(["A", "B", "C"])
+        state.mark_seen([{"order_id": "D"}, {"order_id": "B"}])
+        state.save(str(state_file))
+
+        assert list(IncrementalState.load(str(state_file), max_seen_ids=3).seen_order_ids) == ["C", "D", "B"]
+
+    def test_rejected_records_are_skipped_until_corrected(self, tmp_path):
+        """Tests that unchanged rejected records are skipped while corrected resends are kept."""
+        state_file = tmp_path / "state.json"
+        bad, no_id = {"order_id": "A", "item": ""}, {"item": "Mouse"}
+        state = IncrementalState()
+        state.mark_seen([{"order_id": "B"}])
+        state.mark_rejected([bad, no_id, {"order_id": "B", "item": ""}, "malformed line"])
+        state.save(str(state_file))
+
+        state = IncrementalState.load(str(state_file))
+        fixed = {"order_id": "A", "item": "Mouse"}
+        assert state.filter_new([bad, fixed, no_id, {"item": "Cable"}, {"order_id": "B"}]) == [fixed, {"item": "Cable"}]
+        assert len(state.rejected_records) == 2
+
+    def test_invalid_state(self, tmp_path):
+        """Tests that a corrupt or foreign state file is rejected."""
+        state_file = tmp_path / "state.json"
+        state_file.write_text(json.dumps({"version": 99}))
+        with pytest.raises(ValueError, match="Invalid incremental state"):
+            IncrementalState.load(str(state_file))
+
+        state_file.write_text("{not json")
+        with pytest.raises(ValueError, match="Failed to decode JSON"):
+            IncrementalState.load(str(state_file))
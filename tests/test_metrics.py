@@ -0,0 +1,100 @@
+import json
+from order_pipeline.metrics import PipelineMetrics, ProfilerHook, StageHook
+
+class RecordingHook(StageHook):
+    """Remembers the order of hook calls."""
+
+    def __init__(self):
+        self.events = []
+
+    def before_stage(self, stage):
+        self.events.append(("before", stage))
+
+    def after_stage(self, stage, metrics):
+        self.events.append(("after", stage, metrics.calls))
+
+class TestPipelineMetrics:
+
+    def test_stage_totals_accumulate(self):
+        """Tests that repeated calls of a stage are summed."""
+        metrics = PipelineMetrics()
+        for size in (3, 5):
+            with metrics.stage("validate", size) as call:
+                call.records_out = size - 1
+
+        stage = metrics.stages["validate"]
+        assert stage.calls == 2
+        assert stage.records_in == 8
+        assert stage.records_out == 6
+        assert stage.wall_time > 0
+        assert stage.peak_memory is None
+
+    def test_nested_stage_time_is_exclusive(self):
+        """Tests that a nested call is not charged to the enclosing stage."""
+        metrics = PipelineMetrics()
+        with metrics.stage("export"):
+            with metrics.stage("read"):
+                sum(range(200000))
+
+        assert metrics.stages["read"].wall_time > metrics.stages["export"].wall_time
+
+    def test_timed_chunks(self):
+        """Tests that each chunk fetch is timed and counted."""
+        metrics = PipelineMetrics()
+        chunks = list(metrics.timed_chunks("read", iter([[1, 2], [3]])))
+
+        assert chunks == [[1, 2], [3]]
+        assert metrics.stages["read"].records_out == 3
+        assert metrics.stages["read"].calls == 3
+
+    def test_track_memory(self):
+        """Tests that peak traced memory is recorded when requested."""
+        metrics = PipelineMetrics(track_memory=True)
+        metrics.start()
+        with metrics.stage("transform"):
+            data = [str(i) for i in range(10000)]
+        metrics.stop()
+
+        assert len(data) == 10000
+        assert metrics.stages["transform"].peak_memory > 0
+
+    def test_hooks_and_save(self, tmp_path):
+        """Tests hook call order and the JSON metrics file."""
+        hook = RecordingHook()
+        metrics = PipelineMetrics(hooks=[hook])
+        metrics.start()
+        with metrics.stage("analyze", 4):
+            pass
+        metrics.stop()
+
+        assert hook.events == [("before", "analyze"), ("after", "analyze", 1)]
+
+        metrics_file = tmp_path / "metrics.json"
+        metrics.save(str(metrics_file))
+        saved = json.loads(metrics_file.read_text())
+        assert saved["stages"]["analyze"]["records_in"] == 4
+        assert set(saved["stages"]["analyze"]) == {
+            "calls", "wall_time", "cpu_time", "records_in", "records_out", "records_per_second", "peak_memory"
+        }
+
+    def test_profiler_hook_profiles_one_stage(self, tmp_path):
+        """Tests that the profiler only runs during the chosen stage."""
+        def in_transform():
+            return sum(range(1000))
+
+        def in_export():
+            return sum(range(1000))
+
+        profile_file = tmp_path / "transform.prof"
+        hook = ProfilerHook("transform", str(profile_file))
+        metrics = PipelineMetrics(hooks=[hook])
+        with metrics.stage("transform"):
+            in_transform()
+        with metrics.stage("export"):
+            in_export()
+        hook.save()
+
+        profiled = {function for _, _, function in hook.stats().stats}
+        assert "in_transform" in profiled
+        assert "in_export" not in profiled
+        assert profile_file.exists()
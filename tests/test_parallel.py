@@ -0,0 +1,67 @@
+import pytest
+from order_pipeline.parallel import ProcessStageRunner, run_chunked, split_chunks
+from order_pipeline.validator import DataValidator
+from order_pipeline.transformer import DataTransformer
+
+@pytest.fixture
+def records():
+    """Provides a mix of valid and invalid records spread over several chunks."""
+    base = [
+        {"order_id": "ORD001", "timestamp": "2025-10-19T08:00:00Z", "item": "Wireless Mouse",
+         "quantity": 2, "price": "$15.99", "total": "$31.98", "payment_status": "paid"},
+        {"order_id": "ORD002", "timestamp": "2025-10-19 08:05", "item": "Laptop Sleeve",
+         "quantity": "1", "price": "12.50", "total": "12.50", "payment_status": "PAID"},
+        {"order_id": "ORD003", "timestamp": "19/10/2025 08:10 AM", "item": "USB Cable",
+         "quantity": -3, "price": "5usd", "total": 15, "payment_status": "pending"},
+        {"order_id": "ORD010", "timestamp": "19/10/2025 08:45 AM", "item": "Mouse Pad",
+         "quantity": 5, "price": 3, "total": 15, "payment_status": "refunded"},
+    ]
+    return [dict(r, order_id=f"{r['order_id']}-{i}") for i in range(25) for r in base]
+
+class Doubler:
+    """A minimal stage used to check ordering."""
+
+    def double(self, chunk):
+        return [value * 2 for value in chunk]
+
+class TestParallel:
+
+    def test_split_chunks(self):
+        """Tests that chunks cover the sequence in order."""
+        assert list(split_chunks(list(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_run_chunked_keeps_order(self):
+        """Tests that results come back in submission order."""
+        data = list(range(1000))
+        assert run_chunked(Doubler(), 'double', data, workers=3, chunk_size=7) == [v * 2 for v in data]
+
+    def test_runner_rejects_bad_worker_count(self):
+        """Tests that the worker count must be positive."""
+        with pytest.raises(ValueError, match="workers must be a positive integer"):
+            ProcessStageRunner(Doubler(), 0)
+
+    def test_parallel_validation_matches_sequential(self, records, caplog):
+        """Tests that parallel validation returns the same list and forwards worker logs."""
+        validator = DataValidator()
+        sequential = validator.validate_data(records)
+        caplog.clear()
+
+        parallel = validator.validate_data(records, workers=2, chunk_size=10)
+
+        assert parallel == sequential
+        assert "Skipping record (order_id: ORD003-0)" in caplog.text
+        assert "Skipping record (order_id: ORD003-24)" in caplog.text
+
+    def test_parallel_transformation_matches_sequential(self, records):
+        """Tests that parallel transformation returns the same list and timestamp counters."""
+        valid = DataValidator().validate_data(records)
+        sequential_transformer = DataTransformer()
+        sequential = sequential_transformer.transform_data(valid)
+
+        parallel_transformer = DataTransformer()
+        parallel = parallel_transformer.transform_data(valid, workers=2, chunk_size=10)
+
+        assert parallel == sequential
+        assert parallel_transformer.timestamp_parser.stats["fast_path"] > 0
+        assert (parallel_transformer.timestamp_parser.stats["cache_misses"]
+                + parallel_transformer.timestamp_parser.stats["cache_hits"]) == len(valid)
@@ -1,7 +1,13 @@
 import pytest
+import gzip
 import json
+import lzma
 from pathlib import Path
 from order_pipeline.pipeline import OrderPipeline
+from order_pipeline.reader import DataReader
+from order_pipeline.analyzer import DataAnalyzer
+from order_pipeline.rollups import RollupStore
+from order_pipeline.schema import ORDER_SCHEMA, ValidationSchema
 
 # Fixture to create a sample raw JSON file for the integration test
 @pytest.fixture
@@ -177,3 +183,470 @@ class TestOrderPipelineIntegration:
         # No output file should be created
         assert not output_file.exists()
 
+
+    def test_streaming_run_matches_batch_run(self, raw_data_file, tmp_path):
+        """Tests that streaming mode produces the same document as batch mode."""
+        batch_file = tmp_path / "batch_output.json"
+        streaming_file = tmp_path / "streaming_output.json"
+
+        OrderPipeline().run(str(raw_data_file), str(batch_file))
+        OrderPipeline(streaming=True, chunk_size=3).run(str(raw_data_file), str(streaming_file))
+
+        with open(batch_file, 'r') as f:
+            batch_results = json.load(f)
+        with open(streaming_file, 'r') as f:
+            streaming_results = json.load(f)
+
+        assert streaming_results == batch_results
+
+    def test_streaming_run_with_no_valid_data(self, tmp_path, caplog):
+        """Tests that streaming mode stops before creating the output file."""
+        invalid_data = [
+            {"order_id": "ORD003", "quantity": -3, "price": "5usd", "total": 15, "payment_status": "pending", "item": "USB Cable", "timestamp": "..."},
+            {"order_id": "ORD009", "quantity": 1, "price": "$29.99", "payment_status": "PAID", "item": "Webcam", "timestamp": "..."}
+        ]
+        input_file = tmp_path / "invalid_input.json"
+        output_file = tmp_path / "invalid_output.json"
+
+        with open(input_file, 'w') as f:
+            json.dump(invalid_data, f)
+
+        pipeline = OrderPipeline(streaming=True, chunk_size=1)
+        pipeline.run(str(input_file), str(output_file))
+
+        assert not output_file.exists()
+        assert "No valid data found after validation" in caplog.text
+
+    @pytest.mark.parametrize("options", [
+        {"workers": 2, "parallel_chunk_size": 3},
+        {"streaming": True, "chunk_size": 3, "workers": 2},
+    ])
+    def test_parallel_run_is_byte_identical(self, raw_data_file, tmp_path, options):
+        """Tests that the process-pool paths write exactly the sequential output."""
+        sequential_file = tmp_path / "sequential.json"
+        parallel_file = tmp_path / "parallel.json"
+
+        sequential_options = {"streaming": options.get("streaming", False), "chunk_size": 3}
+        OrderPipeline(**sequential_options).run(str(raw_data_file), str(sequential_file))
+        OrderPipeline(**options).run(str(raw_data_file), str(parallel_file))
+
+        assert parallel_file.read_bytes() == sequential_file.read_bytes()
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_fused_run_is_byte_identical(self, raw_data_file, tmp_path, streaming):
+        """Tests that the fused validate+transform stage writes the same output."""
+        two_stage_file = tmp_path / "two_stage.json"
+        fused_file = tmp_path / "fused.json"
+
+        OrderPipeline(streaming=streaming).run(str(raw_data_file), str(two_stage_file))
+        OrderPipeline(streaming=streaming, fused=True).run(str(raw_data_file), str(fused_file))
+
+        assert fused_file.read_bytes() == two_stage_file.read_bytes()
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 2, "workers": 2}])
+    def test_quarantine_and_rejection_summary(self, raw_data_file, tmp_path, options):
+        """Tests that rejected records are quarantined and counted per reason."""
+        output_file = tmp_path / "output.json"
+        quarantine_file = tmp_path / "quarantine.jsonl"
+
+        pipeline = OrderPipeline(quarantine_filepath=str(quarantine_file), **options)
+        summary = pipeline.run(str(raw_data_file), str(output_file))
+
+        assert summary["analysis"]["total_orders"] == 5
+        assert summary["rejections"] == {"empty_item": 1, "invalid_quantity": 3, "missing_total": 1}
+
+        quarantined = [json.loads(line) for line in quarantine_file.read_text().splitlines()]
+        assert sorted(q["record"]["order_id"] for q in quarantined) == [
+            "ORD003", "ORD004", "ORD005", "ORD007", "ORD009"
+        ]
+        assert all(q["stage"] == "validation" for q in quarantined)
+
+        clean_file = tmp_path / "clean.json"
+        clean_file.write_text(json.dumps(json.loads(raw_data_file.read_text())[:2]))
+        summary = pipeline.run(str(clean_file), str(output_file))
+        assert summary["rejections"] == {}
+        assert not quarantine_file.exists()
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True}])
+    def test_unwritable_quarantine_file(self, raw_data_file, tmp_path, caplog, options):
+        """Tests that a quarantine file that cannot be written fails the run like other IO errors."""
+        pipeline = OrderPipeline(quarantine_filepath=str(tmp_path / "missing" / "quarantine.jsonl"), **options)
+        assert pipeline.run(str(raw_data_file), str(tmp_path / "output.json")) is None
+        assert "Pipeline failed" in caplog.text
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 3}, {"fused": True}])
+    def test_stage_metrics(self, raw_data_file, tmp_path, options):
+        """Tests that per-stage metrics are returned and written to a file."""
+        output_file = tmp_path / "output.json"
+        metrics_file = tmp_path / "metrics.json"
+
+        pipeline = OrderPipeline(metrics_filepath=str(metrics_file), track_memory=True, **options)
+        summary = pipeline.run(str(raw_data_file), str(output_file))
+
+        stages = summary["metrics"]["stages"]
+        assert stages["read"]["records_out"] == 10
+        processing = "validate_transform" if options.get("fused") else "validate"
+        assert stages[processing]["records_in"] == 10
+        assert stages["export"]["records_out"] == 5
+        assert all(stage["peak_memory"] > 0 for stage in stages.values())
+        assert json.loads(metrics_file.read_text()) == summary["metrics"]
+
+    def test_unwritable_metrics_file(self, raw_data_file, tmp_path, caplog):
+        """Tests that a metrics file that cannot be written fails the run instead of raising."""
+        pipeline = OrderPipeline(metrics_filepath=str(tmp_path / "missing" / "metrics.json"))
+        assert pipeline.run(str(raw_data_file), str(tmp_path / "output.json")) is None
+        assert "Pipeline failed" in caplog.text
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_json_lines_run(self, raw_data_file, tmp_path, streaming):
+        """Tests a JSON Lines run, including a malformed line, against the JSON run."""
+        records = json.loads(raw_data_file.read_text())
+        lines_file = tmp_path / "shoplink.jsonl"
+        lines = [json.dumps(record) for record in records]
+        lines.insert(3, '{"order_id": "BROKEN",')
+        lines_file.write_text("\n".join(lines) + "\n")
+
+        json_output = tmp_path / "output.json"
+        lines_output = tmp_path / "output.jsonl"
+        expected = OrderPipeline(streaming=streaming).run(str(raw_data_file), str(json_output))
+        summary = OrderPipeline(streaming=streaming, chunk_size=3).run(str(lines_file), str(lines_output))
+
+        assert summary["analysis"] == expected["analysis"]
+        assert summary["rejections"]["malformed_line"] == 1
+        with open(json_output, 'r') as f:
+            cleaned = json.load(f)["cleaned_data"]
+        assert [json.loads(line) for line in lines_output.read_text().splitlines()] == cleaned
+        with open(tmp_path / "output.summary.json", 'r') as f:
+            assert json.load(f)["analysis_summary"] == expected["analysis"]
+
+    def test_compressed_run(self, raw_data_file, tmp_path):
+        """Tests that a gzip input and xz output give the same result as plain files."""
+        compressed_input = tmp_path / "shoplink.json.gz"
+        compressed_input.write_bytes(gzip.compress(raw_data_file.read_bytes()))
+        plain_output = tmp_path / "output.json"
+        compressed_output = tmp_path / "output.json.xz"
+
+        expected = OrderPipeline(streaming=True).run(str(raw_data_file), str(plain_output))
+        summary = OrderPipeline(streaming=True, compression_level=1).run(str(compressed_input), str(compressed_output))
+
+        assert summary["analysis"] == expected["analysis"]
+        assert lzma.decompress(compressed_output.read_bytes()) == plain_output.read_bytes()
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_byte_range_parallel_run(self, raw_data_file, tmp_path, streaming):
+        """Tests that byte-range ingestion keeps file order and matches a sequential run."""
+        records = json.loads(raw_data_file.read_text())
+        lines = [json.dumps(record) for record in records]
+        lines.insert(5, "not json")
+        lines_file = tmp_path / "shoplink.jsonl"
+        lines_file.write_text("\n".join(lines) + "\n")
+        sequential_file = tmp_path / "sequential.jsonl"
+        parallel_file = tmp_path / "parallel.jsonl"
+
+        expected = OrderPipeline(streaming=streaming).run(str(lines_file), str(sequential_file))
+        summary = OrderPipeline(streaming=streaming, workers=2, byte_range_size=200).run(
+            str(lines_file), str(parallel_file)
+        )
+
+        assert parallel_file.read_bytes() == sequential_file.read_bytes()
+        assert summary["analysis"] == expected["analysis"]
+        assert summary["rejections"] == expected["rejections"]
+        assert summary["metrics"]["stages"]["read_validate_transform"]["calls"] > 2
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True}, {"fused": True, "columnar_analysis": True}])
+    def test_compact_records_run(self, raw_data_file, tmp_path, options):
+        """Tests that compact records give byte-identical output for canonical input."""
+        dict_file = tmp_path / "dicts.json"
+        compact_file = tmp_path / "compact.json"
+
+        expected = OrderPipeline(**options).run(str(raw_data_file), str(dict_file))
+        summary = OrderPipeline(compact_records=True, **options).run(str(raw_data_file), str(compact_file))
+
+        assert summary["analysis"] == expected["analysis"]
+        assert compact_file.read_bytes() == dict_file.read_bytes()
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_columnar_cache_output(self, raw_data_file, tmp_path, streaming):
+        """Tests that a .cols output reloads to the JSON output's records and analysis."""
+        json_output = tmp_path / "output.json"
+        cache = tmp_path / "output.cols"
+
+        expected = OrderPipeline().run(str(raw_data_file), str(json_output))
+        OrderPipeline(streaming=streaming).run(str(raw_data_file), str(cache))
+
+        orders = DataReader().load_columns(str(cache))
+        with open(json_output, 'r') as f:
+            assert [record.to_dict() for record in orders] == json.load(f)["cleaned_data"]
+        assert orders.analysis_summary == expected["analysis"]
+        assert DataAnalyzer().analyze_columnar(orders) == expected["analysis"]
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 2}, {"workers": 2}])
+    def test_incremental_json_lines_run(self, raw_data_file, tmp_path, options):
+        """Tests that appended lines are processed once and merged into the totals."""
+        records = json.loads(raw_data_file.read_text())
+        lines = [json.dumps(record) + "\n" for record in records]
+        lines_file = tmp_path / "shoplink.jsonl"
+        state_file = tmp_path / "state.json"
+        pipeline = OrderPipeline(state_filepath=str(state_file), byte_range_size=100, **options)
+
+        # The last line has no newline yet, so it is left for the next run.
+        lines_file.write_text("".join(lines[:5]) + lines[5][:30])
+        first = pipeline.run(str(lines_file), str(tmp_path / "first.jsonl"))
+        lines_file.write_text("".join(lines))
+        second = pipeline.run(str(lines_file), str(tmp_path / "second.jsonl"))
+        third = pipeline.run(str(lines_file), str(tmp_path / "third.jsonl"))
+        full = OrderPipeline().run(str(lines_file), str(tmp_path / "full.jsonl"))
+
+        assert first["analysis"]["total_orders"] == 2
+        assert second["analysis"]["total_orders"] == 5
+        assert second["analysis"]["total_revenue"] == full["analysis"]["total_revenue"]
+        assert second["analysis"]["status_counts"] == full["analysis"]["status_counts"]
+        assert third["analysis"] == second["analysis"]
+        assert not (tmp_path / "third.jsonl").exists()
+        written = [
+            line for name in ("first.jsonl", "second.jsonl") for line in (tmp_path / name).read_text().splitlines()
+        ]
+        assert written == (tmp_path / "full.jsonl").read_text().splitlines()
+
+    def test_incremental_json_array_run(self, raw_data_file, tmp_path):
+        """Tests that inputs without byte offsets skip order_ids seen before."""
+        records = json.loads(raw_data_file.read_text())
+        input_file = tmp_path / "shoplink.json"
+        state_file = tmp_path / "state.json"
+        output_file = tmp_path / "output.json"
+        pipeline = OrderPipeline(state_filepath=str(state_file))
+
+        input_file.write_text(json.dumps(records[:6]))
+        pipeline.run(str(input_file), str(output_file))
+        input_file.write_text(json.dumps(records))
+        summary = pipeline.run(str(input_file), str(output_file))
+
+        with open(output_file, 'r') as f:
+            cleaned_ids = [record["order_id"] for record in json.load(f)["cleaned_data"]]
+        assert cleaned_ids == ["ORD008", "ORD010"]
+        assert summary["analysis"]["total_orders"] == 5
+        # Records rejected in the first run are not rejected again.
+        assert summary["rejections"] == {"invalid_quantity": 1, "missing_total": 1}
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True}])
+    def test_incremental_rerun_with_only_rejected_records(self, raw_data_file, tmp_path, options):
+        """Tests that a rerun whose unseen records were all rejected before returns the totals so far."""
+        records = json.loads(raw_data_file.read_text())
+        input_file = tmp_path / "shoplink.json.gz"
+        with gzip.open(input_file, 'wt') as f:
+            json.dump([records[0], dict(records[1], item="")], f)
+        pipeline = OrderPipeline(state_filepath=str(tmp_path / "state.json"), **options)
+
+        first = pipeline.run(str(input_file), str(tmp_path / "output.json"))
+        assert first["rejections"] == {"empty_item": 1}
+        for _ in range(2):
+            summary = pipeline.run(str(input_file), str(tmp_path / "output.json"))
+            assert summary["analysis"] == first["analysis"]
+            assert summary["rejections"] == {}
+
+    def test_incremental_run_accepts_corrected_resend(self, raw_data_file, tmp_path):
+        """Tests that a rejected order resent in corrected form is processed by a later run."""
+        records = json.loads(raw_data_file.read_text())
+        input_file = tmp_path / "shoplink.json"
+        pipeline = OrderPipeline(state_filepath=str(tmp_path / "state.json"))
+
+        input_file.write_text(json.dumps(records))
+        pipeline.run(str(input_file), str(tmp_path / "first.json"))
+        input_file.write_text(json.dumps(records + [dict(records[2], quantity=3, price="$5")]))
+        summary = pipeline.run(str(input_file), str(tmp_path / "second.json"))
+
+        with open(tmp_path / "second.json", 'r') as f:
+            assert [record["order_id"] for record in json.load(f)["cleaned_data"]] == ["ORD003"]
+        assert summary["analysis"]["total_orders"] == 6
+
+    def test_failed_run_keeps_state(self, raw_data_file, tmp_path):
+        """Tests that the watermark only moves after a successful run."""
+        lines_file = tmp_path / "shoplink.jsonl"
+        lines_file.write_text("".join(json.dumps(r) + "\n" for r in json.loads(raw_data_file.read_text())))
+        state_file = tmp_path / "state.json"
+        pipeline = OrderPipeline(state_filepath=str(state_file))
+
+        assert pipeline.run(str(lines_file), str(tmp_path / "output.txt")) is None
+        assert not state_file.exists()
+        summary = pipeline.run(str(lines_file), str(tmp_path / "output.jsonl"))
+        assert summary["analysis"]["total_orders"] == 5
+
+    def test_max_seen_ids(self, raw_data_file, tmp_path):
+        """Tests that the pipeline's max_seen_ids bounds the saved state."""
+        state_file = tmp_path / "state.json"
+        OrderPipeline(state_filepath=str(state_file), max_seen_ids=2).run(str(raw_data_file), str(tmp_path / "out.json"))
+        assert len(json.loads(state_file.read_text())["seen_order_ids"]) == 2
+
+    def test_unwritable_state_file(self, raw_data_file, tmp_path, caplog):
+        """Tests that a state file that cannot be saved fails the run instead of raising."""
+        pipeline = OrderPipeline(state_filepath=str(tmp_path / "missing" / "state.json"))
+        assert pipeline.run(str(raw_data_file), str(tmp_path / "output.json")) is None
+        assert "Pipeline failed" in caplog.text
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 2}, {"workers": 2, "fused": True}])
+    @pytest.mark.parametrize("policy, kept_prices", [("first", [15.99]), ("last", [20.0]), ("reject", [])])
+    def test_deduplicated_run(self, raw_data_file, tmp_path, options, policy, kept_prices):
+        """Tests that duplicated order_ids are resolved by policy and counted in the summary."""
+        records = json.loads(raw_data_file.read_text())
+        duplicate = dict(records[0], price=20, total=40)
+        input_file = tmp_path / "shoplink.json"
+        input_file.write_text(json.dumps(records + [duplicate]))
+        output_file = tmp_path / "output.json"
+
+        summary = OrderPipeline(dedup_policy=policy, **options).run(str(input_file), str(output_file))
+
+        dropped = 2 - len(kept_prices)
+        assert summary["duplicates"] == {"policy": policy, "duplicate_order_ids": 1, "records_dropped": dropped}
+        assert summary["rejections"]["duplicate_order_id"] == dropped
+        assert summary["analysis"]["total_orders"] == 5 + len(kept_prices) - 1
+        with open(output_file, 'r') as f:
+            cleaned = json.load(f)["cleaned_data"]
+        assert [r["price"] for r in cleaned if r["order_id"] == "ORD001"] == kept_prices
+        assert len({r["order_id"] for r in cleaned}) == len(cleaned)
+
+    @pytest.mark.parametrize("options, from_transformer", [
+        ({}, True), ({"fused": True}, True), ({"workers": 2, "parallel_chunk_size": 2}, True),
+        ({"workers": 2, "fused": True, "compact_records": True, "parallel_chunk_size": 2}, True),
+        ({"dedup_policy": "last"}, False),
+    ])
+    def test_columnar_analysis_uses_transformer_columns(self, raw_data_file, tmp_path, monkeypatch, options,
+                                                        from_transformer):
+        """Tests that batch columnar analysis reduces the transformer's columns unless records were dropped."""
+        records = json.loads(raw_data_file.read_text())
+        input_file = tmp_path / "shoplink.json"
+        input_file.write_text(json.dumps(records + [dict(records[0], price=20, total=40)]))
+        expected = OrderPipeline(**options).run(str(input_file), str(tmp_path / "expected.json"))
+
+        calls = []
+        analyze_columnar = DataAnalyzer.analyze_columnar
+
+        def recording_analyze_columnar(self, data, columns=None):
+            calls.append((len(data), list(columns.totals), list(columns.status_codes)))
+            return analyze_columnar(self, data, columns)
+
+        monkeypatch.setattr(DataAnalyzer, "analyze_columnar", recording_analyze_columnar)
+        pipeline = OrderPipeline(columnar_analysis=True, **options)
+        summary = pipeline.run(str(input_file), str(tmp_path / "output.json"))
+
+        assert summary["analysis"] == expected["analysis"]
+        with open(tmp_path / "output.json", 'r') as f:
+            cleaned = json.load(f)["cleaned_data"]
+        (record_count, totals, status_codes), = calls
+        assert record_count == len(cleaned)
+        if from_transformer:
+            assert totals == [r["total"] for r in cleaned]
+            assert status_codes == [["paid", "pending", "refunded"].index(r["payment_status"]) for r in cleaned]
+        else:
+            assert len(totals) == record_count + 1
+        assert pipeline.transformer.columns is None
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 2}, {"workers": 2, "read_threads": 2}])
+    def test_directory_input(self, raw_data_file, tmp_path, options):
+        """Tests that a directory of files gives the same output as one file holding them all."""
+        records = json.loads(raw_data_file.read_text())
+        input_dir = tmp_path / "stores"
+        input_dir.mkdir()
+        (input_dir / "store1.json").write_text(json.dumps(records[:4]))
+        with gzip.open(input_dir / "store2.jsonl.gz", 'wt') as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records[4:]))
+        (input_dir / "notes.txt").write_text("not an input")
+
+        expected_file = tmp_path / "expected.json"
+        expected = OrderPipeline(**options).run(str(raw_data_file), str(expected_file))
+        output_file = tmp_path / "output.json"
+        summary = OrderPipeline(per_file_summaries=True, **options).run(str(input_dir), str(output_file))
+
+        assert output_file.read_bytes() == expected_file.read_bytes()
+        assert summary["analysis"] == expected["analysis"]
+        assert summary["rejections"] == expected["rejections"]
+        files = summary["files"]
+        assert list(files) == [str(input_dir / "store1.json"), str(input_dir / "store2.jsonl.gz")]
+        assert [f["records_read"] for f in files.values()] == [4, 6]
+        assert [f["records_valid"] for f in files.values()] == [2, 3]
+        assert files[str(input_dir / "store1.json")]["rejections"] == {"invalid_quantity": 2}
+        assert sum(f["analysis"]["total_orders"] for f in files.values()) == expected["analysis"]["total_orders"]
+
+    @pytest.mark.parametrize("name, content", [("bad.json", b"\xff\xfe[{]"), ("bad.jsonl", b"\xff\xfe\x00\n")])
+    def test_directory_input_with_undecodable_file(self, raw_data_file, tmp_path, caplog, name, content):
+        """Tests that a file that is not UTF-8 fails the run cleanly and is named in the log."""
+        (tmp_path / name).write_bytes(content)
+        summary = OrderPipeline().run(str(tmp_path), str(tmp_path / "output" / "out.json"))
+
+        assert summary is None
+        assert f"Pipeline failed: {tmp_path / name}:" in caplog.text
+        assert "unexpected error" not in caplog.text
+
+    def test_glob_input_is_incremental(self, raw_data_file, tmp_path):
+        """Tests that an incremental run over a glob only processes what is new in each file."""
+        records = json.loads(raw_data_file.read_text())
+        state_file = tmp_path / "state.json"
+        pipeline = OrderPipeline(state_filepath=str(state_file))
+        (tmp_path / "a.jsonl").write_text("".join(json.dumps(r) + "\n" for r in records[:3]))
+        (tmp_path / "b.json").write_text(json.dumps(records[3:6]))
+        pipeline.run(str(tmp_path / "[ab].json*"), str(tmp_path / "first.jsonl"))
+
+        with open(tmp_path / "a.jsonl", 'a') as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records[6:8]))
+        (tmp_path / "b.json").write_text(json.dumps(records[3:6] + records[8:]))
+        summary = pipeline.run(str(tmp_path / "[ab].json*"), str(tmp_path / "second.jsonl"))
+
+        second_ids = [json.loads(line)["order_id"] for line in (tmp_path / "second.jsonl").read_text().splitlines()]
+        assert second_ids == ["ORD008", "ORD010"]
+        assert summary["analysis"] == OrderPipeline().run(str(raw_data_file), str(tmp_path / "full.json"))["analysis"]
+
+    @pytest.mark.parametrize("options", [{"streaming": True, "chunk_size": 2}, {"workers": 2, "fused": True},
+                                         {"columnar_analysis": True}])
+    def test_grouped_analysis(self, raw_data_file, tmp_path, options):
+        """Tests that every execution mode reports the same groups."""
+        expected = OrderPipeline(grouped_analysis=True).run(str(raw_data_file), str(tmp_path / "expected.json"))
+        summary = OrderPipeline(grouped_analysis=True, **options).run(str(raw_data_file), str(tmp_path / "out.json"))
+
+        groups = expected["analysis"]["groups"]
+        assert sum(group["orders"] for group in groups["by_item"].values()) == 5
+        assert groups["top_items_by_revenue"][0]["revenue"] == max(g["revenue"] for g in groups["by_item"].values())
+        assert summary["analysis"]["groups"] == groups
+
+    @pytest.mark.parametrize("options", [{}, {"streaming": True, "chunk_size": 2}, {"workers": 2}])
+    def test_incremental_rollups(self, raw_data_file, tmp_path, options):
+        """Tests that incremental runs add each order to the rollups once."""
+        records = json.loads(raw_data_file.read_text())
+        lines_file = tmp_path / "shoplink.jsonl"
+        rollup_file = tmp_path / "rollups.db"
+        pipeline = OrderPipeline(state_filepath=str(tmp_path / "state.json"), rollup_filepath=str(rollup_file),
+                                 **options)
+
+        lines_file.write_text("".join(json.dumps(record) + "\n" for record in records[:6]))
+        first = pipeline.run(str(lines_file), str(tmp_path / "first.jsonl"))
+        lines_file.write_text("".join(json.dumps(record) + "\n" for record in records))
+        second = pipeline.run(str(lines_file), str(tmp_path / "second.jsonl"))
+        pipeline.run(str(lines_file), str(tmp_path / "third.jsonl"))
+
+        assert first["rollups"] == {"windows_updated": 3 + 1 + 1, "unknown_timestamps": 0}
+        assert second["rollups"] == {"windows_updated": 2 + 1 + 1, "unknown_timestamps": 0}
+        with RollupStore(str(rollup_file)) as store:
+            days = store.query("day")
+            five_minutes = store.query("5min", end="2025-10-19T08:30")
+        assert days == [{
+            "window_start": "2025-10-19", "orders": 5, "revenue": second["analysis"]["total_revenue"],
+            "status_counts": second["analysis"]["status_counts"]
+        }]
+        assert [w["window_start"] for w in five_minutes] == ["2025-10-19T08:00", "2025-10-19T08:05", "2025-10-19T08:25"]
+
+    @pytest.mark.parametrize("options", [{"streaming": True, "chunk_size": 2}, {"workers": 2, "fused": True},
+                                         {"columnar_analysis": True}])
+    def test_sketches(self, raw_data_file, tmp_path, options):
+        """Tests that every execution mode reports the same sketch estimates."""
+        expected = OrderPipeline(sketches=True).run(str(raw_data_file), str(tmp_path / "expected.json"))
+        summary = OrderPipeline(sketches=True, **options).run(str(raw_data_file), str(tmp_path / "out.json"))
+
+        sketches = expected["analysis"]["sketches"]
+        assert sketches["distinct_order_ids"] == expected["analysis"]["total_orders"]
+        assert summary["analysis"]["sketches"] == sketches
+
+    @pytest.mark.parametrize("options", [{}, {"fused": True}, {"workers": 2, "parallel_chunk_size": 3}])
+    def test_validation_schema(self, raw_data_file, tmp_path, options):
+        """Tests that a custom schema applies in every execution mode."""
+        schema = ValidationSchema(dict(ORDER_SCHEMA, quantity={"type": "number"}))
+        summary = OrderPipeline(validation_schema=schema, **options).run(str(raw_data_file), str(tmp_path / "out.json"))
+        # ORD003 (quantity -3) now gets as far as its price.
+        assert summary["rejections"] == {"empty_item": 1, "invalid_quantity": 2, "invalid_price": 1, "missing_total": 1}
@@ -0,0 +1,101 @@
+import logging
+from collections import Counter
+import pytest
+from order_pipeline.processor import DataProcessor
+from order_pipeline.validator import DataValidator
+from order_pipeline.transformer import DataTransformer
+from order_pipeline.schema import ORDER_SCHEMA, ValidationSchema
+
+@pytest.fixture
+def processor():
+    """Returns a DataProcessor instance."""
+    return DataProcessor()
+
+@pytest.fixture
+def raw_data():
+    """Provides raw records covering every accept/reject path of both stages."""
+    return [
+        {"order_id": "ORD001", "timestamp": "2025-10-19T08:00:00Z", "item": "Wireless Mouse",
+         "quantity": 2, "price": "$15.99", "total": "$31.98", "payment_status": "paid"},
+        {"order_id": "ORD002", "timestamp": "2025-10-19 08:05", "item": "Laptop Sleeve",
+         "quantity": "1", "price": "12.50", "total": "12.50", "payment_status": "PAID"},
+        {"order_id": "ORD003", "timestamp": "19/10/2025 08:10 AM", "item": "USB Cable",
+         "quantity": -3, "price": "5usd", "total": 15, "payment_status": "pending"},
+        {"order_id": "ORD004", "timestamp": "2025-10-19T08:15:00Z", "item": "Wireless Mouse",
+         "quantity": "2pcs", "price": "$16", "total": "$32.00", "payment_status": "paid"},
+        {"order_id": "ORD005", "timestamp": "2025-10-19T08:20:00Z", "item": "",
+         "quantity": 1, "price": "45 dollars", "total": 45, "payment_status": "refunded"},
+        {"order_id": "ORD006", "timestamp": "2025/10/19T08:25Z", "item": "Phone Case",
+         "quantity": 3, "price": "N2000", "total": "N6000", "payment_status": "PAID"},
+        {"order_id": "ORD009", "timestamp": "2025-10-19T08:40:00Z", "item": "Webcam",
+         "quantity": 1, "price": "$29.99", "payment_status": "PAID"},
+        # Valid for the validator, but the transformer reads these differently
+        # from a plain float, so they must take the original helpers.
+        {"order_id": "ORD011", "timestamp": "2025-10-19T08:50:00Z", "item": "Stand",
+         "quantity": "1e1", "price": "N.5", "total": ".5", "payment_status": "paid"},
+        {"order_id": "ORD012", "timestamp": "2025-10-19T08:55:00Z", "item": "Hub",
+         "quantity": " 4 ", "price": "nN7.25", "total": 29, "payment_status": "Refund"},
+    ]
+
+def _messages(caplog):
+    """Returns the warning and error messages captured so far."""
+    return Counter(r.getMessage() for r in caplog.records if r.levelno >= logging.WARNING)
+
+class TestDataProcessor:
+
+    def test_matches_two_stage_path(self, processor, raw_data, caplog):
+        """Tests that the fused pass accepts, rejects and logs like validate then transform."""
+        validated = DataValidator().validate_data(raw_data)
+        expected = DataTransformer().transform_data(validated)
+        expected_messages = _messages(caplog)
+        caplog.clear()
+
+        validated_count, transformed = processor.validate_and_transform(raw_data)
+
+        assert validated_count == len(validated)
+        assert transformed == expected
+        assert _messages(caplog) == expected_messages
+
+    def test_empty_input(self, processor):
+        """Tests that empty input returns no records."""
+        assert processor.validate_and_transform([]) == (0, [])
+
+    def test_parse_number(self):
+        """Unit test for the _parse_number fast path."""
+        assert DataProcessor._parse_number(3) == 3.0
+        assert DataProcessor._parse_number("$15.99") == 15.99
+        assert DataProcessor._parse_number(" N2000 ") == 2000.0
+        assert DataProcessor._parse_number("12.50") == 12.5
+        # Left to the original helpers
+        assert DataProcessor._parse_number("N.5") is None
+        assert DataProcessor._parse_number("1e3") is None
+        assert DataProcessor._parse_number("2pcs") is None
+        assert DataProcessor._parse_number(None) is None
+
+    def test_parallel_matches_sequential(self, processor, raw_data):
+        """Tests that the process-pool path returns the same records in order."""
+        data = [dict(r, order_id=f"{r['order_id']}-{i}") for i in range(10) for r in raw_data]
+        expected = processor.validate_and_transform(data)
+
+        assert DataProcessor().validate_and_transform(data, workers=2, chunk_size=7) == expected
+
+    def test_custom_schema_matches_two_stage_path(self, raw_data, caplog):
+        """Tests that the fused pass follows the validator's schema, including extra and optional fields."""
+        schema = ValidationSchema(dict(
+            ORDER_SCHEMA, customer_id={}, note={'type': 'text', 'required': False}, total={'type': 'number'}
+        ))
+        data = [dict(r, customer_id="C1") for r in raw_data[:5]] + raw_data[5:] + [
+            dict(raw_data[0], order_id="ORD020", customer_id="C2", note=5),
+            dict(raw_data[1], order_id="ORD021", customer_id="C3", note="gift", total="-1"),
+        ]
+        validated = DataValidator(schema=schema).validate_data(data)
+        expected = DataTransformer().transform_data(validated)
+        expected_messages = _messages(caplog)
+        caplog.clear()
+
+        processor = DataProcessor(DataValidator(schema=schema))
+        validated_count, transformed = processor.validate_and_transform(data)
+
+        assert validated_count == len(validated)
+        assert transformed == expected
+        assert _messages(caplog) == expected_messages
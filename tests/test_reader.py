@@ -1,7 +1,9 @@
 import pytest
 import json
 import os
-from order_pipeline.reader import DataReader
+from order_pipeline.reader import DataReader, expand_input_paths
+from order_pipeline.rejections import QuarantineSink, RejectionTracker
+from order_pipeline.compression import open_file
 
 # Fixture to create temporary test files
 @pytest.fixture
@@ -85,3 +87,183 @@ class TestDataReader:
         reader = DataReader()
         with pytest.raises(ValueError, match="File contains an empty list"):
             reader.read_json_data(str(json_file))
+
+    def test_iter_json_data_yields_records(self, temp_file, monkeypatch):
+        """Tests that the streaming reader yields every record across tiny buffers."""
+        records = [{"id": i, "item": f"item {i}", "price": i * 1.5e3} for i in range(20)]
+        json_file = temp_file("stream.json", json.dumps(records, indent=4))
+        monkeypatch.setattr(DataReader, "_read_buffer_size", 7)
+
+        reader = DataReader()
+        assert list(reader.iter_json_data(str(json_file))) == records
+
+    def test_iter_json_chunks(self, temp_file):
+        """Tests that records are grouped into bounded chunks."""
+        records = [{"id": i} for i in range(5)]
+        json_file = temp_file("chunks.json", json.dumps(records))
+
+        reader = DataReader()
+        chunks = list(reader.iter_json_chunks(str(json_file), chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert [r for c in chunks for r in c] == records
+
+    def test_iter_json_data_file_checks(self, temp_file):
+        """Tests that file-level checks run before iteration starts."""
+        reader = DataReader()
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            reader.iter_json_data("test.txt")
+        with pytest.raises(FileNotFoundError):
+            reader.iter_json_data("non_existent_file.json")
+        with pytest.raises(ValueError, match="File is empty"):
+            reader.iter_json_data(str(temp_file("empty.json", None)))
+
+    @pytest.mark.parametrize("content, message", [
+        (json.dumps({"id": 1}), "JSON content is not a list"),
+        (json.dumps([]), "File contains an empty list"),
+        ('[{"id": 1}, {"id": 2}', "Failed to decode JSON"),
+        ('[{"id": 1}] trailing', "Failed to decode JSON"),
+    ])
+    def test_iter_json_data_content_errors(self, temp_file, content, message):
+        """Tests that content errors match the ones raised by read_json_data."""
+        json_file = temp_file("bad.json", content)
+
+        reader = DataReader()
+        with pytest.raises(ValueError, match=message):
+            list(reader.iter_json_data(str(json_file)))
+
+    @pytest.mark.parametrize("suffix", [".jsonl", ".ndjson"])
+    def test_read_json_lines(self, temp_file, suffix):
+        """Tests that JSON Lines files are read line by line, skipping blank lines."""
+        records = [{"id": 1}, {"id": 2}, {"id": 3}]
+        content = json.dumps(records[0]) + "\n\n" + "\n".join(json.dumps(r) for r in records[1:]) + "\n"
+        lines_file = temp_file("data" + suffix, content)
+
+        reader = DataReader()
+        assert reader.read_json_data(str(lines_file)) == records
+        chunks = list(reader.iter_json_chunks(str(lines_file), chunk_size=2))
+        assert chunks == [records[:2], records[2:]]
+
+    def test_json_lines_malformed_lines_are_skipped(self, temp_file, caplog):
+        """Tests that malformed lines are reported without failing the file."""
+        content = '{"id": 1}\n{"id": \n[1, 2]\n{"id": 4}\n'
+        lines_file = temp_file("data.jsonl", content)
+
+        reader = DataReader()
+        assert reader.read_json_data(str(lines_file)) == [{"id": 1}, {"id": 4}]
+        assert reader.malformed_lines == 2
+        assert reader.rejections.summary() == {"malformed_line": 2}
+        assert "Skipping malformed line 2" in caplog.text
+        assert "Skipping malformed line 3: Line is not a JSON object." in caplog.text
+        assert "Skipped 2 malformed lines" in caplog.text
+
+    def test_json_lines_without_valid_records(self, temp_file):
+        """Tests that a JSON Lines file with no usable records is rejected."""
+        lines_file = temp_file("bad.jsonl", "not json\n\n")
+
+        with pytest.raises(ValueError, match="File contains no valid records"):
+            DataReader().read_json_data(str(lines_file))
+
+    @pytest.mark.parametrize("suffix", [".json.gz", ".json.bz2", ".json.xz", ".jsonl.gz", ".ndjson.xz"])
+    def test_read_compressed(self, tmp_path, suffix):
+        """Tests that compressed files are decompressed while reading."""
+        records = [{"id": i} for i in range(5)]
+        compressed_file = str(tmp_path / ("data" + suffix))
+        with open_file(compressed_file, 'w') as f:
+            if ".json." in suffix:
+                json.dump(records, f)
+            else:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+
+        reader = DataReader()
+        assert reader.read_json_data(compressed_file) == records
+        assert list(reader.iter_json_data(compressed_file)) == records
+
+    def test_read_unsupported_compressed_format(self):
+        """Tests that a compression suffix alone does not make a file supported."""
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            DataReader().read_json_data("data.txt.gz")
+
+    def test_read_corrupt_compressed_file(self, temp_file):
+        """Tests that a file that is not really compressed raises an IOError."""
+        bad_file = temp_file("data.json.gz", "[{\"id\": 1}]")
+
+        with pytest.raises(IOError, match="Error reading file"):
+            DataReader().read_json_data(str(bad_file))
+
+    @pytest.mark.parametrize("range_size", [1, 10, 25, 1000])
+    def test_split_byte_ranges(self, temp_file, range_size):
+        """Tests that byte ranges end on newlines and cover every line once."""
+        records = [{"id": i, "pad": "x" * (i % 7)} for i in range(20)]
+        lines_file = temp_file("data.ndjson", "".join(json.dumps(r) + "\n" for r in records) + '{"id": 20}')
+
+        reader = DataReader()
+        ranges = reader.split_byte_ranges(str(lines_file), range_size)
+        content = lines_file.read_bytes()
+
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+        assert all(previous[1] == current[0] for previous, current in zip(ranges, ranges[1:]))
+        assert all(content[end - 1:end] == b"\n" for _, end in ranges[:-1])
+        read = [r for start, end in ranges for r in reader.read_byte_range(str(lines_file), start, end)]
+        assert read == records + [{"id": 20}]
+
+    def test_read_byte_range_malformed_lines(self, temp_file, caplog):
+        """Tests that malformed lines in a range are reported by byte offset."""
+        content = '{"id": 1}\n{"id": \n\n{"id": 3}\n'
+        lines_file = temp_file("data.jsonl", content)
+
+        reader = DataReader()
+        assert reader.read_byte_range(str(lines_file), 0, len(content)) == [{"id": 1}, {"id": 3}]
+        assert reader.malformed_lines == 1
+        assert "Skipping malformed line at byte 10" in caplog.text
+
+    def test_split_byte_ranges_requires_uncompressed_json_lines(self, temp_file):
+        """Tests that byte ranges are refused for formats that cannot be split."""
+        json_file = temp_file("data.json", json.dumps([{"id": 1}]))
+
+        with pytest.raises(ValueError, match="Byte ranges are only supported"):
+            DataReader().split_byte_ranges(str(json_file))
+        assert not DataReader.supports_byte_ranges("data.jsonl.gz")
+
+    def test_expand_input_paths(self, tmp_path):
+        """Tests that directories and globs expand to the supported files, sorted."""
+        for name in ["b.jsonl", "a.json", "c.json.gz", "notes.txt"]:
+            (tmp_path / name).write_text("")
+        (tmp_path / "nested.json").mkdir()
+
+        assert expand_input_paths(str(tmp_path)) == [
+            str(tmp_path / name) for name in ["a.json", "b.jsonl", "c.json.gz"]
+        ]
+        assert expand_input_paths(str(tmp_path / "[ac].*")) == [
+            str(tmp_path / name) for name in ["a.json", "c.json.gz"]
+        ]
+        assert expand_input_paths("orders.json") == ["orders.json"]
+        with pytest.raises(FileNotFoundError, match="No .json, .jsonl or .ndjson files found"):
+            expand_input_paths(str(tmp_path / "*.ndjson"))
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_read_files(self, tmp_path, threads):
+        """Tests that files read on threads arrive in order with their rejections merged."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"store{i}.jsonl"
+            path.write_text(json.dumps({"id": i}) + "\nnot json\n" + json.dumps({"id": i + 10}) + "\n")
+            paths.append(str(path))
+        quarantine_file = tmp_path / "quarantine.jsonl"
+        reader = DataReader(RejectionTracker(QuarantineSink(str(quarantine_file))))
+
+        results = list(reader.read_files(paths, threads=threads, byte_ranges={paths[1]: (0, 10)}))
+        reader.rejections.close()
+
+        assert [path for path, _ in results] == paths
+        assert results[0][1] == [{"id": 0}, {"id": 10}]
+        assert results[1][1] == [{"id": 1}]
+        assert reader.rejections.summary() == {"malformed_line": 4}
+        assert len(quarantine_file.read_text().splitlines()) == 4
+
+    def test_read_files_error_names_file(self, temp_file):
+        """Tests that a failing file is named in the error."""
+        good_file = temp_file("good.json", json.dumps([{"id": 1}]))
+        empty_file = temp_file("empty.json", "")
+
+        with pytest.raises(ValueError, match="empty.json: File is empty."):
+            list(DataReader().read_files([str(good_file), str(empty_file)]))
@@ -0,0 +1,40 @@
+import json
+import pickle
+import sys
+import pytest
+from order_pipeline.records import OrderRecord
+
+@pytest.fixture
+def record():
+    """Returns a sample OrderRecord."""
+    return OrderRecord("ORD001", "2025-10-19T08:00:00", "Wireless mouse", 2.0, 15.99, 31.98, "paid")
+
+class TestOrderRecord:
+
+    def test_dict_accessors(self, record):
+        """Tests the read-only dict interface."""
+        assert record["total"] == 31.98
+        assert record.get("payment_status") == "paid"
+        assert record.get("customer", "n/a") == "n/a"
+        assert "item" in record and "customer" not in record
+        assert list(record) == list(OrderRecord.FIELDS)
+        with pytest.raises(KeyError):
+            record["customer"]
+
+    def test_to_dict_uses_canonical_order(self, record):
+        """Tests that to_dict serializes like the equivalent dict."""
+        expected = {
+            "order_id": "ORD001", "timestamp": "2025-10-19T08:00:00", "item": "Wireless mouse",
+            "quantity": 2.0, "price": 15.99, "total": 31.98, "payment_status": "paid"
+        }
+        assert json.dumps(record.to_dict()) == json.dumps(expected)
+        assert record == expected
+
+    def test_pickle_round_trip(self, record):
+        """Tests that records survive being sent to and from worker processes."""
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_smaller_than_dict(self, record):
+        """Tests that the record itself is much smaller than a dict of the same fields."""
+        assert not hasattr(record, "__dict__")
+        assert sys.getsizeof(record) * 2 < sys.getsizeof(record.to_dict())
@@ -0,0 +1,103 @@
+import json
+import logging
+import pickle
+from order_pipeline.rejections import QuarantineSink, RejectionTracker
+
+class CountingValue:
+    """Counts how often it is formatted into a log message."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+class TestQuarantineSink:
+
+    def test_writes_jsonl_in_batches(self, tmp_path):
+        """Tests that records are buffered and written as JSON lines."""
+        quarantine_file = tmp_path / "quarantine.jsonl"
+        sink = QuarantineSink(str(quarantine_file), batch_size=2)
+
+        sink.add({"order_id": "ORD001"}, "missing_total", "validation")
+        assert not quarantine_file.exists()
+        sink.add({"order_id": "ORD002"}, "empty_item", "validation")
+        assert sink.records_written == 2
+        sink.add({"order_id": "ORD003"}, "unparseable_price", "transformation")
+        sink.close()
+
+        lines = [json.loads(line) for line in quarantine_file.read_text().splitlines()]
+        assert [line["record"]["order_id"] for line in lines] == ["ORD001", "ORD002", "ORD003"]
+        assert lines[2] == {
+            "reason": "unparseable_price", "stage": "transformation", "record": {"order_id": "ORD003"}
+        }
+
+    def test_no_file_without_rejections(self, tmp_path):
+        """Tests that closing an unused sink creates no file."""
+        quarantine_file = tmp_path / "quarantine.jsonl"
+        QuarantineSink(str(quarantine_file)).close()
+        assert not quarantine_file.exists()
+
+class TestRejectionTracker:
+
+    def test_counts_and_sampling(self, caplog):
+        """Tests that every rejection is counted but only sampled ones are logged."""
+        tracker = RejectionTracker(log_first=2, log_every=5)
+        for i in range(10):
+            tracker.reject({"order_id": i}, "missing_total", "validation", "Skipping %s", i)
+        tracker.reject({}, "empty_item", "validation", "Skipping empty item")
+
+        assert tracker.summary() == {"empty_item": 1, "missing_total": 10}
+        messages = [r.getMessage() for r in caplog.records]
+        assert messages == [
+            "Skipping 0",
+            "Skipping 1",
+            "Skipping 4 (5 rejections with reason 'missing_total' so far)",
+            "Skipping 9 (10 rejections with reason 'missing_total' so far)",
+            "Skipping empty item",
+        ]
+
+    def test_skipped_messages_are_not_formatted(self):
+        """Tests that arguments of unlogged rejections are never formatted."""
+        tracker = RejectionTracker(log_first=0, log_every=0)
+        value = CountingValue()
+        tracker.reject({}, "invalid_price", "validation", "Invalid value: %s", value)
+
+        assert value.formatted == 0
+        assert tracker.counts["invalid_price"] == 1
+
+    def test_log_level(self, caplog):
+        """Tests that the message is logged at the requested level."""
+        RejectionTracker().reject({}, "transform_error", "transformation", "boom", level=logging.ERROR)
+        assert caplog.records[0].levelno == logging.ERROR
+
+    def test_worker_copy_forwards_to_parent(self, tmp_path):
+        """Tests that a pickled copy queues records and counts for the parent's sink."""
+        quarantine_file = tmp_path / "quarantine.jsonl"
+        parent = RejectionTracker(QuarantineSink(str(quarantine_file)))
+        worker = pickle.loads(pickle.dumps(parent))
+        worker.drain()
+
+        worker.reject({"order_id": "ORD001"}, "missing_total", "validation", "Skipping")
+        parent.merge(worker.drain())
+        parent.close()
+
+        assert parent.summary() == {"missing_total": 1}
+        assert worker.drain() == {"counts": {}, "records": []}
+        assert json.loads(quarantine_file.read_text())["record"] == {"order_id": "ORD001"}
+
+    def test_keep_records(self):
+        """Tests that kept records include those rejected in worker copies and forks."""
+        parent = RejectionTracker(keep_records=True)
+        worker = pickle.loads(pickle.dumps(parent))
+        thread = worker.fork()
+
+        parent.reject({"order_id": "ORD001"}, "missing_total", "validation", "Skipping")
+        thread.reject({"order_id": "ORD002"}, "missing_total", "validation", "Skipping")
+        worker.merge(thread.drain())
+        worker.reject({"order_id": "ORD003"}, "missing_total", "validation", "Skipping")
+        parent.merge(worker.drain())
+
+        assert worker.rejected_records == []
+        assert parent.rejected_records == [{"order_id": "ORD001"}, {"order_id": "ORD002"}, {"order_id": "ORD003"}]
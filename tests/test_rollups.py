@@ -0,0 +1,83 @@
+import pytest
+from order_pipeline.records import OrderRecord
+from order_pipeline.rollups import RollupAccumulator, RollupStore, window_start
+
+@pytest.fixture
+def records():
+    """Returns transformed records across windows, with one missing timestamp."""
+    return [
+        {"timestamp": "2025-10-19T08:03:10+00:00", "payment_status": "paid", "total": 10.0},
+        {"timestamp": "2025-10-19T08:04:59+00:00", "payment_status": "pending", "total": 5.0},
+        {"timestamp": "2025-10-19T08:55:00+00:00", "payment_status": "paid", "total": 20.0},
+        {"timestamp": "2025-10-19T23:15:00-05:00", "payment_status": "refunded", "total": 7.5},
+        {"timestamp": "2025-10-20T00:00:00", "payment_status": "unknown", "total": 3.0},
+        {"timestamp": "", "payment_status": "paid", "total": 99.0},
+    ]
+
+class TestWindowStart:
+
+    @pytest.mark.parametrize("window, expected", [
+        ("5min", "2025-10-19T23:15"), ("hour", "2025-10-19T23:00"), ("day", "2025-10-19")
+    ])
+    def test_uses_wall_clock_time(self, window, expected):
+        assert window_start("2025-10-19T23:17:42.5-05:00", window) == expected
+
+class TestRollupAccumulator:
+
+    def test_window_totals(self, records):
+        rollups = RollupAccumulator().update(records)
+
+        assert rollups.windows["5min"]["2025-10-19T08:00"] == [2, 10.0, 1, 1, 0]
+        assert rollups.windows["hour"]["2025-10-19T08:00"] == [3, 30.0, 2, 1, 0]
+        assert rollups.windows["day"] == {"2025-10-19": [4, 30.0, 2, 1, 1], "2025-10-20": [1, 0.0, 0, 1, 0]}
+        assert rollups.unknown_timestamps == 1
+        assert len(rollups) == 4 + 3 + 2
+
+    def test_order_records(self, records):
+        order_records = [
+            OrderRecord("ORD", r["timestamp"], "Mouse", 1.0, r["total"], r["total"], r["payment_status"])
+            for r in records
+        ]
+        assert RollupAccumulator().update(order_records).windows == RollupAccumulator().update(records).windows
+
+class TestRollupStore:
+
+    def test_apply_only_adds_to_touched_windows(self, records, tmp_path):
+        """Tests that a second run adds to its windows and leaves the others as they were."""
+        path = str(tmp_path / "rollups.db")
+        with RollupStore(path) as store:
+            assert store.apply(RollupAccumulator().update(records[:4])) == 3 + 2 + 1
+        with RollupStore(path) as store:
+            store.apply(RollupAccumulator().update(records[:1] + records[4:]))
+            days = store.query("day")
+            five_minutes = store.query("5min")
+
+        assert days == [
+            {"window_start": "2025-10-19", "orders": 5, "revenue": 40.0,
+             "status_counts": {"paid": 3, "pending": 1, "refunded": 1}},
+            {"window_start": "2025-10-20", "orders": 1, "revenue": 0.0,
+             "status_counts": {"paid": 0, "pending": 1, "refunded": 0}},
+        ]
+        assert [(w["window_start"], w["orders"]) for w in five_minutes] == [
+            ("2025-10-19T08:00", 3), ("2025-10-19T08:55", 1), ("2025-10-19T23:15", 1), ("2025-10-20T00:00", 1)
+        ]
+
+    def test_query_range(self, records, tmp_path):
+        with RollupStore(str(tmp_path / "rollups.db")) as store:
+            store.apply(RollupAccumulator().update(records))
+            hours = store.query("hour", start="2025-10-19T08:30", end="2025-10-20")
+            assert [w["window_start"] for w in hours] == ["2025-10-19T23:00"]
+            assert [w["window_start"] for w in store.query("hour", start="2025-10-19")] == [
+                "2025-10-19T08:00", "2025-10-19T23:00", "2025-10-20T00:00"
+            ]
+
+    def test_unknown_window(self, tmp_path):
+        with RollupStore(str(tmp_path / "rollups.db")) as store:
+            with pytest.raises(ValueError, match="Unknown rollup window 'week'"):
+                store.query("week")
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "rollups.db"
+        path.write_text("not a database")
+        with pytest.raises(IOError, match="Failed to open rollup store"):
+            RollupStore(str(path)).open()
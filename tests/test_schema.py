@@ -0,0 +1,76 @@
+import pickle
+import pytest
+from order_pipeline.schema import FieldRule, ValidationSchema, parse_number
+
+VALUES = [
+    None, 0, 1, -3, 2.5, 0.0, float('nan'), float('inf'), True, False, "", "   ", "abc", "7", " 12.50 ", "$15.99",
+    "N2000", "$ 5", "2pcs", "5usd", "-3", "N/A", "1e3", "0", "$0.00", b"4", [], {}, "٣"
+]
+
+RULES = [
+    FieldRule("f"),
+    FieldRule("f", required=False),
+    FieldRule("f", type="text"),
+    FieldRule("f", type="text", non_empty=True),
+    FieldRule("f", type="text", non_empty=True, required=False),
+    FieldRule("f", type="number"),
+    FieldRule("f", type="number", positive=True),
+    FieldRule("f", type="number", positive=True, required=False),
+]
+
+class TestParseNumber:
+
+    @pytest.mark.parametrize("value, expected", [
+        (10, 10), (10.5, 10.5), ("10.5", 10.5), (" 12.50 ", 12.5), ("$15.99", 15.99), ("N2000", 2000.0),
+        ("$ 5", 5.0), ("1e3", 1000.0), (" $5", 5.0), ("N1e3", 1000.0), (b"4", 4.0), ("45 dollars", None),
+        ("2pcs", None), ("N/A", None), ("", None), (None, None), ([], None)
+    ])
+    def test_parse_number(self, value, expected):
+        assert parse_number(value) == expected
+
+class TestValidationSchema:
+
+    @pytest.mark.parametrize("rule", RULES, ids=lambda rule: repr(vars(rule)))
+    def test_compiled_checks_match_rules(self, rule):
+        """Tests that the generated code accepts and rejects exactly what FieldRule.failure does."""
+        schema = ValidationSchema([rule])
+        records = [{"f": value} for value in VALUES] + [{}]
+        expected = [rule.failure(record.get("f")) is None for record in records]
+
+        assert [schema.check(record) is None for record in records] == expected
+        valid, failures = schema.check_batch(records)
+        assert valid == [record for record, ok in zip(records, expected) if ok]
+        assert failures == [(record, "f") for record, ok in zip(records, expected) if not ok]
+
+    def test_first_failing_field_wins(self):
+        schema = ValidationSchema({"a": {}, "b": {"type": "number", "positive": True}, "c": {}})
+        assert schema.check({"a": 1, "b": "-2"}) == "b"
+        assert schema.check({"b": "-2"}) == "a"
+        assert schema.check({"a": 1, "b": "$2", "c": "x"}) is None
+        assert schema.required_fields == ["a", "b", "c"]
+
+    def test_failure_reasons(self):
+        assert FieldRule("item").failure(None)[0] == "missing_item"
+        assert FieldRule("item", type="text", non_empty=True).failure(" ")[0] == "empty_item"
+        assert FieldRule("note", type="text").failure(5)[0] == "invalid_note"
+        assert FieldRule("total", type="number", positive=True).failure("0")[0] == "invalid_total"
+        assert FieldRule("discount", type="number").failure("-1") is None
+
+    def test_field_names_are_quoted(self):
+        schema = ValidationSchema({"it's \"odd\"": {"type": "text"}})
+        assert schema.check({"it's \"odd\"": "x"}) is None
+        assert schema.check({}) == "it's \"odd\""
+
+    def test_pickle_recompiles(self):
+        schema = pickle.loads(pickle.dumps(ValidationSchema({"a": {"type": "number"}})))
+        assert schema.check({"a": "x"}) == "a"
+
+    @pytest.mark.parametrize("spec, message", [
+        ({"type": "date"}, "Unknown type 'date'"),
+        ({"type": "text", "positive": True}, "'positive' only applies"),
+        ({"type": "number", "non_empty": True}, "'non_empty' only applies"),
+        ({"min": 3}, "Unknown rule"),
+    ])
+    def test_invalid_spec(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            ValidationSchema({"f": spec})
@@ -0,0 +1,115 @@
+import bisect
+import random
+import pytest
+from order_pipeline.sketches import HyperLogLog, KllSketch, SketchAccumulator
+
+@pytest.fixture
+def values():
+    """Returns 50,000 skewed order values in random order."""
+    rng = random.Random(7)
+    return [round(rng.lognormvariate(3, 1), 2) for _ in range(50000)]
+
+def rank_of(sorted_values, value):
+    return bisect.bisect_left(sorted_values, value) / len(sorted_values)
+
+class TestKllSketch:
+
+    def test_exact_before_compaction(self):
+        sketch = KllSketch()
+        for value in [5.0, 1.0, 4.0, 2.0, 3.0]:
+            sketch.update(value)
+        assert [sketch.quantile(q) for q in (0.2, 0.5, 0.9, 1.0)] == [1.0, 3.0, 5.0, 5.0]
+
+    def test_empty(self):
+        assert KllSketch().quantile(0.5) is None
+
+    def test_rank_error_and_memory(self, values):
+        """Tests that quantiles are within the rank error while memory stays bounded."""
+        sketch = KllSketch(k=200)
+        for value in values:
+            sketch.update(value)
+        sorted_values = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            assert abs(rank_of(sorted_values, sketch.quantile(q)) - q) < 0.01
+        assert sum(len(items) for items in sketch.compactors) < 3 * 200
+        assert sum(len(items) << level for level, items in enumerate(sketch.compactors)) == len(values)
+
+    def test_merge_and_round_trip(self, values):
+        """Tests that merged sketches stay accurate and survive to_dict/from_dict."""
+        left, right = KllSketch(), KllSketch()
+        for value in values[:20000]:
+            left.update(value)
+        for value in values[20000:]:
+            right.update(value)
+        merged = KllSketch.from_dict(left.merge(right).to_dict())
+
+        assert merged.count == len(values)
+        sorted_values = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            assert abs(rank_of(sorted_values, merged.quantile(q)) - q) < 0.01
+
+    def test_small_k(self):
+        with pytest.raises(ValueError, match="k must be"):
+            KllSketch(k=4)
+
+class TestHyperLogLog:
+
+    def test_small_counts_are_exact(self):
+        counter = HyperLogLog()
+        for value in ["Mouse", "Laptop", "Mouse", "Cable"] * 10:
+            counter.add(value)
+        assert counter.count() == 3
+
+    @pytest.mark.parametrize("precision", [10, 14])
+    def test_large_count_error(self, precision):
+        counter = HyperLogLog(precision)
+        for i in range(100000):
+            counter.add(f"ORD{i}")
+        error = 1.04 / (2 ** precision) ** 0.5
+        assert abs(counter.count() - 100000) < 4 * error * 100000
+
+    def test_merge_and_round_trip(self):
+        """Tests that merging counts overlapping values once and survives to_dict/from_dict."""
+        left, right = HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            left.add(f"ORD{i}")
+            right.add(f"ORD{i + 1500}")
+        merged = HyperLogLog.from_dict(left.merge(right).to_dict())
+        assert abs(merged.count() - 4500) < 4500 * 0.03
+
+    def test_add_bytes_matches_add(self):
+        left, right = HyperLogLog(), HyperLogLog()
+        left.add("ORD001")
+        right.add_bytes("ORD001".encode('utf-8'))
+        assert left.registers == right.registers
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="precision"):
+            HyperLogLog(20)
+        with pytest.raises(ValueError, match="different precisions"):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+class TestSketchAccumulator:
+
+    def test_result(self):
+        records = [
+            {"order_id": f"ORD{i:03d}", "item": ["Mouse", "Cable"][i % 2], "total": float(i + 1)}
+            for i in range(100)
+        ]
+        result = SketchAccumulator().update(records).result()
+        assert result == {
+            "order_value": {"p50": 50.0, "p90": 90.0, "p99": 99.0},
+            "distinct_items": 2,
+            "distinct_order_ids": 100
+        }
+
+    def test_empty(self):
+        assert SketchAccumulator().result() == {
+            "order_value": {"p50": None, "p90": None, "p99": None},
+            "distinct_items": 0,
+            "distinct_order_ids": 0
+        }
+
+    def test_invalid_state(self):
+        with pytest.raises(ValueError, match="Invalid sketch state"):
+            SketchAccumulator.from_dict({"order_values": {}})
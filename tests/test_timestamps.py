@@ -0,0 +1,80 @@
+import pytest
+from dateutil.parser import parse as parse_datetime
+from order_pipeline.timestamps import TimestampParser
+
+@pytest.fixture
+def parser():
+    """Returns a TimestampParser instance."""
+    return TimestampParser()
+
+class TestTimestampParser:
+
+    @pytest.mark.parametrize("timestamp", [
+        "2025-10-19T08:00:00Z",
+        "2025-10-19T08:00:00.123Z",
+        "2025-10-19 08:05",
+        "2025-10-19T08:05:07",
+        "19/10/2025 08:10 AM",
+        "19/10/2025 12:10 AM",
+        "19/10/2025 12:10 PM",
+        "05/10/2025 08:10 PM",  # ambiguous: dateutil reads month first
+    ])
+    def test_fast_path_matches_dateutil(self, parser, timestamp):
+        """Tests that the fast parsers produce exactly what dateutil would."""
+        assert parser.parse(timestamp) == parse_datetime(timestamp).isoformat()
+        assert parser.stats["fast_path"] == 1
+        assert parser.stats["fallbacks"] == 0
+
+    def test_unusual_format_falls_back(self, parser):
+        """Tests that formats without a fast parser go through dateutil."""
+        assert parser.parse("2025/10/19T08:25Z") == "2025-10-19T08:25:00+00:00"
+        assert parser.stats["fallbacks"] == 1
+        assert parser.stats["fast_path"] == 0
+
+    def test_out_of_range_fields_fall_back(self, parser):
+        """Tests that a format match with impossible values is left to dateutil."""
+        assert parser.parse("2025-13-45 08:05") == ""
+        assert parser.stats["fallbacks"] == 1
+        assert parser.stats["failures"] == 1
+
+    def test_invalid_input(self, parser):
+        """Tests that unparseable or non-string values return an empty string."""
+        assert parser.parse("invalid-date") == ""
+        assert parser.parse(None) == ""
+        assert parser.parse("") == ""
+        assert parser.stats["failures"] == 1
+
+    def test_failure_logging_is_sampled(self, caplog):
+        """Tests that unparseable timestamps are logged like sampled rejections."""
+        parser = TimestampParser(log_first=2, log_every=3)
+        for i in range(7):
+            parser.parse(f"bad-{i}")
+
+        assert parser.stats["failures"] == 7
+        assert [r.getMessage().split(":")[0] for r in caplog.records] == [
+            "Could not parse timestamp 'bad-0'",
+            "Could not parse timestamp 'bad-1'",
+            "Could not parse timestamp 'bad-2'",
+            "Could not parse timestamp 'bad-5'",
+        ]
+        assert caplog.records[-1].getMessage().endswith("(6 failures so far)")
+
+    def test_cache_hits_and_eviction(self):
+        """Tests the LRU cache counters and its size bound."""
+        parser = TimestampParser(cache_size=2)
+        parser.parse("2025-10-19 08:05")
+        parser.parse("2025-10-19 08:05")
+        parser.parse("2025-10-19 08:06")
+        parser.parse("2025-10-19 08:07")
+        parser.parse("2025-10-19 08:05")
+
+        stats = parser.get_stats()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 4
+        assert len(parser._cache) == 2
+
+    def test_detect_formats_reorders_parsers(self, parser):
+        """Tests that the most common format in a batch is tried first."""
+        parser.detect_formats(["19/10/2025 08:10 AM"] * 3 + ["2025-10-19 08:05"])
+        assert parser._formats[0][0] == "slash_ampm"
+        assert parser._formats[1][0] == "iso_naive"
@@ -1,5 +1,7 @@
 import pytest
 from order_pipeline.transformer import DataTransformer
+from order_pipeline.records import OrderRecord
+from order_pipeline.analyzer import STATUS_CODES
 
 @pytest.fixture
 def transformer():
@@ -140,3 +142,38 @@ class TestDataTransformer:
         assert transformer._parse_timestamp("invalid-date") == ""
         assert transformer._parse_timestamp(None) == ""
 
+
+    def test_compact_records(self, valid_data):
+        """Tests that compact records hold the same values as transformed dicts."""
+        expected = DataTransformer().transform_data(valid_data)
+        records = DataTransformer(compact_records=True).transform_data(valid_data)
+
+        assert all(isinstance(record, OrderRecord) for record in records)
+        assert [record.to_dict() for record in records] == [
+            {field: record[field] for field in OrderRecord.FIELDS} for record in expected
+        ]
+
+    def test_compact_records_drop_extra_fields(self):
+        """Tests that fields outside the canonical seven are not kept."""
+        record = {
+            "order_id": "ORD001", "timestamp": "2025-10-19T08:00:00Z", "item": "Mouse",
+            "quantity": 1, "price": 5, "total": 5, "payment_status": "paid", "notes": "x" * 1000
+        }
+        [transformed] = DataTransformer(compact_records=True).transform_data([record])
+        assert "notes" not in transformed
+        assert transformed.get("notes") is None
+
+    @pytest.mark.parametrize("compact_records", [False, True])
+    def test_categories_are_dictionary_encoded(self, valid_data, compact_records):
+        """Tests that items and statuses share one string per value and have stable codes."""
+        transformer = DataTransformer(compact_records=compact_records)
+        data = valid_data + [dict(record, item=f" {record['item'].upper()} ") for record in valid_data]
+        records = transformer.transform_data(data)
+
+        assert transformer.statuses.codes == STATUS_CODES
+        assert len({id(record['item']) for record in records}) == len(transformer.items)
+        statuses = [record['payment_status'] for record in records]
+        assert len({id(status) for status in statuses}) == len(set(statuses))
+        assert [transformer.items.decode(transformer.items.codes[record['item']]) for record in records] == [
+            record['item'] for record in records
+        ]
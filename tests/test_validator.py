@@ -1,5 +1,6 @@
 import pytest
 from order_pipeline.validator import DataValidator
+from order_pipeline.schema import ORDER_SCHEMA, ValidationSchema
 
 @pytest.fixture
 def validator():
@@ -126,4 +127,13 @@ class TestDataValidator:
         assert validator._is_positive_numeric_string("abc") == False
         assert validator._is_positive_numeric_string(None) == False
 
+    def test_custom_schema(self, sample_data):
+        """Tests that fields added to the schema are checked without code changes."""
+        schema = ValidationSchema(dict(ORDER_SCHEMA, customer_id={}, discount={'type': 'number', 'required': False}))
+        validator = DataValidator(schema=schema)
+        records = [dict(sample_data[0], customer_id="C1"), sample_data[1],
+                   dict(sample_data[5], customer_id="C2", discount="N/A"), dict(sample_data[9], customer_id="C3")]
 
+        assert [r['order_id'] for r in validator.validate_data(records)] == ["ORD001", "ORD010"]
+        assert validator.rejections.counts == {"missing_customer_id": 1, "invalid_discount": 1}
+        assert "customer_id" in validator.required_fields and "discount" not in validator.required_fields